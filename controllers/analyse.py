@@ -21,6 +21,11 @@ class AnalyseController:
         self.frame = self.view.frames["analyse"]
         self.exception = self.view.frames["exception"] # Import for use!
 
+        # Tabulate rows are shown a batch at a time: next row to show and last row requested.
+        self.tabulate_batch_size = 500
+        self.tabulate_next_row = 1
+        self.tabulate_end_row = 0
+
         self._bind()
     
     def _calculate_and_refresh_stats(self, event): 
@@ -128,14 +133,34 @@ class AnalyseController:
             self.exception.display_error("Specify start/end row values as an integer values.")
             return
 
+        try: 
+            # Only the first batch of rows is shown now, the rest as the table is scrolled (see _tabulate_more).
+            batch_end = min(end_row, start_row + self.tabulate_batch_size - 1)
+            rows = self.model.DATASET.get_row_window(start_row=start_row, end_row=batch_end)
+        except ValueError as e: 
+            self.exception.display_error(str(e))
+            return
+        self.tabulate_next_row, self.tabulate_end_row = start_row + len(rows), end_row
+
         headers = self.model.DATASET.get_column_headers()
-        rows = self.model.DATASET.get_df_row_by_range(start_row=start_row, end_row=end_row)
         self.frame.create_and_populate_raw_table(
             container_frame=self.frame.tt_frame,
             column_headers=headers, 
             rows=rows
         )
 
+    def _tabulate_more(self, event): 
+        """Append the next batch of the requested rows to the tabulate table once it is scrolled near its end.
+        """
+        if self.tabulate_next_row > min(self.tabulate_end_row, self.model.DATASET.get_df_row_count()):
+            return
+        rows = self.model.DATASET.get_row_window(
+            start_row=self.tabulate_next_row, 
+            end_row=min(self.tabulate_end_row, self.tabulate_next_row + self.tabulate_batch_size - 1)
+            )
+        self.tabulate_next_row += len(rows)
+        self.frame.append_raw_table_rows(rows=rows)
+
     def _bind(self):
         """
         Private method to establish event bindings.
@@ -146,4 +171,5 @@ class AnalyseController:
         self.frame.plot_button.bind("<Button-1>", self._plot_visualisation)
         self.frame.col_summary_option_menu.bind("<Configure>", self._summarise_column)
         self.frame.pivot_button.bind("<Button-1>", self._pivot)
-        self.frame.tabulate_button.bind("<Button-1>", self._tabulate)
\ No newline at end of file
+        self.frame.tabulate_button.bind("<Button-1>", self._tabulate)
+        self.frame.tt_frame.bind("<<RawTableEnd>>", self._tabulate_more)
\ No newline at end of file
@@ -1,6 +1,8 @@
 from utils.logger_utils import Logger
 from os import path
 from shutil import copy
+from queue import Queue, Empty
+import threading
 import pandas as pd
 
 class LibraryController:
@@ -28,6 +30,10 @@ class LibraryController:
         # Trigger to determine if new_file has been selected from import overlay.
         self.new_file = None
 
+        # Background dataset load: progress / result messages from the worker thread and its cancel flag.
+        self.load_queue = Queue()
+        self.load_cancel = None
+
         # Ensure databank is listed to view on run.
         self._display_dataset_list(mode="all")
 
@@ -87,25 +93,139 @@ class LibraryController:
 
     def _load_dataset(self):
         """
-        Loads a dataset from the databank based on selected item in treeview.
+        Loads a dataset from the databank based on selected item in treeview. The file is read on a worker thread
+        so the GUI stays responsive; progress is polled from the worker's queue (see _poll_load) and the dataset
+        only replaces the loaded one once it has been read in full.
         """
         # Get the selected item(s) from the Treeview
         selected_items = self.frame.tree_view.selection()
 
-        if selected_items:
+        if selected_items and self.load_cancel is None:
             item = selected_items[0]
             name, size = self.frame.tree_view.item(item, "values")
-            file_path = self.model.library.databank_dir + name + ".csv"
-            
+            file_path = self.model.library.dataset_path(name)
+
+            # Keep the current status to restore if the user cancels.
+            status = self.frame.dataset_status
+            self.status_before_load = (status.cget("text"), status.cget("text_color"))
+            self.frame.dataset_status.configure(text=f"Loading {name}...", text_color="yellow")
+            self.frame.load_cancel_btn.lift()
+
             # Loads the selected item's corresponding file into memory.
-            self.model.DATASET.load_dataset(file_path=file_path, dataset_name=name)
+            self.load_cancel = threading.Event()
+            load_task = threading.Thread(target=self._load_worker, kwargs={
+                "file_path": file_path, "name": name, "cancel": self.load_cancel, 
+                "compact": bool(self.frame.compact_checkbox.get())
+                }, daemon=True)
+            load_task.start()
+            self.frame.after(100, self._poll_load)
+
+    def _load_worker(self, file_path, name, cancel, compact=False):
+        """
+        Worker thread of _load_dataset. Never touches widgets or _SNAPSHOTS, only posts messages to load_queue.
 
-            self.logger.log_info(f"LIBRARY - Dataset {name} has been loaded by user {self.model.user.get_username()}.")
-            
-            # Provide a visual cue.
-            self.frame.dataset_status.configure(text=f"{name} has been loaded", text_color="lime")
+        Parameters
+        ----------
+        file_path : str
+            Path of the dataset in the databank.
+        name : str
+            Name of the dataset.
+        cancel : threading.Event
+            Set by the user to abandon the load.
+        compact : bool
+            Downcast columns to the smallest types that hold their values (see DatasetModel.compact_dtypes).
+        """
+        try:
+            result = self.model.DATASET.read_dataset(
+                file_path=file_path, 
+                compact=compact,
+                progress=lambda rows, read, total: self.load_queue.put(("progress", name, rows, read, total)), 
+                cancel=cancel
+                )
+            if result is None:
+                self.load_queue.put(("cancelled", name))
+            else:
+                self.load_queue.put(("done", name, result))
+        except Exception as e:
+            self.logger.log_exception(f"LIBRARY - Dataset {name} failed to load. Traceback:")
+            self.load_queue.put(("failed", name, e))
 
-        self.view.frames["menu"].enable_menu_buttons()
+    def _poll_load(self):
+        """
+        Apply the messages posted by _load_worker on the Tk event thread, rescheduling itself until the load ends.
+        """
+        try:
+            while True:
+                message = self.load_queue.get_nowait()
+                match message[0]:
+                    case "progress":
+                        _, name, rows, read, total = message
+                        read = self.model.library.convert_to_megabytes(read)
+                        total = self.model.library.convert_to_megabytes(total)
+                        self.frame.dataset_status.configure(text=f"Loading {name}: {rows:,} rows | {read} of {total}")
+                    case "done":
+                        _, name, (df, compaction_report) = message
+                        self.model.DATASET.swap_in_dataset(
+                            dataset_name=name, df=df, compaction_report=compaction_report
+                            )
+                        username = self.model.user.get_username()
+                        self.logger.log_info(f"LIBRARY - Dataset {name} has been loaded by user {username}.")
+
+                        # Provide a visual cue, with the memory saved when the columns were compacted.
+                        status = f"{name} has been loaded"
+                        if compaction_report:
+                            memory = self._compaction_summary(self.model.DATASET.get_all_column_datatypes(memory=True))
+                            status += f" | {memory}"
+                            self.logger.log_info(f"LIBRARY - Dataset {name} compacted on load: {memory}.")
+                        self.frame.dataset_status.configure(text=status, text_color="lime")
+                        self.view.frames["menu"].enable_menu_buttons()
+                        self._end_load()
+                        return
+                    case "cancelled":
+                        text, text_color = self.status_before_load
+                        self.frame.dataset_status.configure(text=text, text_color=text_color)
+                        self.logger.log_info(f"LIBRARY - Loading of dataset {message[1]} was cancelled by user.")
+                        self._end_load()
+                        return
+                    case "failed":
+                        self.frame.dataset_status.configure(text=f"{message[1]} failed to load", text_color="red")
+                        self.exception.display_info(f"An error occurred: {message[2]}")
+                        self._end_load()
+                        return
+        except Empty:
+            pass
+        self.frame.after(100, self._poll_load)
+
+    def _compaction_summary(self, memory_report):
+        """
+        Summarise the memory report of a compacted load e.g. "12.40 MB -> 3.10 MB in memory (5 of 9 columns 
+        compacted)".
+
+        Parameters
+        ----------
+        memory_report : dict
+            Report of DatasetModel.get_all_column_datatypes(memory=True), {column: {"before": dtype, "after": dtype, 
+            "before_bytes": int, "after_bytes": int}}.
+        """
+        before = sum(column["before_bytes"] for column in memory_report.values())
+        after = sum(column["after_bytes"] for column in memory_report.values())
+        compacted = sum(column["before"] != column["after"] for column in memory_report.values())
+        return (f"{self.model.library.convert_to_megabytes(before)} -> {self.model.library.convert_to_megabytes(after)}"
+                f" in memory ({compacted} of {len(memory_report)} columns compacted)")
+
+    def _cancel_load(self):
+        """
+        Ask the worker of an in-progress load to stop. The loaded dataset, if any, is left untouched.
+        """
+        if self.load_cancel is not None:
+            self.load_cancel.set()
+
+    def _end_load(self):
+        """
+        Reset the state of a finished, cancelled or failed load.
+        """
+        self.load_cancel = None
+        self.frame.load_cancel_btn.lower()
 
     def _import_dataset(self):
         """
@@ -141,7 +261,8 @@ class LibraryController:
 
             # Continue with the copy process.
             copy(self.new_file, destination_path)  # Copy the file to the databank location.
-            self._add_meta_data(filename, description, source)  # Save metadata into the metastore.
+            profile = self.model.DATASET.profile_dataset(df=df, file_path=destination_path)  # Profile while parsed.
+            self._add_meta_data(filename, description, source, profile)  # Save metadata into the metastore.
             self._display_dataset_list(mode="all")  # Refresh the treeview list of datasets.
             self.new_file = None  # Reset the new_file trigger.
             self.import_overlay.clear_fields()  # Clear the form.
@@ -157,7 +278,7 @@ class LibraryController:
             #print(f"An error occurred: {e}")
             self.exception.display_info(f"An error occurred: {e}")
 
-    def _add_meta_data(self, name, description, source):
+    def _add_meta_data(self, name, description, source, profile=None):
         """
         Saves metadata into metastore to fasciliate databank lookup.
 
@@ -169,6 +290,8 @@ class LibraryController:
             Description metadata for file.
         source : str
             Source metadata for file.
+        profile : dict, optional
+            Row count, column dtypes, null counts, memory use and checksum of the file (see DatasetModel).
         """
         # Define payload to send to model.
         new_data = {
@@ -177,6 +300,8 @@ class LibraryController:
                 "Description": description
             }
         }
+        if profile:
+            new_data[path.splitext(name)[0]]["Profile"] = profile
 
         # Send payload back to model for saving.
         self.model.library.add_metadata(new_data)
@@ -226,6 +351,7 @@ class LibraryController:
         self.frame.tree_view.bind("<<TreeviewSelect>>", lambda event: self._show_metadata(), add="+")
         self.frame.tree_view.bind("<Double-1>", lambda event: self._load_dataset())
         self.frame.dataset_delete_btn.bind("<Button-1>", lambda event: self._remove_dataset_from_library())
+        self.frame.load_cancel_btn.bind("<Button-1>", lambda event: self._cancel_load())
         self.import_overlay.add_file_button.bind("<Button-1>", lambda event: self._import_new_dataset())
         self.import_overlay.cancel_button.bind("<Button-1>", lambda event: self.import_overlay.hide_view())
         self.import_overlay.import_button.bind("<Button-1>", lambda event: self._import_dataset())
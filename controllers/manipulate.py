@@ -1,4 +1,8 @@
 from utils.logger_utils import Logger
+from queue import Queue, Empty
+import threading
+import time
+
 class ManipulateController:
     def __init__(self, model, view):
         """
@@ -23,6 +27,10 @@ class ManipulateController:
         self.MAX_STEPS = 4
         self.current_df =""
         self.snapshot_count = 0
+
+        # Background generate: step status / result messages from the worker thread and its cancel flag.
+        self.generate_queue = Queue()
+        self.generate_cancel = None
         
     def _bind(self):
         """
@@ -48,6 +56,9 @@ class ManipulateController:
         self.frame.generate_button.bind("<Button-1>", lambda _: self._generate(), add="+")
         self.frame.generate_button.bind("<Button-1>", self._refresh_manipulate_widgets, add="+")
 
+        # Cancel generate button bind
+        self.frame.generate_cancel_button.bind("<Button-1>", lambda _: self._cancel_generate())
+
         # Rollback button bind
         self.frame.rollback_button.bind("<Button-1>", lambda _: self._rollback())
   
@@ -71,7 +82,8 @@ class ManipulateController:
         schedule_set = snapshots[-1]["Schedule Set"]
         manips = "\n"
         for action in schedule_set:
-            new_line = f'{action["step"]}. {action["action"]} | {action["sub_action"]} | {action["column"]}\n' 
+            seed = f' | seed {action["seed"]}' if action.get("seed") is not None else ""
+            new_line = f'{action["step"]}. {action["action"]} | {action["sub_action"]} | {action["column"]}{seed}\n' 
             manips = manips + new_line
         self.frame.current_dataset_label.configure(text=f"Selected Dataset: {snapshot_name} | Rows: {rows} | Columns: {columns}\n"
                                                         f"Manipulations:{manips}")
@@ -109,6 +121,9 @@ class ManipulateController:
         Method to delete all UI widgets associated with a scheduled item and clear scheduled manipulations list 
         stored in the model. Bound to "delete_all_button" located in manipulation frame.
         """
+        if self.generate_cancel is not None:
+            return
+
         # Remove all widgets and clear variables associated with scheduled manipulations.
         for items_dict in self.frame.scheduler_items:
             for widget in items_dict:
@@ -124,57 +139,168 @@ class ManipulateController:
     def _generate(self):
         """
         Method to call manipulations churner located in the manipulations model which generates a dataset based on
-        the manipulations specified by the user. 
-        Refreshes, updates widgets in the UI associated with dataset generation.
-        Calls logger utility to populate log file.
+        the manipulations specified by the user. The churner runs on a worker thread so the GUI stays responsive;
+        the status of each step is polled from the worker's queue (see _poll_generate) and the generated dataset
+        is only added to SNAPSHOTS once every step has succeeded.
         Bound to generate button loacted in manipulation frame.
         """
+        if self.generate_cancel is not None:
+            return
+
         try:
             self.frame.generate_warning.configure(text="")
 
             if len(self.model.manipulations.schedule_set) > 0:   
-                generated_df = self.model.manipulations.generate_churner(self.model.manipulations.schedule_set)
+                seed = self.frame.get_seed()
+                if seed and not seed.isdigit():
+                    self.frame.generate_warning.configure(text="Seed must be a whole number", text_color="yellow")
+                    return
+
+                # Record the seed in every step, it is kept with the schedule set of the generated snapshot.
+                schedule_set = self.model.manipulations.schedule_set
+                for item in schedule_set:
+                    item["seed"] = int(seed) if seed else None
+
+                # Label encoding reuses the mappings of earlier snapshots, so the same value keeps the same code.
+                label_mappings = self.model.DATASET.get_label_mappings()
+                for item in schedule_set:
+                    if item["sub_action"] == "Feature Encoding Label Encoding" and label_mappings:
+                        item["args"] = {**item["args"], "a": label_mappings}
+                for item in schedule_set:
+                    self.frame.set_scheduler_outcome(item["step"], "Pending")
+                self.frame.show_generate_running(True)
+                self.generate_status = "Generating..."
+                self.frame.generate_warning.configure(text=self.generate_status, text_color="yellow")
+
+                self.generate_source = schedule_set[0]["df"]
+                self.generate_started = time.perf_counter()
+                self.generate_cancel = threading.Event()
+                generate_task = threading.Thread(target=self._generate_worker, kwargs={
+                    "schedule_set": schedule_set, "cancel": self.generate_cancel
+                    }, daemon=True)
+                generate_task.start()
+                self.frame.after(100, self._poll_generate)
+
+            # User warning if no manipulations are scheduled and manipulate in clicked.
+            else:
+                self.frame.generate_warning.configure(text="Must have at least 1 pending manipulation scheduled")
+                self.frame.generate_warning.configure(text_color="yellow")
+
+        except Exception as error:
+            self.logger.log_exception("Generate failed to complete. Traceback:")
+
+    def _generate_worker(self, schedule_set, cancel):
+        """
+        Worker thread of _generate. Never touches widgets or SNAPSHOTS, only posts messages to generate_queue.
+
+        Parameters
+        ----------
+        schedule_set : list
+            Scheduled manipulations.
+        cancel : threading.Event
+            Set by the user to stop the generate between steps.
+        """
+        try:
+            generated_df = self.model.manipulations.generate_churner(
+                schedule_set, 
+                progress=lambda step, status, elapsed: self.generate_queue.put(("step", step, status, elapsed)), 
+                cancel=cancel
+                )
+            if generated_df is None and cancel.is_set():
+                self.generate_queue.put(("cancelled",))
+            else:
+                self.generate_queue.put(("done", generated_df))
+        except Exception as e:
+            self.logger.log_exception("Generate failed to complete. Traceback:")
+            self.generate_queue.put(("failed", e))
+
+    def _poll_generate(self):
+        """
+        Apply the messages posted by _generate_worker on the Tk event thread, rescheduling itself until the
+        generate ends.
+        """
+        try:
+            while True:
+                message = self.generate_queue.get_nowait()
+                match message[0]:
+                    case "step":
+                        _, step, status, elapsed = message
+                        self.frame.set_scheduler_outcome(step, status, elapsed)
+                        if status == "Running" and not self.generate_cancel.is_set():
+                            self.generate_status = f"Generating: step {step} of {len(self.model.manipulations.schedule_set)}"
+                    case "done":
+                        self._end_generate(message[1])
+                        return
+                    case "cancelled":
+                        # Keep the schedule set so it can be generated again.
+                        for item in self.model.manipulations.schedule_set:
+                            self.frame.set_scheduler_outcome(item["step"], "Pending")
+                        self.frame.generate_warning.configure(text="Generate was cancelled.", text_color="yellow")
+                        self.logger.log_info("User cancelled the 'generate' function.")
+                        self.generate_cancel = None
+                        self.frame.show_generate_running(False)
+                        self.frame.generate_button.configure(state="normal")
+                        if self.step_count == self.MAX_STEPS:
+                            self.frame.action_selection_menu.configure(state="disabled")
+                        return
+                    case "failed":
+                        self.frame.generate_warning.configure(text=f"Generate has failed. Reason: {message[1]}", 
+                                                              text_color="yellow")
+                        self._end_generate(False, add_to_log=False)
+                        return
+        except Empty:
+            pass
+
+        elapsed = time.perf_counter() - self.generate_started
+        self.frame.generate_warning.configure(text=f"{self.generate_status} | {elapsed:.0f}s elapsed")
+        self.frame.after(100, self._poll_generate)
+
+    def _end_generate(self, generated_df, add_to_log=True):
+        """
+        Apply the result of a finished generate: add the generated dataset to SNAPSHOTS if every step succeeded,
+        log the schedule set and clear the scheduler.
+
+        Parameters
+        ----------
+        generated_df : pandas dataframe | bool
+            Result of the churner, False if a step failed.
+        add_to_log : bool
+            Whether to log the schedule set.
+        """
+        self.generate_cancel = None
+        self.frame.show_generate_running(False)
+
+        try:
+            if add_to_log:
                 # Logger INFO add
                 self._add_manips_to_log()
 
-                # If the generated dataframe returned from the churner failed, log and display user message.
-                # Updates to current dataframe in SNAPSHOTS if successful, logs and dsplays user message.
-                match generated_df:
-                    case False:
+            # If the generated dataframe returned from the churner failed, log and display user message.
+            # Updates to current dataframe in SNAPSHOTS if successful, logs and dsplays user message.
+            match generated_df:
+                case False:
+                    if add_to_log:
                         error_msg = self.model.manipulations.error_msg
                         self.frame.generate_warning.configure(text=f"Generate has failed. Reason: {error_msg}")
                         self.frame.generate_warning.configure(text_color="yellow")
-                        
-                        # Logger INFO add
-                        self.logger.log_info(f"Generate function failed to fully complete successfully.")
-                    case _:
-                        self.model.DATASET.add_generated_dataset_to_snapshot(self.model.manipulations.schedule_set, 
-                                                                            "Generated Dataset", generated_df)
-                        self.frame.generate_warning.configure(text="Generate was successful.")
-                        self.frame.generate_warning.configure(text_color="green")
-                        # Logger INFO add
-                        self.logger.log_info(f"Generated dataset added to SNAPSHOTS as current dataframe.")
-                        
-                # Logic to change outcome label of manipulations.
-                for item in self.model.manipulations.schedule_set:
-                    index = item["step"]
-                    widget = self.frame.scheduler_items[index-1]["outcome"]
-            
-                    match item["outcome"]:
-                        case "Success":
-                            widget.configure(text="Success")
-                            widget.configure(text_color="green")
-                        case "Failed":
-                            widget.configure(text="Failed")
-                            widget.configure(text_color="red")
-                        case "Pending":
-                            widget.configure(text="Pending")
-                            widget.configure(text_color="yellow")           
-            
-            # User warning if no manipulations are scheduled and manipulate in clicked.
-            else:
-                self.frame.generate_warning.configure(text="Must have at least 1 pending manipulation scheduled")
-                self.frame.generate_warning.configure(text_color="yellow")
+                    
+                    # Logger INFO add
+                    self.logger.log_info(f"Generate function failed to fully complete successfully.")
+                case _ if self.model.DATASET.get_reference_to_current_snapshot() is not self.generate_source:
+                    # The dataset was replaced (e.g. another one loaded) while generating.
+                    self.model.manipulations.current_df = ""
+                    self.frame.generate_warning.configure(text="Generate was discarded, the dataset has changed.")
+                    self.frame.generate_warning.configure(text_color="yellow")
+                    self.logger.log_info("Generated dataset discarded, the current dataframe changed meanwhile.")
+                case _:
+                    self.model.DATASET.add_generated_dataset_to_snapshot(self.model.manipulations.schedule_set, 
+                                                                        "Generated Dataset", generated_df)
+                    # Release the churner's reference so columns not kept by the snapshot store can be freed.
+                    self.model.manipulations.current_df = ""
+                    self.frame.generate_warning.configure(text="Generate was successful.")
+                    self.frame.generate_warning.configure(text_color="green")
+                    # Logger INFO add
+                    self.logger.log_info(f"Generated dataset added to SNAPSHOTS as current dataframe.")
 
             # Clear variables and widgets associated with post generate function.
             self.model.manipulations.schedule_set = [] 
@@ -182,11 +308,19 @@ class ManipulateController:
             self.frame.step_count = 0
             self.frame.generate_button.configure(state="disabled")
             self._update_rollback_selector()
-            self._refresh_manipulate_widgets
+            self._refresh_manipulate_widgets(None)
 
         except Exception as error:
             self.logger.log_exception("Generate failed to complete. Traceback:")
 
+    def _cancel_generate(self):
+        """
+        Ask the worker of an in-progress generate to stop before its next step. SNAPSHOTS is left untouched.
+        """
+        if self.generate_cancel is not None:
+            self.generate_cancel.set()
+            self.generate_status = "Cancelling after the current step..."
+
     def _scan_dataset(self):  
         """
         Function creates a dictionary of column headers and datatypes. Used for type checking in manipulation UI.
@@ -194,10 +328,8 @@ class ManipulateController:
         if self.view.frames["menu"].manipulate_button.cget("state") == "disabled":
             return
         
-        df = self.model.DATASET.get_reference_to_current_snapshot()
-        self.col_dtype_dict ={}
-        for col in self.model.DATASET.get_column_headers():
-            self.col_dtype_dict[col] = df.dtypes[col]
+        # Compacted columns (e.g. int8, Float32, category) are reported as the int64 / float64 / object they stand for.
+        self.col_dtype_dict = self.model.DATASET.get_all_column_datatypes(canonical=True)
 
     def _clear_generated_manips_from_scheduler(self):
         """Function clears manipulations in the scheduler automatically after a generate function and when a
@@ -218,6 +350,9 @@ class ManipulateController:
     def _rollback(self):
         """Rollback function of the manipulate UI, bound to rollback button in manipulations UI.
         """
+        if self.generate_cancel is not None:
+            return
+
         try:
             index = self.frame.get_rollback_index()
             self.model.DATASET.rollback(int(index))
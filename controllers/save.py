@@ -1,4 +1,6 @@
 from utils.logger_utils import Logger
+from queue import Queue, Empty
+import threading
 
 class SaveController:
     def __init__(self, model, view):
@@ -19,6 +21,8 @@ class SaveController:
         self.view = view
         self.frame = self.view.frames["save"]
         self.exception = self.view.frames["exception"]
+        self.export_queue = Queue() # Progress / result messages of the export worker thread.
+        self.export_running = False
         self._bind()
 
     def _show_metadata_export_widgets(self): 
@@ -68,7 +72,15 @@ class SaveController:
         """
         full_path = self.model.DATASET.databank_dir + name
         self.model.DATASET.save_export_dataset(full_path=full_path)
-        self.model.DATASET.add_metadata(name, description, source)
+
+        # Profile the written file as it parses back, not the dataframe in memory: nullable, category, sparse or
+        # compacted columns are read from the CSV with other dtypes. Parsing builds the sidecar cache, so the first
+        # load of the dataset from the library is served from it.
+        file_path = full_path + ".csv"
+        profile = self.model.DATASET.profile_dataset(
+            df=self.model.DATASET.read_databank_csv(file_path=file_path), file_path=file_path
+            )
+        self.model.DATASET.add_metadata(name, description, source, profile=profile)
 
         self.frame.display_save_success("Dataset has been written successfully.")
         self.logger.log_info(f"Save/Export - Dataset {name} successfully saved.") # log 
@@ -90,24 +102,85 @@ class SaveController:
             self.logger.log_info(f"Save/Export - Dataset '{name}' successfully overwritten.") # log 
 
     def _handle_export_mode(self, name, description, source):
-        """Exports current dataset.
+        """Exports current dataset. The file is written on a worker thread so the GUI stays responsive, with 
+        progress shown on the export button (see _poll_export).
 
         Args:
             name (str): Name of dataset.
             description (str): Description of dataset.
             source (str): Source relevant to dataset. 
         """
+        if self.export_running:
+            return
+
         file_for_export = self.frame.show_export_dialogue(file_name=name) # full path
-        self.model.DATASET.save_export_dataset(full_path=file_for_export)
-        if self.frame.get_export_metadata_checkbox_state() == 1:
-            self.model.DATASET.export_metadata_to_file(
-                name=file_for_export, desc=description, source=source
-            )
+        if not file_for_export:
+            return
 
-        if file_for_export:
-            self.frame.display_export_success("Dataset has been exported successfully.")
-        
-        self.logger.log_info(f"Save/Export - Dataset '{name}' successfully exported to file.") # log 
+        file_format, compression = self.frame.get_export_format()
+        export_task = threading.Thread(target=self._export_worker, kwargs={
+            "name": name, "file_for_export": file_for_export, "file_format": file_format, "compression": compression,
+            "df": self.model.DATASET.get_reference_to_current_snapshot() # Snapshots are read-only, safe to share.
+            }, daemon=True)
+        self.export_running = True
+        self.frame.display_export_progress("Exporting...")
+        export_task.start()
+        self.frame.after(100, self._poll_export, description, source)
+
+    def _export_worker(self, name, file_for_export, file_format, compression, df):
+        """Worker thread of _handle_export_mode. Only posts messages to export_queue, never touches widgets.
+
+        Args:
+            name (str): Name of dataset.
+            file_for_export (str): Full path chosen by the user.
+            file_format (str): "csv", "parquet" or "feather".
+            compression (str): None, "gzip" or "zstd".
+            df (pandas dataframe): Dataset to export.
+        """
+        try:
+            self.model.DATASET.save_export_dataset(
+                full_path=file_for_export, file_format=file_format, compression=compression, df=df,
+                progress=lambda rows, total: self.export_queue.put(("progress", rows, total))
+                )
+            self.export_queue.put(("done", name, file_for_export))
+        except Exception as e:
+            self.logger.log_exception(f"Save/Export - Dataset '{name}' failed to export. Traceback:")
+            self.export_queue.put(("failed", name, e))
+
+    def _poll_export(self, description, source):
+        """Apply the messages posted by _export_worker on the Tk event thread, rescheduling itself until the export
+        ends.
+
+        Args:
+            description (str): Description of dataset, for the metadata file.
+            source (str): Source relevant to dataset, for the metadata file.
+        """
+        try:
+            while True:
+                message = self.export_queue.get_nowait()
+                match message[0]:
+                    case "progress":
+                        _, rows, total = message
+                        self.frame.display_export_progress(f"Exporting... {rows:,} of {total:,} rows")
+                    case "done":
+                        _, name, file_for_export = message
+                        if self.frame.get_export_metadata_checkbox_state() == 1:
+                            self.model.DATASET.export_metadata_to_file(
+                                name=file_for_export, desc=description, source=source
+                            )
+                        self.export_running = False
+                        self.frame.display_export_progress("")
+                        self.frame.display_export_success("Dataset has been exported successfully.")
+                        self.logger.log_info(f"Save/Export - Dataset '{name}' successfully exported to file.") # log 
+                        return
+                    case "failed":
+                        self.export_running = False
+                        self.frame.display_export_progress("")
+                        self.exception.display_info(f"Export failed: {message[2]}")
+                        return
+        except Empty:
+            pass
+        self.frame.after(100, self._poll_export, description, source)
 
     def _update_databank_library(self):
         """
@@ -127,9 +200,8 @@ class SaveController:
             return
         
         # Retrieve metadata for selected dataset.
-        metadata_repository = self.model.DATASET.load_all_metadata()
         name = self.model.DATASET.get_dataset_name(first_snapshot=True)
-        loaded_dataset = self.model.DATASET.get_file_metadata(metadata_collection=metadata_repository, name=name)
+        loaded_dataset = self.model.DATASET.get_metadata(name=name)
         
         # Initialise metadata values
         description = source = ""
@@ -149,7 +221,7 @@ class SaveController:
         new_name = self.frame.get_name_entry(mode="Overwrite")
         current_name = self.model.DATASET.get_dataset_name()
 
-        if new_name == current_name or self.model.DATASET.get_file_metadata(self.model.DATASET.load_all_metadata(), name=new_name):
+        if new_name == current_name or self.model.DATASET.get_metadata(name=new_name):
             self.frame.change_save_button_text(mode="Overwrite")
         else:
             self.frame.change_save_button_text(mode="Save As")
@@ -252,7 +252,8 @@ class AnalyseModel():
         types = {
             "numeric": (
                 "int64", "int32", "int16", "int8", "float64", "float32", "complex", "UInt8", "UInt16",
-                "UInt32", "UInt64", "int64Dtype", "float64Dtype"
+                "UInt32", "UInt64", "int64Dtype", "float64Dtype", "Int8", "Int16", "Int32", "Int64", "uint8",
+                "uint16", "uint32", "uint64", "Float32", "Float64"
                 ), 
             "categorical": (
                 "category", "object", "string", "StringDtype"
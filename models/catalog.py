@@ -0,0 +1,254 @@
+import json
+import sqlite3
+from os import path
+
+class CatalogModel():
+    def __init__(self, db_path="./db/system/data.db", legacy_path="db/system/dataset_metadata.json"):
+        """
+        Initialise the CatalogModel component of the application.
+
+        This class represents the databank's metadata catalog: one row per dataset in the "datasets" table of the
+        application's SQLite database, indexed by name, with an FTS5 full-text index over source and description.
+        Every write touches a single row in its own transaction, so catalog operations do not grow with the size
+        of the databank.
+
+        Parameters
+        ----------
+        db_path : str
+            Path of the SQLite database.
+        legacy_path : str
+            Path of the JSON metadata store the catalog replaces. Imported once, when the table is first created.
+        """
+        self.db_path = db_path
+        self.legacy_path = legacy_path
+        self.connection = None
+        self._create_catalog()
+
+    def connect_to_db(self):
+        """
+        Connect to the SQLite database.
+        """
+        self.connection = sqlite3.connect(self.db_path)
+        self.connection.row_factory = sqlite3.Row
+
+    def close_db_connection(self):
+        """
+        Close the SQLite database connection.
+        """
+        if self.connection:
+            self.connection.close()
+            self.connection = None
+
+    def _create_catalog(self):
+        """
+        Create the catalog table, its indexes and the triggers keeping the full-text index in step with it. The
+        legacy JSON metadata store is imported the first time round.
+        """
+        self.connect_to_db()
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'datasets'")
+            exists = cursor.fetchone() is not None
+
+            with self.connection:
+                cursor.executescript("""
+                    CREATE TABLE IF NOT EXISTS "datasets" (
+                        "id"	INTEGER,
+                        "name"	TEXT NOT NULL,
+                        "source"	TEXT NOT NULL DEFAULT '',
+                        "description"	TEXT NOT NULL DEFAULT '',
+                        "profile"	TEXT,
+                        PRIMARY KEY("id" AUTOINCREMENT)
+                    );
+                    CREATE UNIQUE INDEX IF NOT EXISTS "datasets_name_index" ON "datasets" ("name");
+                    CREATE VIRTUAL TABLE IF NOT EXISTS "datasets_fts" USING fts5(
+                        source, description, content='datasets', content_rowid='id'
+                    );
+                    CREATE TRIGGER IF NOT EXISTS "datasets_fts_insert" AFTER INSERT ON "datasets" BEGIN
+                        INSERT INTO datasets_fts (rowid, source, description)
+                        VALUES (new.id, new.source, new.description);
+                    END;
+                    CREATE TRIGGER IF NOT EXISTS "datasets_fts_delete" AFTER DELETE ON "datasets" BEGIN
+                        INSERT INTO datasets_fts (datasets_fts, rowid, source, description)
+                        VALUES ('delete', old.id, old.source, old.description);
+                    END;
+                    CREATE TRIGGER IF NOT EXISTS "datasets_fts_update" AFTER UPDATE OF source, description ON "datasets"
+                    BEGIN
+                        INSERT INTO datasets_fts (datasets_fts, rowid, source, description)
+                        VALUES ('delete', old.id, old.source, old.description);
+                        INSERT INTO datasets_fts (rowid, source, description)
+                        VALUES (new.id, new.source, new.description);
+                    END;
+                """)
+
+                if not exists and path.exists(self.legacy_path):
+                    with open(self.legacy_path, "r") as json_file:
+                        legacy_data = json.load(json_file)
+                    cursor.executemany(
+                        "INSERT INTO datasets (name, source, description, profile) VALUES (?, ?, ?, ?)",
+                        [
+                            (name, entry.get("Source", ""), entry.get("Description", ""),
+                             json.dumps(entry["Profile"]) if entry.get("Profile") else None)
+                            for name, entry in legacy_data.items()
+                        ]
+                    )
+        finally:
+            self.close_db_connection()
+
+    def _to_metadata(self, row):
+        """
+        Convert a catalog row to the metadata dictionary used throughout the application.
+
+        Parameters
+        ----------
+        row : sqlite3.Row
+            Row of the datasets table.
+        """
+        metadata = {"Source": row["source"], "Description": row["description"]}
+        if row["profile"]:
+            metadata["Profile"] = json.loads(row["profile"])
+        return metadata
+
+    def get_all(self):
+        """
+        Return the metadata of every dataset, alphabetically sorted by name.
+        """
+        self.connect_to_db()
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute("SELECT name, source, description, profile FROM datasets ORDER BY name COLLATE NOCASE")
+            return {row["name"]: self._to_metadata(row) for row in cursor.fetchall()}
+        finally:
+            self.close_db_connection()
+
+    def get_names(self):
+        """
+        Return the name of every dataset, alphabetically sorted.
+        """
+        self.connect_to_db()
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute("SELECT name FROM datasets ORDER BY name COLLATE NOCASE")
+            return [row["name"] for row in cursor.fetchall()]
+        finally:
+            self.close_db_connection()
+
+    def get(self, name):
+        """
+        Return the metadata of a single dataset, or None if it is not in the catalog.
+
+        Parameters
+        ----------
+        name : str
+            Name of the dataset.
+        """
+        self.connect_to_db()
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute("SELECT name, source, description, profile FROM datasets WHERE name = ?", (name,))
+            row = cursor.fetchone()
+            return self._to_metadata(row) if row else None
+        finally:
+            self.close_db_connection()
+
+    def upsert(self, name, source, description, profile=None):
+        """
+        Add a dataset to the catalog or replace its source and description. The stored profile is only replaced
+        when a new one is given.
+
+        Parameters
+        ----------
+        name : str
+            Name of the dataset.
+        source : str
+            Source metadata for the dataset.
+        description : str
+            Description metadata for the dataset.
+        profile : dict, optional
+            Profile of the dataset's file.
+        """
+        self.connect_to_db()
+        try:
+            with self.connection:
+                self.connection.execute(
+                    """INSERT INTO datasets (name, source, description, profile) VALUES (?, ?, ?, ?)
+                    ON CONFLICT (name) DO UPDATE SET
+                        source = excluded.source,
+                        description = excluded.description,
+                        profile = COALESCE(excluded.profile, profile)""",
+                    (name, source, description, json.dumps(profile) if profile else None)
+                )
+        finally:
+            self.close_db_connection()
+
+    def update_profile(self, name, profile):
+        """
+        Store the profile of a dataset, adding the dataset with blank source and description if it is not in the
+        catalog yet.
+
+        Parameters
+        ----------
+        name : str
+            Name of the dataset.
+        profile : dict
+            Profile of the dataset's file.
+        """
+        self.connect_to_db()
+        try:
+            with self.connection:
+                self.connection.execute(
+                    """INSERT INTO datasets (name, profile) VALUES (?, ?)
+                    ON CONFLICT (name) DO UPDATE SET profile = excluded.profile""",
+                    (name, json.dumps(profile))
+                )
+        finally:
+            self.close_db_connection()
+
+    def remove(self, name):
+        """
+        Remove a dataset from the catalog.
+
+        Parameters
+        ----------
+        name : str
+            Name of the dataset.
+        """
+        self.connect_to_db()
+        try:
+            with self.connection:
+                self.connection.execute("DELETE FROM datasets WHERE name = ?", (name,))
+        finally:
+            self.close_db_connection()
+
+    def search(self, keywords):
+        """
+        Return the names of the datasets matching every keyword, alphabetically sorted. A keyword matches a word
+        starting with it in the source or description (full-text index), or any part of the name.
+
+        Parameters
+        ----------
+        keywords : str
+            Search string.
+        """
+        keyword_list = keywords.split()
+        if not keyword_list:
+            return self.get_names()
+
+        conditions = []
+        parameters = []
+        for word in keyword_list:
+            conditions.append(
+                "(id IN (SELECT rowid FROM datasets_fts WHERE datasets_fts MATCH ?) OR name LIKE ? ESCAPE '\\')"
+            )
+            parameters.append('"' + word.replace('"', '""') + '"*') # Quoted prefix query, no FTS operators.
+            parameters.append("%" + word.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%")
+
+        self.connect_to_db()
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute(
+                f"SELECT name FROM datasets WHERE {' AND '.join(conditions)} ORDER BY name COLLATE NOCASE", parameters
+            )
+            return [row["name"] for row in cursor.fetchall()]
+        finally:
+            self.close_db_connection()
@@ -1,9 +1,281 @@
-import json
+from utils.logger_utils import Logger
+from .catalog import CatalogModel
 import pandas as pd
-from os import path, remove
+import numpy as np
+from os import path, remove, replace, makedirs, stat
+from glob import glob
+from uuid import uuid4
+from collections import OrderedDict
+from contextlib import ExitStack
+import pyarrow as pa
+from pyarrow import feather, parquet
+import hashlib
 import io
 import re
 
+class Snapshot(dict):
+    """A single entry of the _SNAPSHOTS list. Behaves exactly like the plain dictionary documented in
+    DatasetModel i.e. {"Name": "", "Description": "", "Schedule Set": "", "Dataframe": pandas dataframe}, with
+    the addition of the bookkeeping used by SnapshotStore to work out which column buffers it holds and to move
+    its dataframe to disk ("spill") and back again. Reading the "Dataframe" key of a spilled snapshot transparently
+    loads it back into memory.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buffers = {} # {buffer key: bytes} for every column buffer referenced by this snapshot's dataframe.
+        self.spill_path = None # Columnar file holding the dataframe once it has been spilled to disk.
+        self.resident = True # False while the dataframe only exists on disk.
+
+    def __getitem__(self, key):
+        if key == "Dataframe" and not self.resident:
+            self.restore()
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def measure_buffers(self):
+        """Identify every column buffer of the snapshot's dataframe along with its size in bytes. Keys are stable
+        for as long as the buffer is alive, so two snapshots sharing a column report the same key for it.
+        """
+        df = super().get("Dataframe")
+        self.buffers = {}
+        if not isinstance(df, pd.DataFrame):
+            return
+
+        for position in range(df.shape[1]):
+            column = df.iloc[:, position]
+            if isinstance(column.dtype, np.dtype):
+                values = column.to_numpy()
+                key = (values.__array_interface__["data"][0], values.dtype.str, len(values))
+            else:
+                key = id(column.array)
+            self.buffers[key] = int(column.memory_usage(index=False, deep=True))
+
+    def spill(self, spill_dir):
+        """Write the dataframe to a Feather (Arrow IPC) file and drop it from memory. Dataframes in the store are
+        read-only, so a snapshot that was restored and spilled again reuses the file written the first time.
+
+        Args:
+            spill_dir (str): directory to write spill files to.
+        """
+        if not self.resident:
+            return
+
+        if self.spill_path is None:
+            df = super().__getitem__("Dataframe")
+            self._spill_columns = df.columns
+            self._spill_index = df.index if isinstance(df.index, pd.RangeIndex) else None
+            self._spill_index_names = df.index.names
+
+            # Feather needs string column names and a default index; the originals are kept to restore later.
+            frame = df.set_axis([str(position) for position in range(df.shape[1])], axis=1, copy=False)
+            frame = frame.reset_index(drop=True) if self._spill_index is not None else frame.reset_index(names="index")
+            self.spill_path = path.join(spill_dir, f"snapshot_{uuid4().hex}.feather")
+            try:
+                frame.to_feather(self.spill_path)
+            except (ValueError, TypeError): # Arrow cannot represent e.g. object columns of mixed types.
+                self.discard_spill()
+                self.spill_path = path.join(spill_dir, f"snapshot_{uuid4().hex}.pkl")
+                df.to_pickle(self.spill_path)
+
+        super().__setitem__("Dataframe", None)
+        self.buffers = {}
+        self.resident = False
+
+    def restore(self):
+        """Load a spilled dataframe back into memory. The spill file is kept until the snapshot is discarded.
+        """
+        if self.resident:
+            return
+
+        if self.spill_path.endswith(".pkl"):
+            df = pd.read_pickle(self.spill_path)
+        else:
+            df = feather.read_table(self.spill_path, memory_map=True).to_pandas()
+            if self._spill_index is not None:
+                df.index = self._spill_index
+            else:
+                df = df.set_index("index")
+                df.index.names = self._spill_index_names
+            df.columns = self._spill_columns
+
+        super().__setitem__("Dataframe", df)
+        self.resident = True
+        self.measure_buffers()
+
+    def discard_spill(self):
+        """Remove the spill file, if any, from disk.
+        """
+        if self.spill_path is not None and path.exists(self.spill_path):
+            remove(self.spill_path)
+        self.spill_path = None
+
+class SnapshotStore(list):
+    """Copy-on-write, memory-budgeted collection backing DatasetModel._SNAPSHOTS.
+
+    Every appended snapshot has its dataframe compared column by column against the current (last) snapshot.
+    Columns a step did not change are replaced with the previous snapshot's buffer, so only columns that were
+    actually changed cost additional memory. Dataframes held in the store share buffers with one another and must
+    therefore be treated as read-only - manipulations always work on a copy (see ManipulationsModel).
+
+    Once the bytes held in memory exceed memory_budget, the oldest snapshots are spilled to a columnar file under
+    spill_dir and brought back lazily when they are needed again. The current snapshot is never spilled.
+    """
+    def __init__(self, memory_budget=None, spill_dir="db/temp/"):
+        """
+        Args:
+            memory_budget (int | None): bytes of snapshot data to keep in memory. None to never spill.
+            spill_dir (str): directory to write spilled snapshots to.
+        """
+        super().__init__()
+        self.memory_budget = memory_budget
+        self.spill_dir = spill_dir
+        self.version = 0 # Bumped whenever snapshots are added or removed, for caches derived from the store.
+
+        # Spill files only live as long as the application; remove any left behind by a previous session.
+        for stale_file in glob(path.join(spill_dir, "snapshot_*")):
+            remove(stale_file)
+
+    def append(self, snapshot):
+        """Append a snapshot, sharing any unchanged column buffers with the current snapshot and spilling older
+        snapshots to disk if the memory budget is exceeded.
+
+        Args:
+            snapshot (dict): {"Name": "", "Description": "", "Schedule Set": "", "Dataframe": pandas dataframe}
+        """
+        snapshot = Snapshot(snapshot)
+        df = snapshot.get("Dataframe")
+
+        if isinstance(df, pd.DataFrame):
+            previous = self[-1].get("Dataframe") if len(self) > 0 else None
+            snapshot["Dataframe"] = self._share_unchanged_columns(df=df, previous=previous)
+            snapshot.measure_buffers()
+
+        super().append(snapshot)
+        self.version += 1
+        self.enforce_memory_budget()
+
+    def __delitem__(self, index):
+        removed = self[index] if isinstance(index, slice) else [self[index]]
+        super().__delitem__(index)
+        self.version += 1
+        for snapshot in removed:
+            snapshot.discard_spill()
+
+    def clear(self):
+        for snapshot in self:
+            snapshot.discard_spill()
+        super().clear()
+        self.version += 1
+
+    def restore(self, index):
+        """Make sure the snapshot at index is in memory, then re-apply the memory budget to the others.
+
+        Args:
+            index (int): position of the snapshot.
+
+        Returns:
+            Snapshot: the (resident) snapshot.
+        """
+        snapshot = self[index]
+        snapshot.restore()
+        self.enforce_memory_budget(keep=index % len(self))
+        return snapshot
+
+    def enforce_memory_budget(self, keep=None):
+        """Spill the oldest resident snapshots to disk until the bytes held in memory fit the budget.
+
+        Args:
+            keep (int | None): position of a snapshot which must stay in memory, in addition to the current one.
+        """
+        if self.memory_budget is None:
+            return
+
+        protected = {len(self) - 1, keep}
+        for index, snapshot in enumerate(self):
+            if self.resident_bytes() <= self.memory_budget:
+                break
+            if index not in protected and snapshot.resident and snapshot.buffers:
+                snapshot.spill(spill_dir=self.spill_dir)
+
+    def resident_bytes(self):
+        """Total bytes of distinct column buffers currently held in memory by the store.
+        """
+        buffers = {}
+        for snapshot in self:
+            buffers.update(snapshot.buffers)
+        return sum(buffers.values())
+
+    def memory_usage(self):
+        """Bytes really used by each snapshot i.e. excluding column buffers shared with an earlier snapshot.
+        Spilled snapshots use no memory.
+
+        Returns:
+            list: Owned bytes per snapshot, in the same order as the store.
+        """
+        usage = []
+        already_held = set()
+        for snapshot in self:
+            usage.append(sum(size for key, size in snapshot.buffers.items() if key not in already_held))
+            already_held.update(snapshot.buffers)
+        return usage
+
+    def _share_unchanged_columns(self, df, previous):
+        """Build the dataframe to store for a new snapshot. Columns whose values are identical to a column of the
+        previous snapshot (same name, or same position in the case of a rename) reuse that column's buffer.
+
+        Args:
+            df (pandas dataframe): dataframe of the new snapshot.
+            previous (pandas dataframe | None): dataframe of the current snapshot, if any.
+
+        Returns:
+            pandas dataframe: dataframe equal to df, built without copying shared columns.
+        """
+        if not isinstance(previous, pd.DataFrame) or df is previous:
+            return df
+        if len(previous) != len(df) or not previous.index.equals(df.index): # Rows changed, nothing can be shared.
+            return df
+
+        previous_positions = {}
+        for position, name in enumerate(previous.columns):
+            previous_positions.setdefault(name, position)
+
+        columns = {}
+        for position, name in enumerate(df.columns):
+            column = df.iloc[:, position]
+            candidates = [previous_positions.get(name), position if position < previous.shape[1] else None]
+
+            for candidate in (c for c in candidates if c is not None):
+                previous_column = previous.iloc[:, candidate]
+                if previous_column.dtype == column.dtype and previous_column.equals(column):
+                    columns[position] = self._column_buffer(column=previous_column)
+                    break
+            else:
+                columns[position] = self._column_buffer(column=column, owned=True)
+
+        stored = pd.DataFrame(columns, index=df.index, copy=False)
+        stored.columns = df.columns
+        return stored
+
+    def _column_buffer(self, column, owned=False):
+        """Return the array holding a column's values without copying it.
+
+        Args:
+            column (pandas series): column of a dataframe.
+            owned (bool): True if the buffer is to be owned by a new snapshot. Columns which are a slice of a wider
+                2D block are copied out, otherwise the whole block (including unchanged columns) would stay alive.
+
+        Returns:
+            numpy array | pandas ExtensionArray: column values.
+        """
+        if not isinstance(column.dtype, np.dtype):
+            return column.array
+        values = column.to_numpy()
+        if owned and values.base is not None and values.base.nbytes > values.nbytes:
+            values = values.copy()
+        return values
+
 class DatasetModel:
     """Singleton. Working collection of datasets. _SNAPSHOTS is a list of dictionaries with keys representing 
     information about the dataset that will be manipulated / configured prior to saving or exporting to CSV file. 
@@ -30,7 +302,9 @@ class DatasetModel:
                 # the new snapshot (dataset).
             "Dataframe": pandas dataframe
                 # Will hold either blank, loaded dataset OR a snapshot of the dataset as manipulated by actions
-                # performed in a successful Manipulate > Generate. In all cases will be a unique pandas dataframe
+                # performed in a successful Manipulate > Generate. Columns left unchanged by a Generate share their
+                # buffer with the previous snapshot (see SnapshotStore), so dataframes here are to be treated as
+                # read-only.
         }
     ]
     """
@@ -40,7 +314,16 @@ class DatasetModel:
         if cls._instance is None:
             cls._instance = super(DatasetModel, cls).__new__(cls)
             cls.databank_dir = "db/databank/"
-            cls._instance._SNAPSHOTS = []
+            cls.catalog = CatalogModel()
+            cls.snapshot_memory_budget = 1024 ** 3 # Bytes of snapshot history to keep in memory before spilling.
+            cls.category_threshold = 0.5 # Max ratio of unique to total values for a string column to become category.
+            cls.compaction_report = {}
+            cls.load_chunk_size = 50000 # Rows parsed per chunk by read_dataset.
+            cls.export_chunk_size = 100000 # Rows written per chunk by save_export_dataset.
+            cls.page_size = 100 # Rows per page served by get_page.
+            cls.page_cache_size = 64 # Pages kept by get_page, least recently viewed dropped first.
+            cls._instance._page_cache = OrderedDict()
+            cls._instance._SNAPSHOTS = SnapshotStore(memory_budget=cls.snapshot_memory_budget, spill_dir="db/temp/")
         return cls._instance
         
     def new_dataset(self):
@@ -58,30 +341,372 @@ class DatasetModel:
         )
         #print("New dataset:", self._SNAPSHOTS[-1])
 
-    def load_dataset(self, file_path, dataset_name):
+    def load_dataset(self, file_path, dataset_name, compact=False):
         """Loads a csv file stored in the databank into memory i.e. _SNAPSHOTS list.
+
+        Args:
+            file_path (str): path of the CSV file.
+            dataset_name (str): name of the dataset.
+            compact (bool): downcast columns to the smallest dtypes that hold their values (see compact_dtypes).
         """
         if file_path:
-            self.clear_all_snapshots()
-            df = pd.read_csv(file_path)
-            self._SNAPSHOTS.append(
-                {
-                    "Name": f"{dataset_name}",
-                    "Description": "Initial load.",
-                    "Schedule Set": {},
-                    "Dataframe": df
-                }
-            )
-            #print("Loaded data set:", self._SNAPSHOTS[-1])
+            df, compaction_report = self.read_dataset(file_path=file_path, compact=compact)
+            self.swap_in_dataset(dataset_name=dataset_name, df=df, compaction_report=compaction_report)
+
+    def read_dataset(self, file_path, compact=False, progress=None, cancel=None):
+        """Read a databank CSV in chunks of load_chunk_size rows (a Parquet file row group by row group) without 
+        touching _SNAPSHOTS, so that it can run on a worker thread while the currently loaded dataset stays usable. 
+        Pass the result to swap_in_dataset.
+
+        Args:
+            file_path (str): path of the CSV or Parquet file.
+            compact (bool): downcast columns to the smallest dtypes that hold their values (see compact_dtypes).
+            progress (callable): called as progress(rows, bytes_read, total_bytes) after every chunk.
+            cancel (threading.Event): stop reading as soon as this is set.
+
+        Returns:
+            tuple: dataframe and compaction report, or None if cancelled.
+        """
+        total_bytes = stat(file_path).st_size
+        cache_path = self._get_cache_path(file_path=file_path)
+        if file_path.endswith(".parquet"):
+            # Already columnar, read without a sidecar cache.
+            df = self._read_parquet_row_groups(file_path=file_path, total_bytes=total_bytes, progress=progress, 
+                                               cancel=cancel)
+            if df is None:
+                return None
+        elif path.exists(cache_path):
+            df = self._read_cache(cache_path=cache_path)
+        else:
+            df = self._read_csv_chunks(file_path=file_path, total_bytes=total_bytes, progress=progress, cancel=cancel)
+            if df is None:
+                return None
+            self._write_cache(df=df, file_path=file_path, cache_path=cache_path)
+        if progress:
+            progress(len(df), total_bytes, total_bytes)
+
+        if cancel is not None and cancel.is_set():
+            return None
+        if compact:
+            return self.compact_dtypes(df=df)
+        return df, {}
+
+    def _read_csv_chunks(self, file_path, total_bytes, progress=None, cancel=None):
+        """Parse a CSV chunk by chunk, producing the same dataframe as pd.read_csv on the whole file.
+
+        Args:
+            file_path (str): path of the CSV file.
+            total_bytes (int): size of the file.
+            progress (callable): called as progress(rows, bytes_read, total_bytes) after every chunk.
+            cancel (threading.Event): stop reading as soon as this is set.
+
+        Returns:
+            pandas dataframe: the parsed CSV, or None if cancelled.
+        """
+        chunks = []
+        rows = 0
+        with open(file_path, "rb") as file:
+            for chunk in pd.read_csv(file, chunksize=self.load_chunk_size):
+                if cancel is not None and cancel.is_set():
+                    return None
+                chunks.append(chunk)
+                rows += len(chunk)
+                if progress:
+                    progress(rows, min(file.tell(), total_bytes), total_bytes)
+
+        if len(chunks) == 1:
+            return chunks[0]
+        df = pd.concat(chunks, ignore_index=True)
+
+        # A column is only inferred per chunk, e.g. numbers in early chunks and text further down leaves a mix of
+        # floats and strings where a single read gives strings throughout. Re-read such columns as a whole.
+        mixed = [
+            position for position in range(df.shape[1])
+            if len({str(chunk.dtypes.iloc[position]) for chunk in chunks}) > 1 and df.dtypes.iloc[position] == "object"
+            ]
+        if mixed:
+            reread = pd.read_csv(file_path, usecols=mixed)
+            for position, column in zip(mixed, range(reread.shape[1])):
+                df.isetitem(position, reread.iloc[:, column])
+        return df
+
+    def _read_parquet_row_groups(self, file_path, total_bytes, progress=None, cancel=None):
+        """Read a Parquet file row group by row group.
+
+        Args:
+            file_path (str): path of the Parquet file.
+            total_bytes (int): size of the file.
+            progress (callable): called as progress(rows, bytes_read, total_bytes) after every row group, the bytes
+                read estimated from the compressed size of the row groups.
+            cancel (threading.Event): stop reading as soon as this is set.
+
+        Returns:
+            pandas dataframe: contents of the file, or None if cancelled.
+        """
+        parquet_file = parquet.ParquetFile(file_path)
+        tables = []
+        rows = bytes_read = 0
+        for group in range(parquet_file.num_row_groups):
+            if cancel is not None and cancel.is_set():
+                return None
+            tables.append(parquet_file.read_row_group(group))
+            rows += tables[-1].num_rows
+            metadata = parquet_file.metadata.row_group(group)
+            bytes_read += sum(metadata.column(position).total_compressed_size 
+                              for position in range(metadata.num_columns))
+            if progress:
+                progress(rows, min(bytes_read, total_bytes), total_bytes)
+        if not tables:
+            return parquet_file.schema_arrow.empty_table().to_pandas()
+        return pa.concat_tables(tables).to_pandas()
+
+    def swap_in_dataset(self, dataset_name, df, compaction_report=None):
+        """Replace the snapshot history with a freshly read dataset in one step. The previous history stays intact
+        until then. Call from the thread that owns the views (the Tk event loop) so no widget observes _SNAPSHOTS
+        part way through the swap.
+
+        Args:
+            dataset_name (str): name of the dataset.
+            df (pandas dataframe): dataset returned by read_dataset.
+            compaction_report (dict): report returned by read_dataset.
+        """
+        self.clear_all_snapshots()
+        self._SNAPSHOTS.append(
+            {
+                "Name": f"{dataset_name}",
+                "Description": "Initial load.",
+                "Schedule Set": {},
+                "Dataframe": df
+            }
+        )
+        self.compaction_report = compaction_report or {}
+        #print("Loaded data set:", self._SNAPSHOTS[-1])
+
+    def compact_dtypes(self, df):
+        """Downcast the columns of a dataframe without losing information: integers to the smallest signed integer
+        type, floats to float32 where every value keeps its decimal representation, whole-number floats holding NaN to a
+        nullable integer, and string columns with few distinct values (see category_threshold) to category.
+
+        Args:
+            df (pandas dataframe): dataframe to compact.
+
+        Returns:
+            tuple: compacted dataframe and a report of {column: {"before": dtype, "after": dtype, "before_bytes": int,
+                "after_bytes": int}}.
+        """
+        columns = {}
+        report = {}
+        for position, (name, column) in enumerate(df.items()):
+            compacted = self._compact_column(column=column)
+            columns[position] = compacted
+            report[name] = {
+                "before": str(column.dtype),
+                "after": str(compacted.dtype),
+                "before_bytes": int(column.memory_usage(index=False, deep=True)),
+                "after_bytes": int(compacted.memory_usage(index=False, deep=True))
+            }
+        compacted_df = pd.DataFrame(columns, index=df.index, copy=False)
+        compacted_df.columns = df.columns
+        return compacted_df, report
+
+    def _compact_column(self, column):
+        """Smallest lossless dtype for a single column, or the column unchanged.
+
+        Args:
+            column (pandas series): column to compact.
+        """
+        if pd.api.types.is_bool_dtype(column.dtype):
+            return column
+        if pd.api.types.is_integer_dtype(column.dtype):
+            return pd.to_numeric(column, downcast="integer")
+        if pd.api.types.is_float_dtype(column.dtype):
+            values = column.dropna()
+            if len(values) > 0 and np.isfinite(values).all() and (values % 1 == 0).all():
+                if len(values) == len(column):
+                    return pd.to_numeric(column, downcast="integer")
+                return pd.to_numeric(column.astype("Int64"), downcast="integer")
+            # float32 when every value keeps its shortest decimal representation i.e. the text read from the CSV.
+            narrowed = column.to_numpy(dtype="float32")
+            if np.array_equal(narrowed.astype(str).astype("float64"), column.to_numpy(), equal_nan=True):
+                return pd.Series(narrowed, index=column.index, name=column.name)
+            return column
+        if column.dtype == "object" and pd.api.types.infer_dtype(column, skipna=True) == "string":
+            if column.nunique() <= len(column) * self.category_threshold:
+                return column.astype("category")
+        return column
+
+    def read_databank_csv(self, file_path):
+        """Read a databank CSV into a dataframe. A Feather sidecar of the parsed file is kept under the databank's
+        .cache/ folder, keyed by the CSV's size and modification time, so repeat loads are read (memory-mapped)
+        from the cache instead of re-parsing the CSV. The cache is rebuilt whenever the CSV changes.
+
+        Args:
+            file_path (str): path of the CSV file.
+
+        Returns:
+            pandas dataframe: the parsed CSV.
+        """
+        cache_path = self._get_cache_path(file_path=file_path)
+        if path.exists(cache_path):
+            return self._read_cache(cache_path=cache_path)
+
+        df = pd.read_csv(file_path)
+        self._write_cache(df=df, file_path=file_path, cache_path=cache_path)
+        return df
+
+    def _get_cache_path(self, file_path):
+        """Sidecar cache path of a CSV, keyed by file size and modification time.
+
+        Args:
+            file_path (str): path of the CSV file.
+        """
+        file_stat = stat(file_path)
+        directory, file_name = path.split(file_path)
+        name = path.splitext(file_name)[0]
+        return path.join(directory, ".cache", f"{name}.{file_stat.st_size}.{file_stat.st_mtime_ns}.feather")
+
+    def _read_cache(self, cache_path):
+        """Read a sidecar cache back into a dataframe identical to the one pd.read_csv produced.
 
-    def save_export_dataset(self, full_path): 
-        """Save / save as or export the most current dataframe in memory back to specified file (CSV) on disk.
+        Args:
+            cache_path (str): path of the Feather file.
+        """
+        df = feather.read_table(cache_path, memory_map=True).to_pandas()
+
+        # Arrow nulls come back as None in object columns; pd.read_csv gives NaN.
+        for column in df.select_dtypes(include="object"):
+            missing = df[column].isna()
+            if missing.any():
+                df.loc[missing, column] = np.nan
+        return df
+
+    def _write_cache(self, df, file_path, cache_path):
+        """Write (or replace) the sidecar cache of a CSV. Failures are logged and otherwise ignored as the CSV
+        remains the source of truth.
+
+        Args:
+            df (pandas dataframe): parsed CSV.
+            file_path (str): path of the CSV file.
+            cache_path (str): path of the Feather file to write.
+        """
+        try:
+            makedirs(path.dirname(cache_path), exist_ok=True)
+            self._discard_cache(file_path=file_path)
+            temp_path = cache_path + ".tmp"
+            df.to_feather(temp_path, compression="uncompressed") # Uncompressed so it can be memory-mapped.
+            replace(temp_path, cache_path)
+        except (OSError, ValueError, TypeError): # Arrow cannot represent e.g. object columns of mixed types.
+            Logger().log_warning(f"Databank cache not written for {file_path}.")
+            if path.exists(cache_path + ".tmp"):
+                remove(cache_path + ".tmp")
+
+    def _discard_cache(self, file_path):
+        """Remove every sidecar cache of a CSV.
+
+        Args:
+            file_path (str): path of the CSV file.
+        """
+        directory, file_name = path.split(file_path)
+        name = path.splitext(file_name)[0]
+        pattern = re.compile(re.escape(name) + r"\.\d+\.\d+\.feather")
+        for cache_path in glob(path.join(directory, ".cache", "*.feather")):
+            if pattern.fullmatch(path.basename(cache_path)):
+                remove(cache_path)
+
+    def save_export_dataset(self, full_path, file_format="csv", compression=None, progress=None, df=None): 
+        """Save / save as or export the most current dataframe in memory back to specified file on disk. The file is
+        written in chunks of export_chunk_size rows to a temporary file which replaces full_path once complete, so
+        this is safe to run on a worker thread and never leaves a partially written dataset behind.
+
+        Args:
+            full_path (str): entire path including filename. The extension of the format is added if missing.
+            file_format (str): "csv", "parquet" or "feather".
+            compression (str): None, "gzip" or "zstd". Feather only supports "zstd".
+            progress (callable): called as progress(rows_written, total_rows) after every chunk.
+            df (pandas dataframe): dataframe to write, defaults to the current snapshot. Pass the reference when
+                calling from a worker thread.
+
+        Returns:
+            str: path of the written file.
+        """
+        if not full_path:
+            return None
+        if df is None:
+            df = self._SNAPSHOTS[-1]["Dataframe"]
+
+        extension = {"csv": ".csv", "parquet": ".parquet", "feather": ".feather"}[file_format]
+        if file_format == "csv" and compression:
+            extension += {"gzip": ".gz", "zstd": ".zst"}[compression]
+        if not full_path.endswith(extension):
+            full_path += extension
+
+        temp_path = full_path + ".tmp"
+        try:
+            match file_format:
+                case "csv":
+                    self._write_csv_chunks(df=df, file_path=temp_path, compression=compression, progress=progress)
+                case "parquet" | "feather":
+                    self._write_arrow_chunks(
+                        df=df, file_path=temp_path, file_format=file_format, compression=compression, progress=progress
+                        )
+            replace(temp_path, full_path)
+        finally:
+            if path.exists(temp_path):
+                remove(temp_path)
+        return full_path
+
+    def _chunks(self, df):
+        """Yield consecutive row slices (views, not copies) of at most export_chunk_size rows.
+
+        Args:
+            df (pandas dataframe): dataframe to slice.
+        """
+        for start in range(0, max(len(df), 1), self.export_chunk_size):
+            yield df.iloc[start:start + self.export_chunk_size]
+
+    def _write_csv_chunks(self, df, file_path, compression=None, progress=None):
+        """Write a dataframe as (optionally gzip or zstd compressed) CSV, chunk by chunk.
+
+        Args:
+            df (pandas dataframe): dataframe to write.
+            file_path (str): path of the file.
+            compression (str): None, "gzip" or "zstd".
+            progress (callable): called as progress(rows_written, total_rows) after every chunk.
+        """
+        rows = 0
+        with pa.output_stream(file_path, compression=compression) as stream:
+            with io.TextIOWrapper(stream, encoding="utf-8", newline="") as file:
+                for chunk in self._chunks(df=df):
+                    chunk.to_csv(file, header=rows == 0, index=False)
+                    rows += len(chunk)
+                    if progress:
+                        progress(rows, len(df))
+
+    def _write_arrow_chunks(self, df, file_path, file_format, compression=None, progress=None):
+        """Write a dataframe as Parquet or Feather (Arrow IPC), one record batch / row group per chunk.
 
         Args:
-            full_path (str): entire path including filename.
+            df (pandas dataframe): dataframe to write.
+            file_path (str): path of the file.
+            file_format (str): "parquet" or "feather".
+            compression (str): None, "gzip" or "zstd".
+            progress (callable): called as progress(rows_written, total_rows) after every chunk.
         """
-        if full_path: 
-            self._SNAPSHOTS[-1]["Dataframe"].to_csv(f"{full_path + '.csv'}", index=False)
+        # Infer the schema from the whole frame so e.g. a chunk of only missing values keeps its column's type.
+        schema = pa.Schema.from_pandas(df, preserve_index=False)
+        if file_format == "parquet":
+            writer = parquet.ParquetWriter(file_path, schema, compression=compression or "snappy")
+        else:
+            options = pa.ipc.IpcWriteOptions(compression=compression)
+            writer = pa.ipc.new_file(file_path, schema, options=options)
+
+        rows = 0
+        with writer:
+            for chunk in self._chunks(df=df):
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+                rows += len(chunk)
+                if progress:
+                    progress(rows, len(df))
 
     def get_column_headers(self):
         """Method to obtain column names for the current dataset in _SNAPSHOTS list.
@@ -140,6 +765,7 @@ class DatasetModel:
             index (int): User specified index of dataset to define as current.
         """
         del self._SNAPSHOTS[index+1:] # Slicing to truncate.
+        self._SNAPSHOTS.restore(index) # Load back from disk if the snapshot had been spilled.
 
     def get_df_row_by_range(self, start_row, end_row):
         """Method to obtain rows of current dataset within a defined range.
@@ -154,6 +780,88 @@ class DatasetModel:
         """
         return self._SNAPSHOTS[-1]["Dataframe"].iloc[start_row-1:end_row]
 
+    def get_page(self, page):
+        """Method to obtain a fixed size page of rows of the current dataset, ready for display i.e. every value
+        already converted to a string. Values are converted a column at a time rather than row by row, and the
+        most recently viewed pages are cached until the current dataset changes.
+
+        Args:
+            page (int): Page number, starting at 0. Page n holds rows n * page_size up to (n + 1) * page_size.
+
+        Returns:
+            tuple: One tuple of strings per row.
+        """
+        key = (self._SNAPSHOTS.version, page, self.page_size)
+        if key not in self._page_cache:
+            self._render_pages(first_page=page, last_page=page)
+        self._page_cache.move_to_end(key)
+        return self._page_cache[key]
+
+    def _render_pages(self, first_page, last_page):
+        """Convert a run of consecutive pages to strings in one pass and cache them.
+
+        Args:
+            first_page (int): First page to render.
+            last_page (int): Last page to render (inclusive).
+        """
+        df = self._SNAPSHOTS[-1]["Dataframe"]
+        rendered = self._stringify_rows(df.iloc[first_page * self.page_size:(last_page + 1) * self.page_size])
+        for page in range(first_page, last_page + 1):
+            key = (self._SNAPSHOTS.version, page, self.page_size)
+            offset = (page - first_page) * self.page_size
+            self._page_cache[key] = tuple(rendered[offset:offset + self.page_size])
+            self._page_cache.move_to_end(key)
+        while len(self._page_cache) > self.page_cache_size:
+            self._page_cache.popitem(last=False)
+
+    def _stringify_rows(self, rows):
+        """Convert rows of a dataframe to tuples of strings, a column at a time.
+
+        Args:
+            rows (pandas DataFrame): Rows to convert.
+
+        Returns:
+            list: One tuple of strings per row.
+        """
+        columns = [rows.iloc[:, position].astype(str).tolist() for position in range(rows.shape[1])]
+        return list(zip(*columns)) if columns else [()] * len(rows)
+
+    def get_row_window(self, start_row, end_row):
+        """Method to obtain rows of the current dataset, ready for display, assembled from (cached) pages.
+
+        Args:
+            start_row (int): First row, starting at 1.
+            end_row (int): Last row (inclusive). Limited to the number of rows in the dataset.
+
+        Raises:
+            ValueError: If the range is empty or starts beyond the last row.
+
+        Returns:
+            list: One tuple of strings per row.
+        """
+        row_count = self.get_df_row_count()
+        if start_row < 1 or end_row < start_row:
+            raise ValueError("Start row must be at least 1 and no greater than end row.")
+        if start_row > row_count:
+            raise ValueError(f"Start row is beyond the last row of the dataset ({row_count}).")
+        end_row = min(end_row, row_count)
+
+        first, last = start_row - 1, end_row # Zero based, last exclusive.
+        pages = range(first // self.page_size, (last - 1) // self.page_size + 1)
+        if len(pages) > self.page_cache_size: 
+            # Wider than the cache: render the window in one pass without caching it.
+            return self._stringify_rows(self._SNAPSHOTS[-1]["Dataframe"].iloc[first:last])
+
+        missing = [page for page in pages if (self._SNAPSHOTS.version, page, self.page_size) not in self._page_cache]
+        if missing:
+            self._render_pages(first_page=missing[0], last_page=missing[-1])
+
+        rows = []
+        for page in pages:
+            page_start = page * self.page_size
+            rows.extend(self.get_page(page)[max(first - page_start, 0):last - page_start])
+        return rows
+
     def get_df_row_count(self):
         """Method to obtain number of rows in the current dataset stored in self._SNAPSHOTS
 
@@ -184,8 +892,29 @@ class DatasetModel:
     def get_specific_snapshot(self, index): 
         """return the particular snapshot i.e. 
         {"Name": "", "Description": "", "Schedule Set": "", "Dataframe": pandas dataframe}
+        Snapshots spilled to disk are loaded back into memory first.
+        """
+        return self._SNAPSHOTS.restore(index)
+
+    def set_snapshot_memory_budget(self, budget):
+        """Change how many bytes of snapshot history are kept in memory. Older snapshots beyond the budget are
+        spilled to disk under db/temp/ and loaded back when needed.
+
+        Args:
+            budget (int | None): budget in bytes, or None to keep every snapshot in memory.
+        """
+        self.snapshot_memory_budget = budget
+        self._SNAPSHOTS.memory_budget = budget
+        self._SNAPSHOTS.enforce_memory_budget()
+
+    def get_snapshot_memory_usage(self):
+        """Return the bytes really used by each snapshot i.e. excluding column buffers it shares with an
+        earlier snapshot.
+
+        Returns:
+            list: Owned bytes per snapshot, in the same order as _SNAPSHOTS.
         """
-        return self._SNAPSHOTS[index]
+        return self._SNAPSHOTS.memory_usage()
 
     def clear_all_snapshots(self):
         """Method to clear all snapshots.
@@ -196,37 +925,91 @@ class DatasetModel:
         self._SNAPSHOTS.append(snapshot)
         #print("snapshot appended!")
 
-    def _sort_datasets_alphabetically(self, json_data):
-        """
-        Sorts json data into into alphabetical order. TODO: to subsume method of the same name in library.
+    def stream_to_databank(self, name, blocks, description, source, file_format="csv"):
+        """Write a dataset given as a sequence of row blocks to the databank, one block at a time, and register it
+        in the metadata store, so datasets larger than memory can be produced. The file is written to a temporary
+        file which replaces the final one once complete, and its profile (see profile_dataset) is accumulated
+        block by block.
 
-        Parameters
-        ----------
-        json_data : json
-            This parameter should be in json format.
+        Args:
+            name (str): name of the dataset, without extension.
+            blocks (iterable): pandas dataframes with the same columns and dtypes, written in order.
+            description (str): description metadata.
+            source (str): source metadata.
+            file_format (str): "csv" or "parquet".
+
+        Returns:
+            str: path of the written file.
         """
-        return sorted(json_data.keys(), key=str.lower)
+        extensions = {"csv": ".csv", "parquet": ".parquet"}
+        full_path = path.join(self.databank_dir, name + extensions[file_format])
+        if any(path.exists(path.join(self.databank_dir, name + extension)) for extension in extensions.values()):
+            raise ValueError("A dataset with the same name already exists in the databank.")
+
+        temp_path = full_path + ".tmp"
+        profile = {"Rows": 0, "Columns": {}, "Memory": 0}
+        try:
+            with ExitStack() as stack:
+                writer = None
+                for block in blocks:
+                    if writer is None:
+                        # The first block sets the columns and their types for the whole file.
+                        if file_format == "csv":
+                            stream = stack.enter_context(pa.output_stream(temp_path))
+                            writer = stack.enter_context(io.TextIOWrapper(stream, encoding="utf-8", newline=""))
+                        else:
+                            schema = pa.Schema.from_pandas(block, preserve_index=False)
+                            writer = stack.enter_context(parquet.ParquetWriter(temp_path, schema, compression="snappy"))
+                        profile["Columns"] = {str(column): {"Dtype": str(data_type), "Nulls": 0}
+                                              for column, data_type in block.dtypes.items()}
+                        data_types = block.dtypes.tolist()
+                    if file_format == "csv":
+                        block.to_csv(writer, header=profile["Rows"] == 0, index=False)
+                    else:
+                        writer.write_table(pa.Table.from_pandas(block, schema=schema, preserve_index=False))
+
+                    for column, nulls in zip(profile["Columns"].values(), block.isna().sum()):
+                        column["Nulls"] += int(nulls)
+                    profile["Rows"] += len(block)
+                    profile["Memory"] += int(block.memory_usage(index=False, deep=True).sum())
+            replace(temp_path, full_path)
+        finally:
+            if path.exists(temp_path):
+                remove(temp_path)
+
+        if file_format == "csv":
+            # Too large to parse back, the types are those the CSV's columns parse as.
+            for column, data_type in zip(profile["Columns"].values(), data_types):
+                column["Dtype"] = self._csv_datatype(data_type=data_type, nulls=column["Nulls"])
+
+        file_stat = stat(full_path)
+        profile.update({"Checksum": self._file_checksum(file_path=full_path), "Size": file_stat.st_size,
+                        "Modified": file_stat.st_mtime_ns})
+        self.add_metadata(name=name, description=description, source=source, profile=profile)
+        return full_path
 
     def load_all_metadata(self): 
-        """Generalised method to be used from Library and Save & Export. TODO: subsume Library Model 
-        method by the name of "load_all_metadata" with this method.
+        """Generalised method to be used from Library and Save & Export. Prefer get_metadata for a single dataset.
 
         Returns:
-            dictionary: metadata values
+            dictionary: metadata values, alphabetically sorted by dataset name.
         """
-        # Open and store json data.
-        with open("db/system/dataset_metadata.json", "r") as json_file: 
-            json_data = json.load(json_file)
+        return self.catalog.get_all()
 
-        # Sort data into alphabetical order.
-        sorted_json = self._sort_datasets_alphabetically(json_data)
-        
-        # Return data.
-        return {key: json_data[key] for key in sorted_json} # Alphabetically sorted json_file by key
+    def get_metadata(self, name):
+        """Return the metadata of a single dataset from the catalog.
+
+        Args:
+            name (str): name of the dataset.
+
+        Returns:
+            dictionary: {"Source": str, "Description": str[, "Profile": dict]}, or None if not in the catalog.
+        """
+        return self.catalog.get(name)
     
-    def add_metadata(self, name, description, source):
+    def add_metadata(self, name, description, source, profile=None):
         """
-        Adds metadata to the metadata store file. TODO: subsumes Library Model's method by the same name.
+        Adds (or replaces) the metadata of a dataset in the catalog.
 
         Parameters
         ----------
@@ -236,23 +1019,57 @@ class DatasetModel:
             Description metadata for file.
         source : str
             Source metadata for file.
+        profile : dict, optional
+            Profile of the dataset's file (see profile_dataset). The stored profile is kept when not given.
         """
-        new_data = { # new payload
-            path.splitext(name)[0]: { 
-                "Source": source, 
-                "Description": description
-            }
+        self.catalog.upsert(name=path.splitext(name)[0], source=source, description=description, profile=profile)
+
+    def profile_dataset(self, df, file_path):
+        """Profile of a databank dataset as held in the metadata store, so the library can describe a dataset
+        without parsing its CSV. Computed from the dataframe already in memory when the file is imported or saved.
+
+        Args:
+            df (pandas dataframe): contents of the file.
+            file_path (str): path of the CSV file.
+
+        Returns:
+            dict: {"Rows": int, "Columns": {column: {"Dtype": str, "Nulls": int}}, "Memory": bytes in memory,
+                "Checksum": sha256 of the file, "Size": bytes on disk, "Modified": modification time (ns)}
+        """
+        file_stat = stat(file_path)
+        nulls = df.isna().sum()
+        return {
+            "Rows": len(df),
+            "Columns": {
+                str(column): {"Dtype": str(data_type), "Nulls": int(nulls.iloc[position])}
+                for position, (column, data_type) in enumerate(df.dtypes.items())
+            },
+            "Memory": int(df.memory_usage(index=True, deep=True).sum()),
+            "Checksum": self._file_checksum(file_path=file_path),
+            "Size": file_stat.st_size,
+            "Modified": file_stat.st_mtime_ns
         }
-        # Load the existing metadata.
-        existing_data = self.load_all_metadata()
 
-        # Update the existing metadata with new data.
-        existing_data.update(new_data)
+    def update_profile(self, name, profile):
+        """Store the profile of a single dataset, leaving the rest of the catalog untouched.
+
+        Args:
+            name (str): name of the dataset.
+            profile (dict): profile returned by profile_dataset.
+        """
+        self.catalog.update_profile(name=name, profile=profile)
 
-        # Open the metadata file for writing
-        with open("db/system/dataset_metadata.json", "w") as json_file:
-            # Write the updated metadata to the json file
-            json.dump(existing_data, json_file, indent=4)
+    def _file_checksum(self, file_path):
+        """SHA-256 of a file, read in blocks.
+
+        Args:
+            file_path (str): path of the file.
+        """
+        checksum = hashlib.sha256()
+        with open(file_path, "rb") as file:
+            for block in iter(lambda: file.read(1024 ** 2), b""):
+                checksum.update(block)
+        return checksum.hexdigest()
 
     def export_metadata_to_file(self, name, desc, source): 
         """_summary_
@@ -287,10 +1104,9 @@ class DatasetModel:
             return None
     
     def add_generated_dataset_to_snapshot(self, schedule_set, dataset_name, df):
-        """Appends the successfully generated dataframe to the SNAPSHOTS list.
+        """Appends the successfully generated dataframe to the SNAPSHOTS list. History is bounded by
+        snapshot_memory_budget rather than a number of snapshots; older snapshots are spilled to disk.
         """
-        if len(self._SNAPSHOTS) > 9:
-             del self._SNAPSHOTS[0]
         self._SNAPSHOTS.append(
             {
                 "Name": f"{dataset_name}", 
@@ -301,45 +1117,154 @@ class DatasetModel:
         )
         #print("Generated data set:", self._SNAPSHOTS[-1]["Dataframe"])
 
+    def get_label_mappings(self):
+        """Returns the label mappings fitted by the Label Encoding steps of every snapshot's schedule set, the most
+        recent snapshot's taking precedence, so that encoding again reuses the codes already given.
+
+        Returns:
+            dict: {column: categories}
+        """
+        mappings = {}
+        for snapshot in self._SNAPSHOTS:
+            for step in snapshot["Schedule Set"] or []:
+                mappings.update(step.get("mappings", {}))
+        return mappings
+
     def get_dataset_info(self, file_path):
-        """Reads the selected dataframe, calls the pandas.info() function and returns the dataframe info, such as
-        columns: dtypes, count, null count, row count etc.
+        """Returns the dataframe info of a databank dataset, such as columns: dtypes, count, null count, row count
+        etc. in the layout of pandas.info(). Served from the profile in the metadata store; the CSV is only parsed
+        (and the profile stored) when the dataset has no profile yet or its contents changed since it was profiled.
         Args:
             file_path (str): Path to dataset in databank.
 
         Returns:
             string: info of the selected dataset.
         """
-        buffer = io.StringIO()
-        temp_df = pd.read_csv(file_path)
-        temp_df.info(buf=buffer)
-        info = buffer.getvalue()
-        info = info.split("\n",1)[1]
-        info = f"Info:\n{info}"
-        return info
-    
-    def get_all_column_datatypes(self): 
+        name = path.splitext(path.basename(file_path))[0]
+        metadata = self.get_metadata(name=name) or {}
+        profile = metadata.get("Profile")
+        file_stat = stat(file_path)
+
+        if profile and profile["Size"] == file_stat.st_size and profile["Modified"] != file_stat.st_mtime_ns:
+            # Touched (e.g. copied or checked out) but possibly not changed; hashing is far cheaper than parsing.
+            if profile["Checksum"] == self._file_checksum(file_path=file_path):
+                profile["Modified"] = file_stat.st_mtime_ns
+                self.update_profile(name=name, profile=profile)
+
+        if not profile or (profile["Size"], profile["Modified"]) != (file_stat.st_size, file_stat.st_mtime_ns):
+            df = pd.read_parquet(file_path) if file_path.endswith(".parquet") else self.read_databank_csv(file_path)
+            profile = self.profile_dataset(df=df, file_path=file_path)
+            self.update_profile(name=name, profile=profile)
+        return f"Info:\n{self._format_profile(profile=profile)}"
+
+    def _format_profile(self, profile):
+        """Render a dataset profile the way pandas.info() renders a dataframe.
+
+        Args:
+            profile (dict): profile returned by profile_dataset.
+        """
+        rows = profile["Rows"]
+        columns = profile["Columns"]
+        table = [(" #", "Column", "Non-Null Count", "Dtype"), ("---", "------", "--------------", "-----")]
+        for position, (column, details) in enumerate(columns.items()):
+            table.append((f" {position}", column, f"{rows - details['Nulls']} non-null", details["Dtype"]))
+        widths = [max(len(row[cell]) for row in table) for cell in range(3)]
+
+        lines = [
+            f"RangeIndex: {rows} entries, 0 to {rows - 1}" if rows else "RangeIndex: 0 entries",
+            f"Data columns (total {len(columns)} columns):"
+        ]
+        lines += ["  ".join(cell.ljust(widths[index]) for index, cell in enumerate(row[:3])) + "  " + row[3]
+                  for row in table]
+
+        dtype_counts = {}
+        for details in columns.values():
+            dtype_counts[details["Dtype"]] = dtype_counts.get(details["Dtype"], 0) + 1
+        lines.append("dtypes: " + ", ".join(f"{dtype}({count})" for dtype, count in sorted(dtype_counts.items())))
+
+        memory = float(profile["Memory"])
+        for unit in ["bytes", "KB", "MB", "GB", "TB"]:
+            if memory < 1024.0 or unit == "TB":
+                break
+            memory /= 1024.0
+        lines.append(f"memory usage: {memory:3.1f} {unit}")
+        return "\n".join(lines) + "\n"
+
+    def get_all_column_datatypes(self, memory=False, canonical=False): 
         """Method to obtain the datatype listing of the entire dataframe.
         Returns a dictionary of column name keys and pandas data types. 
+
+        Args:
+            memory (bool): instead of the data type, map each column to {"before": dtype, "after": dtype,
+                "before_bytes": int, "after_bytes": int}, where "before" is the column as parsed from the CSV
+                (prior to compaction on load) and "after" the column in the current dataset.
+            canonical (bool): report compacted / nullable types by the type they were compacted from i.e. "int64",
+                "float64" or "object" (category), for callers matching on the pandas defaults.
         """
-        return {column: str(data_type) for column, data_type in self._SNAPSHOTS[-1]["Dataframe"].dtypes.items()}
-    
+        df = self._SNAPSHOTS[-1]["Dataframe"]
+        if memory:
+            report = {}
+            for column, data_type in df.dtypes.items():
+                after_bytes = int(df[column].memory_usage(index=False, deep=True))
+                report[column] = {
+                    "before": str(data_type), 
+                    "after": str(data_type), 
+                    "before_bytes": after_bytes, 
+                    "after_bytes": after_bytes
+                }
+                if column in self.compaction_report and self.compaction_report[column]["after"] == str(data_type):
+                    report[column]["before"] = self.compaction_report[column]["before"]
+                    report[column]["before_bytes"] = self.compaction_report[column]["before_bytes"]
+            return report
+        if canonical:
+            return {column: self._canonical_datatype(data_type) for column, data_type in df.dtypes.items()}
+        return {column: str(data_type) for column, data_type in df.dtypes.items()}
+
+    def _canonical_datatype(self, data_type):
+        """Name of the pandas default type a (possibly compacted) data type stands for.
+
+        Args:
+            data_type (dtype): pandas / numpy data type.
+        """
+        if pd.api.types.is_bool_dtype(data_type):
+            return str(data_type)
+        if pd.api.types.is_integer_dtype(data_type):
+            return "int64"
+        if pd.api.types.is_float_dtype(data_type):
+            return "float64"
+        if isinstance(data_type, (pd.CategoricalDtype, pd.StringDtype)):
+            return "object"
+        return str(data_type)
+
+    def _csv_datatype(self, data_type, nulls):
+        """Name of the type pandas parses a column back as once written to CSV e.g. a nullable integer column with
+        missing values as float64, or a category of strings as object.
+
+        Args:
+            data_type (dtype): pandas / numpy data type of the column written.
+            nulls (int): number of missing values in the column.
+        """
+        if isinstance(data_type, pd.CategoricalDtype):
+            return self._csv_datatype(data_type=data_type.categories.dtype, nulls=nulls)
+        if isinstance(data_type, pd.SparseDtype):
+            return self._csv_datatype(data_type=data_type.subtype, nulls=nulls)
+        if pd.api.types.is_bool_dtype(data_type):
+            return "object" if nulls else "bool"
+        if pd.api.types.is_integer_dtype(data_type):
+            return "float64" if nulls else "int64"
+        if pd.api.types.is_float_dtype(data_type):
+            return "float64"
+        return "object"
+
     def remove_dataset(self, file_name):
-        # Define the paths
-        file_path = path.join(self.databank_dir, file_name + ".csv")
-        meta_file = "db/system/dataset_metadata.json"  # Replace with the path to your JSON file
-
-        # Check if the dataset file exists before attempting to remove it
-        if path.exists(file_path):
-            remove(file_path)
-
-        # Load the JSON data from the metadata file
-        with open(meta_file, 'r') as file:
-            data = json.load(file)
-
-        # Check if the dataset exists in the metadata
-        if file_name in data:
-            del data[file_name]
-            # Save the updated JSON back to the metadata file
-            with open(meta_file, 'w') as file:
-                json.dump(data, file, indent=4)
\ No newline at end of file
+        # The dataset's file may be a CSV, or a Parquet file streamed by "Expand (add rows)".
+        for extension in (".csv", ".parquet"):
+            file_path = path.join(self.databank_dir, file_name + extension)
+
+            # Check if the dataset file exists before attempting to remove it
+            if path.exists(file_path):
+                self._discard_cache(file_path=file_path)
+                remove(file_path)
+
+        # Remove the dataset from the metadata catalog
+        self.catalog.remove(name=file_name)
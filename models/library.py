@@ -1,6 +1,9 @@
-import json, os, re
+import os
+from .catalog import CatalogModel
 
 class LibraryModel():
+    databank_extensions = (".csv", ".parquet") # File formats of databank datasets, in order of preference.
+
     def __init__(self):
         """
         Initialise the LibraryModel component of the application.
@@ -9,6 +12,7 @@ class LibraryModel():
         It initialises the models to be consumed by the controllers of this applicaiton.
         """
         self.databank_dir = "db/databank/"
+        self.catalog = CatalogModel()
 
     def convert_to_megabytes(self, byte_val):
         """
@@ -46,6 +50,22 @@ class LibraryModel():
         """
         return sorted(json_data.keys(), key=str.lower)
 
+    def dataset_path(self, name):
+        """
+        Return the path of a dataset's file in the databank: its CSV, or its Parquet file (e.g. streamed by "Expand 
+        (add rows)") when there is no CSV. The CSV path when there is neither.
+
+        Parameters
+        ----------
+        name : str
+            Name of the dataset.
+        """
+        for extension in self.databank_extensions:
+            file_path = os.path.join(self.databank_dir, name + extension)
+            if os.path.exists(file_path):
+                return file_path
+        return os.path.join(self.databank_dir, name + self.databank_extensions[0])
+
     def get_datasets(self, mode, subset=None):
         """
         Returns list of tuples. Tuples of datasets to file size.
@@ -53,27 +73,24 @@ class LibraryModel():
         dataset_file_sizes = {}
 
         if mode == "all":
-            # Load all metadata and extract datasets.
-            self._metadata = self.load_all_metadata()
-            datasets = list(self._metadata.keys())
+            # List every dataset in the catalog.
+            datasets = self.catalog.get_names()
         elif mode == "specific":
             # Use the provided subset of datasets.
             datasets = subset
 
-        # Iterate through dataset names in the metadata.
-        for d in self._metadata:
-            # Check if the dataset name is in the selected dataset list.
-            if d in datasets:
-                # Construct the full file path for the dataset csv file.
-                file_path = os.path.join("{}{}.csv".format(self.databank_dir, d))
-
-                # Check if the file exists
-                if os.path.exists(file_path):
-                    # Get the file size and convert it to megabytes.
-                    dataset_file_sizes[d] = self.convert_to_megabytes(os.path.getsize(file_path))
-                else:
-                    # If the file doesn't exist, add "-" to indicate missing data.
-                    dataset_file_sizes[d] = "-"
+        # Iterate through dataset names.
+        for d in datasets:
+            # Construct the full file path for the dataset file.
+            file_path = self.dataset_path(d)
+
+            # Check if the file exists
+            if os.path.exists(file_path):
+                # Get the file size and convert it to megabytes.
+                dataset_file_sizes[d] = self.convert_to_megabytes(os.path.getsize(file_path))
+            else:
+                # If the file doesn't exist, add "-" to indicate missing data.
+                dataset_file_sizes[d] = "-"
 
         # Convert the dictionary to a list of tuples
         return [(dataset, size) for dataset, size in dataset_file_sizes.items()]
@@ -82,68 +99,41 @@ class LibraryModel():
         """
         Return metadata for a specific file (dataset)
         """
-        return self._metadata[file_name]
+        return self.catalog.get(file_name)
     
     def load_all_metadata(self): 
         """
         Load or refresh databank's metadata information.
         """
-        # Open and store json data.
-        with open("db/system/dataset_metadata.json", "r") as json_file: 
-            json_data = json.load(json_file)
-
-        # Sort data into alphabetical order.
-        sorted_json = self.sort_datasets_alphabetically(json_data)
-        
-        # Return data.
-        return {key: json_data[key] for key in sorted_json} # Alphabetically sorted json_file by key
+        # Alphabetically sorted by name.
+        return self.catalog.get_all()
 
     def search_metadata(self, keywords):
         """
-        Search for specified keywords in metadata and return a dictionary of identified datasets.
-        Matches string in filename, source, and description fields of metadata (json) file. 
+        Search for specified keywords in metadata and return a list of identified datasets.
+        Every keyword must match part of the name, or the start of a word in the source or description, of a 
+        dataset. Served by the catalog's name and full-text indexes.
 
         Parameters
         ----------
         keywords : str
             Search string.
         """
-        # Split the input keywords into individual words
-        keyword_list = keywords.split()
-        # Initialize a set to store matching metadata
-        matching_metadata = set()
-
-        # Iterate through metadata items (string is the key, metadata is the value)
-        for string, metadata in self._metadata.items():
-            description_lower = string.lower()
-            meta_source_lower = metadata["Source"].lower()
-            meta_description_lower = metadata["Description"].lower()
-
-            # Check if all the keywords match the key, Source, or Description
-            if all(re.search(word, description_lower) or re.search(word, meta_source_lower) or re.search(word, meta_description_lower) for word in keyword_list):
-                # Add the matching metadata to the set
-                matching_metadata.add(string)
-
-        # Convert the set of matching metadata to a list and return it
-        return list(matching_metadata)
+        return self.catalog.search(keywords)
 
-    
     def add_metadata(self, obj):
         """
-        Adds metadata to the metadata store file.
+        Adds metadata to the metadata catalog.
 
         Parameters
         ----------
         obj : dict
-            Dictionary object to store in metadata file.
-        """
-        # Load the existing metadata.
-        existing_data = self.load_all_metadata()
-
-        # Update the existing metadata with new data.
-        existing_data.update(obj)
-
-        # Open the metadata file for writing
-        with open("db/system/dataset_metadata.json", "w") as json_file:
-            # Write the updated metadata to the json file
-            json.dump(existing_data, json_file, indent=4)
\ No newline at end of file
+            Dictionary object of dataset name to {"Source": str, "Description": str[, "Profile": dict]}.
+        """
+        for name, metadata in obj.items():
+            self.catalog.upsert(
+                name=name, 
+                source=metadata.get("Source", ""), 
+                description=metadata.get("Description", ""), 
+                profile=metadata.get("Profile")
+            )
@@ -1,19 +1,115 @@
 from utils.logger_utils import Logger
+from utils.random_utils import RandomGenerator
+from .dataset import Snapshot, DatasetModel
 import pandas as pd
-import random
 import numpy as np
-from sklearn.decomposition import PCA, TruncatedSVD
+import hashlib
+import json
+import weakref
+import time
+import os
+import math
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict, Counter
+from scipy import sparse
+from sklearn import config_context
+from sklearn.decomposition import PCA, TruncatedSVD, IncrementalPCA
 from sklearn.discriminant_analysis import LinearDiscriminantAnalysis
 from sklearn.feature_selection import SelectKBest, f_classif
-from sklearn.preprocessing import StandardScaler, LabelEncoder, OneHotEncoder, MinMaxScaler
-from sklearn.impute import KNNImputer
+from sklearn.preprocessing import StandardScaler, OneHotEncoder, MinMaxScaler
+from sklearn.neighbors import NearestNeighbors
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.exceptions import DataConversionWarning
-from imblearn.over_sampling import SMOTE
 import category_encoders as ce
 import warnings
 
+class PrefixCache(OrderedDict):
+    """Least recently used, memory-capped cache of the intermediate dataframes of generate_churner.
+
+    Keys identify a source snapshot and the prefix of a schedule set applied to it, see ManipulationsModel. Cached
+    dataframes share column buffers with the source snapshot and with one another and are therefore treated as
+    read-only, just like the dataframes of the SnapshotStore. The memory cap applies to the distinct column buffers
+    kept alive by the cache.
+    """
+    def __init__(self, memory_budget=256 * 1024 ** 2):
+        """
+        Args:
+            memory_budget (int): bytes of column buffers the cache may keep alive.
+        """
+        super().__init__()
+        self.memory_budget = memory_budget
+        self.buffers = {} # {key: {buffer key: bytes}} of every cached dataframe.
+        self.records = {} # {key: {step: {field: value}}} recorded by the steps of every cached prefix.
+
+    def lookup(self, key):
+        """Return the dataframe cached under key, marking it as most recently used, or None.
+
+        Args:
+            key (tuple): cache key.
+        """
+        if key not in self:
+            return None
+        self.move_to_end(key)
+        return self[key]
+
+    def store(self, key, df, records=None):
+        """Cache a dataframe, evicting the least recently used ones until the cache fits its memory budget.
+
+        Args:
+            key (tuple): cache key.
+            df (pandas dataframe): dataframe to cache, which must not be modified afterwards.
+            records (dict): {step: {field: value}} the steps of the prefix recorded in their schedule set entry.
+        """
+        snapshot = Snapshot({"Dataframe": df})
+        snapshot.measure_buffers()
+        if sum(snapshot.buffers.values()) > self.memory_budget:
+            return
+
+        self[key] = df
+        self.move_to_end(key)
+        self.buffers[key] = snapshot.buffers
+        self.records[key] = records or {}
+        while self.resident_bytes() > self.memory_budget:
+            self.discard(next(iter(self)))
+
+    def discard(self, key):
+        """Remove a dataframe from the cache.
+
+        Args:
+            key (tuple): cache key.
+        """
+        del self[key]
+        del self.buffers[key]
+        del self.records[key]
+
+    def clear(self):
+        super().clear()
+        self.buffers = {}
+        self.records = {}
+
+    def resident_bytes(self):
+        """Total bytes of distinct column buffers kept alive by the cache.
+        """
+        buffers = {}
+        for entry in self.buffers.values():
+            buffers.update(entry)
+        return sum(buffers.values())
+
 class ManipulationsModel():
+    auto_clean_workers = os.cpu_count() or 1 # Threads cleaning batches of columns in Automatic "Clean Dataset".
+    auto_clean_batch_size = 128 # Columns per batch.
+    nullable_dtypes = {"int8": "Int8", "int16": "Int16", "int32": "Int32", "int64": "Int64", "uint8": "UInt8", 
+                       "uint16": "UInt16", "uint32": "UInt32", "uint64": "UInt64", "bool": "boolean"} # "Add Missing Rate".
+    onehot_max_categories = 1000 # Most categories of a column One-hot Encoding expands unless told otherwise.
+    knn_chunk_size = 10000 # Rows with a missing value queried at once by KNN imputation.
+    knn_tree_dimensions = 16 # Most features KNN imputation indexes in a k-d tree, a ball tree above.
+    rf_max_train_rows = 100000 # Most rows Random Forest imputation trains each forest on.
+    incremental_chunk_size = 50000 # Rows per chunk of Incremental PCA / SVD.
+    smote_chunk_size = 10000 # Synthetic rows SMOTE generates at once.
+    smote_working_memory = 128 # MiB of distances SMOTE computes at once between sparse (one-hot) rows.
+    stream_block_size = 250000 # Resampled rows written to the databank at once when streaming an expansion.
+    feature_max_columns = 10000 # Most columns Polynominal / Interaction Features add unless told otherwise.
+
     def __init__(self):
         """
         Initialise the ManipulationsModel component of the application.
@@ -25,6 +121,10 @@ class ManipulationsModel():
         self._manip_collection()
         self.current_df = ""
         self.logger = Logger()
+        self.random = RandomGenerator()
+        self.result_cache = PrefixCache()
+        self._fingerprints = {} # {id(df): (weak reference to df, fingerprint)}
+        self.step_record = {} # Fields the last manipulation records in its schedule set entry e.g. label mappings.
         super().__init__()
 
     def _manip_collection(self):
@@ -44,42 +144,330 @@ class ManipulationsModel():
                 "Automatic": self.auto_mode
         }
 
-    def generate_churner(self, scheduler_row:list):
+    def generate_churner(self, scheduler_row:list, progress=None, cancel=None):
         """Generate churner function iterates through user's scheduled manipulations and
         applies them to the current dataframe. 
 
+        The schedule set is first compiled into an execution plan (see compile_plan), which is logged. The source
+        snapshot is only shallow copied: columns are copied just before a step would write into them, so the
+        snapshot (whose buffers are shared with other snapshots) is never modified and unchanged columns are
+        never copied at all.
+
+        The result of every step is cached (see PrefixCache) under a fingerprint of the source snapshot and the
+        steps applied to it so far, so running Generate again after changing only the last steps resumes from the
+        result of the unchanged ones. Random steps, and the steps after them, are only cached when a seed is fixed.
+
         Args:
             scheduler_row (list): List of scheduled manipulations.
+            progress (callable, optional): called as progress(step, status, elapsed) when a step starts ("Running")
+                and ends ("Success" / "Failed"), elapsed being the seconds it took (None if taken from the cache).
+            cancel (threading.Event, optional): checked between steps; once set, the remaining steps are skipped.
 
         Returns:
-            pandas dataframe | Bool: dataframe with applied manipulations 
-                                        or False to indicate the manipulation set failed.
-        """
-        df_copy = scheduler_row[0]["df"].copy()
-        # Set dataframe as current, but not for the first item. 
-        for index, r in enumerate(scheduler_row):
-            if not index:
-                self.current_df = self.manip_collection[r["action"]](r["sub_action"], df_copy, r["column"], 
-                                                   r["args"])
+            pandas dataframe | Bool | None: dataframe with applied manipulations 
+                                        or False to indicate the manipulation set failed, or None if cancelled.
+        """
+        # Resume from the longest prefix of the schedule set already applied to this source snapshot, if cached.
+        keys = self._prefix_keys(scheduler_row[0]["df"], scheduler_row)
+        resumed, start_df, records = 0, scheduler_row[0]["df"], {}
+        for index in range(len(keys), 0, -1):
+            cached_df = self.result_cache.lookup(keys[scheduler_row[index - 1]["step"]])
+            if cached_df is not None:
+                resumed, start_df = index, cached_df
+                records = dict(self.result_cache.records[keys[scheduler_row[index - 1]["step"]]])
+                break
+        for r in scheduler_row[:resumed]:
+            r["outcome"] = "Success"
+            r.update(records.get(r["step"], {}))
+            if progress is not None:
+                progress(r["step"], "Success", None)
+
+        plan = self.compile_plan(scheduler_row[resumed:], 
+                                 cache_after={r["step"] for r in scheduler_row[resumed:len(keys)]})
+        plan["resumed"] = resumed
+        for line in self.explain_plan(plan).splitlines():
+            self.logger.log_info(line)
+
+        self.current_df = start_df.copy(deep=False)
+        cancelled = False
+        for stage in plan["stages"]:
+            if isinstance(self.current_df, pd.DataFrame):
+                if stage["deep_copy"]:
+                    self.current_df = self.current_df.copy()
+                for col in stage["copies"]:
+                    # Assigning a copy gives the column a buffer of its own, in place writes then leave others alone.
+                    self.current_df[col] = self.current_df[col].copy()
+
+            for r in stage["steps"]:
+                cancelled = cancelled or (cancel is not None and cancel.is_set())
+
+                # Once a step has failed or the run is cancelled, the remaining steps are left pending.
+                if self.current_df is False or cancelled:
+                    r["outcome"] = "Pending"
+                    continue
+
+                if progress is not None:
+                    progress(r["step"], "Running", None)
+                if r.get("seed") is not None:
+                    # Seeded per step, so a step draws the same numbers whether or not earlier ones came from the cache.
+                    self.random.reseed(r["seed"], r["step"])
+                start = time.perf_counter()
+                self.step_record = {}
+                self.current_df = self.manip_collection[r["action"]](r["sub_action"], self.current_df, 
+                                                                    r["column"], r["args"])
                 match self.current_df:
                     case False:
                         r["outcome"] = "Failed"
                     case _:
-                        r["outcome"] = "Success"          
-            else:
-                match self.current_df:
-                    case False:
-                        r["outcome"] = "Pending"
-                    case _:
-                        self.current_df  = self.manip_collection[r["action"]](r["sub_action"], 
-                                                                self.current_df, r["column"], r["args"])
-                        match self.current_df:
-                            case False:
-                                r["outcome"] = "Failed"
-                            case _:
-                                r["outcome"] = "Success"
+                        r["outcome"] = "Success"
+                        if self.step_record:
+                            # Kept with the schedule set of the generated snapshot e.g. fitted label mappings.
+                            r.update(self.step_record)
+                            records[r["step"]] = self.step_record
+                        if r["step"] in plan["cache_after"] and isinstance(self.current_df, pd.DataFrame):
+                            self.result_cache.store(keys[r["step"]], self.current_df.copy(deep=False), dict(records))
+                if progress is not None:
+                    progress(r["step"], r["outcome"], time.perf_counter() - start)
+
+        if cancelled:
+            self.current_df = ""
+            return None
         return self.current_df
 
+    def compile_plan(self, scheduler_row:list, cache_after=()):
+        """Compiles the user's scheduled manipulations into an execution plan for generate_churner.
+
+        Consecutive steps which only touch columns (i.e. do not build a new dataframe) and touch disjoint sets of
+        columns are fused into a single stage, which makes the copies all its steps need in one go before any of
+        them runs. The copies themselves are worked out by following which columns are private to the dataframe
+        being generated: the source snapshot is shallow copied, steps which assign whole new columns or only add
+        columns need no copy, and only columns a step writes into in place are copied, once. Steps which write
+        into every column fall back to a full copy. With pandas copy-on-write enabled no copies are needed at all.
+
+        A step whose result is to be cached ends its stage, and since the cached dataframe shares every column with
+        the one being generated, all columns are treated as shared again from there on.
+
+        Args:
+            scheduler_row (list): List of scheduled manipulations.
+            cache_after (set): step numbers whose result is to be cached.
+
+        Returns:
+            dict: {"copy_on_write": bool, "cache_after": set, "stages": [{"steps": [], "effects": [], 
+                   "columns": set | None, "copies": [], "deep_copy": bool}]}
+        """
+        copy_on_write = self._copy_on_write()
+        stages = []
+
+        # Fuse consecutive column-local steps touching disjoint columns.
+        for r in scheduler_row:
+            effect, columns = self._step_effect(r)
+            fusable = effect != "new frame" and columns is not None
+            stage = stages[-1] if stages else None
+            if (fusable and stage and stage["columns"] is not None and not stage["columns"] & columns 
+                    and stage["steps"][-1]["step"] not in cache_after):
+                stage["steps"].append(r)
+                stage["effects"].append((effect, columns))
+                stage["columns"] |= columns
+            else:
+                stages.append({"steps": [r], "effects": [(effect, columns)], 
+                               "columns": set(columns) if fusable else None, "copies": [], "deep_copy": False})
+
+        # Columns known to be private to the dataframe being generated (not shared with the source snapshot).
+        private, all_private = set(), copy_on_write
+        for stage in stages:
+            for r, (effect, columns) in zip(stage["steps"], stage["effects"]):
+                match effect:
+                    case "new frame":
+                        # A new dataframe may still share buffers with its input.
+                        private, all_private = set(), copy_on_write
+                    case "new column":
+                        private.add(r["args"]["a"])
+                    case "rename":
+                        if r["column"] in private:
+                            private = (private - {r["column"]}) | {r["args"]["a"]}
+                    case "replace":
+                        if columns is not None:
+                            private |= columns
+                    case "write":
+                        if all_private:
+                            continue
+                        if columns is None:
+                            stage["deep_copy"], all_private = True, True
+                        else:
+                            stage["copies"] += [col for col in columns if col not in private]
+                            private |= columns
+
+                if r["step"] in cache_after:
+                    private, all_private = set(), copy_on_write
+
+        return {"copy_on_write": copy_on_write, "cache_after": set(cache_after), "stages": stages}
+
+    def explain_plan(self, plan:dict):
+        """Describes an execution plan produced by compile_plan: its stages, which steps were fused together and
+        the copies made before each stage.
+
+        Args:
+            plan (dict): execution plan.
+
+        Returns:
+            str: one line per stage and per step.
+        """
+        step_count = sum(len(stage["steps"]) for stage in plan["stages"])
+        lines = [f"Execution plan: {step_count} step(s) in {len(plan['stages'])} stage(s), source shallow copied" 
+                 + (" (copy-on-write)" if plan["copy_on_write"] else "")]
+        if plan.get("resumed"):
+            lines.append(f"Resumed from the cached result of the first {plan['resumed']} step(s)")
+
+        for number, stage in enumerate(plan["stages"], start=1):
+            steps = ", ".join(str(r["step"]) for r in stage["steps"])
+            if len(stage["steps"]) > 1:
+                lines.append(f"Stage {number}: steps {steps} fused (disjoint columns: "
+                             f"{', '.join(sorted(map(str, stage['columns'])))})")
+            else:
+                lines.append(f"Stage {number}: step {steps}")
+
+            if stage["deep_copy"]:
+                lines.append("    copy: entire dataframe")
+            elif stage["copies"]:
+                lines.append(f"    copy: {', '.join(map(str, stage['copies']))}")
+
+            for r, (effect, columns) in zip(stage["steps"], stage["effects"]):
+                touched = "every column" if columns is None else ", ".join(sorted(map(str, columns)))
+                lines.append(f"    {r['step']}. {r['action']} | {r['sub_action']} | {r['column']} -> {effect}"
+                             + ("" if effect == "new frame" else f" ({touched})")
+                             + (", cached" if r["step"] in plan.get("cache_after", ()) else ""))
+        return "\n".join(lines)
+
+    def _step_effect(self, row:dict):
+        """How a scheduled manipulation treats the dataframe it is given, used to plan its execution.
+
+        Args:
+            row (dict): scheduled manipulation.
+
+        Returns:
+            tuple: effect and the set of column names it touches (None for every column). Effect is one of
+                "new frame": builds a new dataframe from its input.
+                "new column": only adds a column (from another one) to its input.
+                "rename": renames a column of its input.
+                "replace": assigns whole new columns to its input, never writing into the existing ones.
+                "write": writes values into existing columns of its input.
+        """
+        sub_action, column, a = row["sub_action"], row["column"], row["args"]["a"]
+        columns = None if column in ("", None) else {column}
+
+        match row["action"], sub_action:
+            case ("Reduce Columns (Dimensionality)" | "Reduce Remove Rows" | "Expand (add rows)", _):
+                return "new frame", None
+            case ("Add Column", "Duplicate" | "New"):
+                return "new column", {column, a}
+            case ("Add Column", "Feature Engineering Polynominal Features" | "Feature Engineering Interaction Features"):
+                return "new frame", None
+            case ("Change Column Name", _):
+                return "rename", {column, a}
+            case ("Replace Missing Values" | "Replace Value (x) with New Value" | "Replace Outliers with Missing", _):
+                return "replace", columns
+            case ("Add Noise", "Add Outliers Z-score"):
+                return "replace", columns
+            case ("Add Noise", "Add Missing" | "Add Missing Rate") if columns is None:
+                return "new frame", None
+            case ("Add Noise", "Add Missing Rate"):
+                return "replace", columns
+            case ("Add Noise", "Add Random Custom Value" | "Add Missing" | "Add Outliers Percentile"):
+                return "write", columns
+            case ("Data Transformation", "Feature Encoding Target Encoding") | ("Automatic", "Clean Dataset"):
+                return "replace", None
+            case ("Data Transformation", _):
+                return "new frame", None
+            case _:
+                # Unknown effect: assume it writes into every column.
+                return "write", None
+
+    def _prefix_keys(self, source, scheduler_row:list):
+        """Cache keys of the results of the leading steps of a schedule set which can be reproduced exactly.
+
+        Args:
+            source (pandas dataframe): dataframe the schedule set is applied to.
+            scheduler_row (list): List of scheduled manipulations.
+
+        Returns:
+            dict: {step number: (fingerprint of the source, canonical form of the steps up to and including it)}
+        """
+        keys = {}
+        fingerprint = self._fingerprint(source)
+        if fingerprint is None:
+            return keys
+
+        prefix = ()
+        for r in scheduler_row:
+            if not self._is_reproducible(r):
+                break
+            prefix += (json.dumps({"action": r["action"], "sub_action": r["sub_action"], "column": r["column"], 
+                                   "args": r["args"], "seed": r.get("seed")}, sort_keys=True, default=str),)
+            keys[r["step"]] = (fingerprint, prefix)
+        return keys
+
+    def _fingerprint(self, df):
+        """Content hash of a dataframe (values, index, column names and dtypes), remembered for as long as the
+        dataframe is alive since the dataframes of the snapshots are never modified.
+
+        Args:
+            df (pandas dataframe): dataframe to fingerprint.
+
+        Returns:
+            str | None: hex digest, or None if the dataframe holds values which cannot be hashed.
+        """
+        reference, fingerprint = self._fingerprints.get(id(df), (None, None))
+        if reference is not None and reference() is df:
+            return fingerprint
+
+        try:
+            digest = hashlib.sha256(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+        except TypeError:
+            return None
+        digest.update(repr((list(df.columns), [str(dtype) for dtype in df.dtypes])).encode())
+
+        self._fingerprints = {key: entry for key, entry in self._fingerprints.items() if entry[0]() is not None}
+        self._fingerprints[id(df)] = (weakref.ref(df), digest.hexdigest())
+        return digest.hexdigest()
+
+    def _is_reproducible(self, row:dict):
+        """Whether running a scheduled manipulation again on the same dataframe gives the same result i.e. it does
+        not draw random numbers, or its seed is fixed.
+
+        Args:
+            row (dict): scheduled manipulation.
+        """
+        match row["action"], row["sub_action"]:
+            case ("Expand (add rows)", "Random Sampling" | "Bootstrap Resampling") if row["args"]["b"] == "Stream":
+                # Writes a dataset to the databank, which must happen every time the step is run.
+                return False
+            case ("Reduce Columns (Dimensionality)", "Algorithmic Incremental PCA" | "Algorithmic Incremental SVD") if (
+                    isinstance(row["args"]["c"], dict) and any(row["args"]["c"].values())):
+                # Reads a databank dataset rather than its input, or writes one.
+                return False
+            case (("Add Noise", _) | ("Expand (add rows)", "Random Sampling" | "Bootstrap Resampling" | "SMOTE") 
+                  | ("Reduce Columns (Dimensionality)", "Algorithmic PCA" | "Algorithmic SVD") 
+                  | ("Automatic", "Dirty Dataset")):
+                return row.get("seed") is not None
+            case ("Replace Missing Values", "Algorithmic Categorical") if row["args"]["a"] == "Random Sampling Fill":
+                return row.get("seed") is not None
+            case ("Replace Missing Values", "Algorithmic Numerical") if row["args"]["a"] == "Random Forest":
+                # Bootstrapped trees, and a random sample of rows above rf_max_train_rows.
+                return row.get("seed") is not None
+            case ("Data Transformation", "Feature Encoding Target Encoding") if row["args"]["b"] not in ("", None, 1):
+                # Out-of-fold encoding assigns rows to random folds.
+                return row.get("seed") is not None
+            case _:
+                return True
+
+    def _copy_on_write(self):
+        """Whether pandas copy-on-write is enabled, in which case a shallow copy is never written through.
+        """
+        try:
+            return bool(pd.get_option("mode.copy_on_write"))
+        except KeyError:
+            return False
+
     def update_schedule_set(self, manip_set:dict):
         """Builds the schedule set user clicks schedule button. Initiates from the manipulation controller.
 
@@ -98,10 +486,10 @@ class ManipulationsModel():
 
                     # Get the number of rows in the DataFrame
                     num_rows = df.shape[0]
-                    # Generate a random set of row indices to replace       
-                    random_row_indices = random.sample(range(num_rows), b)                    
+                    # Generate a random set of row positions to replace       
+                    random_row_indices = self.random.generator.choice(num_rows, b, replace=False)
                     # Replace the selected rows with the custom value
-                    df.loc[random_row_indices, column] = a                                   
+                    df.loc[df.index[random_row_indices], column] = a                                   
                     return df
 
                 case "Add Missing":
@@ -111,20 +499,34 @@ class ManipulationsModel():
                         case "" | None:
                             # Function to add missing value to the entrie dataset                     
                             num_values_to_set_nan = min(a, df.size)
-                            random_indices = random.sample(range(df.size), num_values_to_set_nan)
-                            mask = np.zeros(df.shape, dtype=bool)
-                            mask.ravel()[random_indices] = True
-                            df[mask] = np.nan
-                            
-                            return df
+                            counts = self._missing_counts(df, num_values_to_set_nan)
+                            return self._inject_missing(df, counts)
                         case _:
                             # Function to add missing value to the selected column                        
                             # Generate a random set of row indices to replace                
-                            random_row_indices = np.random.choice(len(df), a, replace=False)
+                            random_row_indices = self.random.generator.choice(len(df), a, replace=False)
                             # Introduce missing values to the selected variable
-                            df.loc[random_row_indices, column] = np.nan
+                            df.loc[df.index[random_row_indices], column] = np.nan
                             return df
                         
+                case "Add Missing Rate":
+                    # Function to add missing values while keeping the dtype of integer and boolean columns, which
+                    # become their pandas nullable counterparts (Int64, boolean, ...) rather than float / object
+                    # a = fraction of missing values (0 to 1); b = "Exact" for exactly a * size missing values
+                    # spread over the selected cells, "Per Column" for exactly a * rows missing values in every
+                    # column; column = the selected column, "" for the entire dataset
+                    rate = float(a)
+                    if not 0 <= rate <= 1:
+                        raise ValueError(f"Missing rate must be between 0 and 1, got {a}.")
+                    if column not in ("", None):
+                        counts = np.zeros(df.shape[1], dtype=np.int64)
+                        counts[df.columns.get_loc(column)] = round(rate * len(df))
+                    elif b == "Per Column":
+                        counts = np.full(df.shape[1], round(rate * len(df)), dtype=np.int64)
+                    else:
+                        counts = self._missing_counts(df, round(rate * df.size))
+                    return self._inject_missing(df, counts, nullable=True)
+
                 case "Add Outliers Z-score":
                     # Functionto add outliers to the selected to column  based on z-score              
                     # a = z-score threshold; column = the selected column
@@ -135,7 +537,7 @@ class ManipulationsModel():
                     # Ensure the target column has a floating-point dtype
                     df[column] = df[column].astype(float)
                     # Introduce outliers using .loc to set values
-                    outlier_values = np.random.uniform(5, 10, len(outlier_indices)).astype(float) 
+                    outlier_values = self.random.generator.uniform(5, 10, len(outlier_indices)).astype(float) 
                     df.loc[df.index[outlier_indices], column] += outlier_values
                     return df
 
@@ -153,12 +555,16 @@ class ManipulationsModel():
                     lower_bound = Q1 - 1.5 * IQR
                     upper_bound = Q3 + 1.5 * IQR
 
+                    # Integer columns (including compacted and nullable ones) cannot hold the outliers: made float64
+                    if pd.api.types.is_integer_dtype(df[column].dtype):
+                        df[column] = df[column].astype(np.float64)
+
                     # Randomly select a rows from the DataFrame
-                    selected_rows = df.sample(n=a, replace=True)
+                    selected_rows = df.sample(n=a, replace=True, random_state=self.random.generator)
 
                     # Generate a random outliers below the lower bound and above the upper bound
-                    lower_outliers = np.random.uniform(lower_bound - 1.5 * IQR, lower_bound, a // 2)
-                    upper_outliers = np.random.uniform(upper_bound, upper_bound + 1.5 * IQR, (a- (a // 2)))
+                    lower_outliers = self.random.generator.uniform(lower_bound - 1.5 * IQR, lower_bound, a // 2)
+                    upper_outliers = self.random.generator.uniform(upper_bound, upper_bound + 1.5 * IQR, (a- (a // 2)))
                     outliers = np.concatenate([lower_outliers, upper_outliers])
 
                     # Add the outliers to the selected rows in the selected column
@@ -179,6 +585,72 @@ class ManipulationsModel():
             return False
 
 
+    def _feature_products(self, df, column, degree, interaction_only=False, output="Dense", max_columns=None):
+        """Polynomial (or interaction only) features of the numerical columns of a dataframe, named and ordered as
+        scikit-learn's PolynomialFeatures names and orders them. The number of columns this adds is worked out, and
+        checked against max_columns, before anything is allocated. The products of each degree are computed from
+        those of the degree below, one vectorised product per term of that degree.
+
+        Args:
+            df (pandas dataframe): dataframe to add the features to.
+            column (str): dependent column left out of the features, empty for none.
+            degree (int): highest degree of the products, at least 2.
+            interaction_only (bool): only products of distinct columns, no powers.
+            output (str): "Dense" (float64), "Float32" or "Sparse" (float64) new columns.
+            max_columns (int): most columns to add, feature_max_columns when None.
+
+        Returns:
+            pandas dataframe: the dataframe with the products of degree 2 to degree added, replacing columns of
+                the same name.
+        """
+        features = df.drop(columns=[column] if column else []).select_dtypes("number")
+        n = features.shape[1]
+        if degree < 2:
+            raise ValueError("The degree must be at least 2.")
+        count = sum(math.comb(n, d) if interaction_only else math.comb(n + d - 1, d) for d in range(2, degree + 1))
+        max_columns = self.feature_max_columns if max_columns is None else max_columns
+        if count > max_columns:
+            raise ValueError(f"{count} columns would be added to the {n} numerical columns, more than the limit "
+                             f"of {max_columns}. Lower the degree or raise the limit.")
+        if count == 0:
+            raise ValueError("There are not enough numerical columns to add any.")
+
+        dtype = np.float32 if output == "Float32" else np.float64
+        X = features.to_numpy(dtype=dtype, na_value=np.nan)
+        sparse_output = output == "Sparse"
+        # Dense output is written straight into its final array, sparse output one (dense) product at a time.
+        out = None if sparse_output else np.empty((len(df), count), dtype=dtype)
+        blocks, names, position = [], [], 0
+        previous, previous_terms = X, [(j,) for j in range(n)] # Products of the degree below and their columns.
+        for _ in range(2, degree + 1):
+            terms, start_position, degree_blocks = [], position, []
+            for i, term in enumerate(previous_terms):
+                start = term[-1] + interaction_only
+                width = n - start
+                if width <= 0:
+                    continue
+                if sparse_output:
+                    values = previous[:, [i]].toarray() if sparse.issparse(previous) else previous[:, [i]]
+                    degree_blocks.append(sparse.csc_matrix(values * X[:, start:]))
+                else:
+                    np.multiply(previous[:, [i]], X[:, start:], out=out[:, position:position + width])
+                terms += [term + (j,) for j in range(start, n)]
+                position += width
+            if not terms:
+                break
+            previous = sparse.hstack(degree_blocks, format="csc") if sparse_output else out[:, start_position:position]
+            blocks.append(previous)
+            previous_terms = terms
+            names += [" ".join(str(features.columns[j]) + (f"^{power}" if power > 1 else "") 
+                               for j, power in Counter(term).items()) for term in terms]
+
+        if sparse_output:
+            new = pd.DataFrame.sparse.from_spmatrix(sparse.hstack(blocks, format="csc"), index=df.index, 
+                                                    columns=names)
+        else:
+            new = pd.DataFrame(out, index=df.index, columns=names, copy=False)
+        return pd.concat([df.drop(columns=[name for name in names if name in df]), new], axis=1)
+
     def add_column(self, sub_action, df, column, args):
         """Adds a column(s) to a pandas dataframe.
 
@@ -199,21 +671,23 @@ class ManipulationsModel():
                     # Function to add an extra column by duplicating an existing column
                     # a = new column's name; column = the selected column
 
-                    df_with_duplicate_column = df.copy()
-                    df_with_duplicate_column[a] = df_with_duplicate_column[column]
-                    return df_with_duplicate_column
+                    # Only the new column is copied, not the entire dataframe.
+                    df[a] = df[column]
+                    return df
                 
                 case "New":
                     # Function to add new column to dataframe.
                     # a = new column's name
                     df[a]=None
                     return df
-                case "Feature Engineering Polynominal Features":
-                    # Insert function here!!!
-                    pass
-                case "Feature Engineering Interaction Features":
-                    # Insert function here!!!
-                    pass
+                case "Feature Engineering Polynominal Features" | "Feature Engineering Interaction Features":
+                    # column = dependent column left out, empty for none; a = degree, empty for 2; 
+                    # b = "Dense", "Float32" or "Sparse" output, empty for dense; c = most columns to add, empty 
+                    # for feature_max_columns
+                    # Function to add the products of the numerical columns, see _feature_products
+                    return self._feature_products(df, column, a if a not in ("", None) else 2, 
+                                                  sub_action.endswith("Interaction Features"), b or "Dense", 
+                                                  c if c not in ("", None) else None)
 
         except Exception as error:
             self.logger.log_exception("Manipulation failed to complete. Traceback:")
@@ -231,7 +705,7 @@ class ManipulationsModel():
                     # Extract the features (X) from the DataFrame
                     X = df.drop(columns=[column])  
                     #Initialize and fit the PCA model
-                    pca = PCA(n_components=a)
+                    pca = PCA(n_components=a, random_state=self.random.random_state())
                     X_pca = pca.fit_transform(X)
                     # Create a DataFrame with the reduced dimensionality
                     columns = [f'PC{i+1}' for i in range(a)]
@@ -269,7 +743,7 @@ class ManipulationsModel():
                     X = df.drop(columns=[column])
 
                     # Initialize and fit the TruncatedSVD model
-                    svd = TruncatedSVD(n_components=a)
+                    svd = TruncatedSVD(n_components=a, random_state=self.random.random_state())
                     X_svd = svd.fit_transform(X)
 
                     # Create a DataFrame with the reduced dimensionality
@@ -280,6 +754,27 @@ class ManipulationsModel():
                     df_svd[column] = df[column]                       
                     return df_svd
                 
+                case "Algorithmic Incremental PCA" | "Algorithmic Incremental SVD":
+                    # Function to reduce dataset dimensionality chunk by chunk, see incremental_reduce
+                    # column = the target column; a = number of features to keep; b = rows per chunk, empty for
+                    # incremental_chunk_size; c = {"source": databank CSV dataset read instead of the dataframe,
+                    # "name": new databank dataset the reduced rows are streamed to}, each optional
+                    options = c if isinstance(c, dict) else {}
+                    source = df
+                    if options.get("source"):
+                        source = os.path.join(DatasetModel().databank_dir, options["source"] + ".csv")
+                        if not os.path.exists(source):
+                            raise ValueError(f"There is no CSV dataset named {options['source']} in the databank.")
+                    chunks = self._incremental_reduced_chunks(source, column, a, method=sub_action.split()[-1], 
+                                                              chunk_size=b if b not in ("", None) else None)
+                    if not options.get("name"):
+                        return pd.concat(chunks, ignore_index=True)
+
+                    # Streamed to disk like an expansion, the reduced dataset need not fit in memory either
+                    DatasetModel().stream_to_databank(name=options["name"], blocks=chunks, source="Synthetic Databank",
+                                                      description=f"{sub_action} to {a} components.")
+                    return df
+
                 case "Algorithmic Sklearn":
                     # Function to reduce dataset dimensionality using SKlearn Feature Selection
                     # column = target (dependent) column; a = number of columns(features) to retain
@@ -337,49 +832,33 @@ class ManipulationsModel():
         
     def replace_outliers(self, sub_action, df, column, args): 
         a, b, c = args["a"], args["b"], args["c"]  #unpack args
+        # a = lower percentile; b = upper percentile; column = the selected column or "" for the entire dataset.
+        # Values more than 1.5 IQR (between the two percentiles) outside of the percentiles are replaced with NaN.
 
         try:        
             match column:
                 case "":
-
-                    for col in df:
-                        Q1 = df[col].quantile(a/100)
-                        Q3 = df[col].quantile(b/100)
-                        IQR = Q3 - Q1
-
-                        # Calculate lower_bound and upper_bound for outliers
-                        lower_bound = Q1 - 1.5 * IQR
-                        upper_bound = Q3 + 1.5 * IQR
-                        index = 0
-                        match df[col].dtypes:
-                            case "int64" | "float64":
-                                for data in df[col]:
-                                    if float(data) < float(lower_bound):
-                                        df.loc[index, col] = np.nan
-                                    elif float(data) > float(upper_bound):
-                                        df.loc[index, col] = np.nan
-                                    index +=1
-                            case _:
-                                pass
+                    positions = [position for position in range(df.shape[1]) if self._is_numeric(df.iloc[:, position])]
                 case _:
-                    Q1 = df[column].quantile(a/100)
-                    Q3 = df[column].quantile(b/100)
-                    IQR = Q3 - Q1
+                    position = df.columns.get_loc(column)
+                    positions = [position] if self._is_numeric(df.iloc[:, position]) else []
 
-                    # Calculate lower_bound and upper_bound for outliers
-                    lower_bound = Q1 - 1.5 * IQR
-                    upper_bound = Q3 + 1.5 * IQR
-                    index = 0
-                    match df[column].dtypes:
-                        case "int64" | "float64":
-                            for data in df[column]:
-                                if float(data) < float(lower_bound):
-                                    df.loc[index, column] = np.nan
-                                elif float(data) > float(upper_bound):
-                                    df.loc[index, column] = np.nan
-                                index +=1
-                        case _:
-                            pass
+            if positions:
+                numeric = df.iloc[:, positions]
+
+                # Every bound of every column from a single quantile call.
+                quantiles = numeric.quantile([a/100, b/100])
+                Q1, Q3 = quantiles.iloc[0], quantiles.iloc[1]
+                IQR = Q3 - Q1
+
+                # Calculate lower_bound and upper_bound for outliers
+                lower_bound = Q1 - 1.5 * IQR
+                upper_bound = Q3 + 1.5 * IQR
+                outliers = numeric.lt(lower_bound, axis=1) | numeric.gt(upper_bound, axis=1)
+
+                # Replace in place (Automatic relies on it), leaving columns without outliers and their dtype alone.
+                for offset in np.flatnonzero(outliers.any().to_numpy()):
+                    df.isetitem(positions[offset], numeric.iloc[:, offset].mask(outliers.iloc[:, offset]))
             return df
                 
         except Exception as error:
@@ -387,6 +866,506 @@ class ManipulationsModel():
             self.error_msg = error
             return False
 
+    def _missing_counts(self, df, total):
+        """Number of missing values to inject in each column so that, together, total cells of df drawn
+        uniformly at random without replacement are set missing. Draws the per column counts from a multivariate
+        hypergeometric distribution instead of drawing cell positions, so no array the size of df is built.
+
+        Args:
+            df (pandas dataframe): dataframe receiving the missing values.
+            total (int): number of missing values, at most df.size.
+
+        Returns:
+            numpy array: number of missing values of each column, by position.
+        """
+        if not df.shape[1]:
+            return np.zeros(0, dtype=np.int64)
+        return self.random.generator.multivariate_hypergeometric(np.full(df.shape[1], len(df)), total)
+
+    def _inject_missing(self, df, counts, nullable=False):
+        """Set random values of df missing, one column at a time, so extra memory stays proportional to a single
+        column rather than to the entire dataframe. Columns receiving no missing value are shared with df, not
+        copied; df itself is left alone.
+
+        Args:
+            df (pandas dataframe): dataframe receiving the missing values.
+            counts (array): number of missing values of each column, by position.
+            nullable (bool): convert integer and boolean columns receiving missing values to their pandas
+                nullable dtype (Int64, boolean, ...). Otherwise they become float64 / object as with NaN.
+
+        Returns:
+            pandas dataframe: dataframe with the missing values.
+        """
+        columns = {}
+        for position in range(df.shape[1]):
+            values = df.iloc[:, position]
+            if counts[position]:
+                rows = self.random.generator.choice(len(df), counts[position], replace=False)
+                if nullable and values.dtype.name in self.nullable_dtypes:
+                    values = values.astype(self.nullable_dtypes[values.dtype.name])
+                else:
+                    values = values.copy()
+                values.iloc[rows] = np.nan
+            columns[position] = values.array
+        result = pd.DataFrame(columns, index=df.index, copy=False)
+        result.columns = df.columns
+        return result
+
+    def _label_encode(self, values, categories):
+        """Label encoding of one categorical column. The distinct values are factorized (sorted) once and mapped to
+        their position in categories with a single take, rather than looking up every value.
+
+        Args:
+            values (pandas series): categorical column.
+            categories (list): known categories, whose position is their code.
+
+        Returns:
+            tuple: encoded column (int64, float64 with NaN if values has missing values) and categories, extended
+                with the values it did not know in sorted order.
+        """
+        codes, uniques = pd.factorize(values, sort=True)
+        uniques = pd.Index(uniques, dtype=object) # Categories of a category column as plain values.
+        categories = pd.Index(categories, dtype=object)
+        positions = categories.get_indexer(uniques)
+        if (positions < 0).any():
+            categories = categories.append(uniques[positions < 0])
+            positions = categories.get_indexer(uniques)
+
+        encoded = positions.take(codes)
+        if (codes < 0).any():
+            encoded = np.where(codes < 0, np.nan, encoded)
+        return pd.Series(encoded, index=values.index, name=values.name), categories.tolist()
+
+    def decode_labels(self, df, mappings):
+        """Reverse Label Encoding: replaces the codes of the columns of df found in mappings with their categories,
+        one take per column. Leaves df alone.
+
+        Args:
+            df (pandas dataframe): label encoded dataframe.
+            mappings (dict): {column: categories}, as recorded in the schedule set entry of the encoding step.
+
+        Returns:
+            pandas dataframe: decoded dataframe.
+        """
+        df = df.copy(deep=False)
+        for cols, categories in mappings.items():
+            if cols in df:
+                codes = df[cols].to_numpy(dtype=np.float64, na_value=np.nan)
+                missing = np.isnan(codes)
+                decoded = np.asarray(categories, dtype=object).take(np.where(missing, 0, codes).astype(np.int64))
+                decoded[missing] = np.nan
+                df[cols] = decoded
+        return df
+
+    def _target_encode(self, values, y, fold, folds, smoothing):
+        """Target encoding of one categorical column, from per category sums and counts of the target gathered in
+        a single bincount over (category, fold) pairs. Each row is encoded as
+        (sum + smoothing * prior) / (count + smoothing) over the rows of its category outside of its fold, where
+        the prior is the mean target outside of its fold. Missing values, categories only seen in the row's own
+        fold and categories without any target value are encoded as the prior.
+
+        Args:
+            values (pandas series): categorical column.
+            y (numpy array): target, as float64 (NaN rows are left out of the statistics).
+            fold (numpy array): fold of each row, 0 to folds - 1.
+            folds (int): number of folds, 1 to encode every row from all rows.
+            smoothing (float): weight of the prior, 0 for the plain mean of the category.
+
+        Returns:
+            numpy array: encoded column.
+        """
+        codes, categories = pd.factorize(values)
+        known = ~np.isnan(y)
+        pairs = codes * folds + fold
+        size = len(categories) * folds
+        keep = known & (codes >= 0)
+        fold_sums = np.bincount(pairs[keep], weights=y[keep], minlength=size).reshape(-1, folds)
+        fold_counts = np.bincount(pairs[keep], minlength=size).reshape(-1, folds)
+        fold_target_sums = np.bincount(fold[known], weights=y[known], minlength=folds)
+        fold_target_counts = np.bincount(fold[known], minlength=folds)
+
+        # Statistics of the rows outside of each fold (or of every row with a single fold)
+        if folds > 1:
+            sums = fold_sums.sum(axis=1, keepdims=True) - fold_sums
+            counts = fold_counts.sum(axis=1, keepdims=True) - fold_counts
+            priors = (fold_target_sums.sum() - fold_target_sums) / (fold_target_counts.sum() - fold_target_counts)
+        else:
+            sums, counts = fold_sums, fold_counts
+            priors = fold_target_sums / fold_target_counts
+        with np.errstate(invalid="ignore", divide="ignore"):
+            encoding = (sums + smoothing * priors) / (counts + smoothing)
+        encoding = np.where(counts > 0, encoding, priors)
+
+        return np.where(codes >= 0, encoding[np.maximum(codes, 0), fold], priors[fold])
+
+    def _clean_columns(self, df, positions):
+        """Clean Dataset applied to a batch of columns: values more than 1.5 IQR outside of the 1st and 99th
+        percentiles are replaced with NaN (as replace_outliers does), then missing values are replaced with the
+        mean of numeric columns (any integer or float dtype, see _is_numeric) and the mode of any other column (as
+        replace_null_values does). The numeric columns of the batch are processed as a single 2D float64 array,
+        float columns keeping their dtype, other columns one by one. Leaves df alone.
+
+        Args:
+            df (pandas dataframe): dataframe being cleaned.
+            positions (list): positions of the columns to clean.
+
+        Returns:
+            dict: {position: cleaned values} for the columns which changed.
+        """
+        batch = df.iloc[:, positions]
+        numeric = [offset for offset in range(batch.shape[1]) if self._is_numeric(batch.iloc[:, offset])]
+        cleaned = {}
+        if numeric:
+            frame = batch.iloc[:, numeric]
+
+            # Every bound of every column from a single quantile call.
+            quantiles = frame.quantile([0.01, 0.99])
+            Q1, Q3 = quantiles.iloc[0], quantiles.iloc[1]
+            IQR = Q3 - Q1
+            outliers = (frame.lt(Q1 - 1.5 * IQR, axis=1) | frame.gt(Q3 + 1.5 * IQR, axis=1)).to_numpy(dtype=bool, 
+                                                                                                     na_value=False)
+
+            # Numeric columns with outliers or missing values: one (columns, rows) float64 array.
+            wide = [index for index in range(frame.shape[1]) 
+                    if outliers[:, index].any() or frame.iloc[:, index].hasnans]
+            if wide:
+                values = np.ascontiguousarray(frame.iloc[:, wide].to_numpy(dtype=np.float64, na_value=np.nan).T)
+                values[outliers[:, wide].T] = np.nan
+                means = pd.DataFrame(values.T, copy=False).mean().to_numpy()
+                values = np.where(np.isnan(values), means[:, None], values)
+                for row, index in enumerate(wide):
+                    dtype = frame.dtypes.iloc[index]
+                    # float32 columns (e.g. compacted ones) stay float32, integer columns become float64.
+                    keep = isinstance(dtype, np.dtype) and dtype.kind == "f"
+                    cleaned[positions[numeric[index]]] = values[row].astype(dtype) if keep else values[row]
+
+        for offset, position in enumerate(positions):
+            col = cleaned.get(position, batch.iloc[:, offset])
+            if not isinstance(col, pd.Series) or not col.isna().any():
+                continue
+            try:
+                if self._is_numeric(col):
+                    cleaned[position] = col.fillna(col.mean())
+                else:
+                    cleaned[position] = col.fillna(col.mode().values[0])
+            except Exception as error:
+                # As with replace_null_values, a column which cannot be filled is left with its missing values.
+                self.logger.log_exception("Manipulation failed to complete. Traceback:")
+                self.error_msg = error
+                cleaned[position] = col
+        return cleaned
+
+    def _row_chunks(self, source, chunk_size):
+        """Yield the rows of a dataframe, or of a CSV file read chunk by chunk, chunk_size rows at a time.
+
+        Args:
+            source (pandas dataframe or str): dataframe or path of a CSV file.
+            chunk_size (int): rows per chunk.
+        """
+        if isinstance(source, pd.DataFrame):
+            for start in range(0, len(source), chunk_size):
+                yield source.iloc[start:start + chunk_size]
+        else:
+            with pd.read_csv(source, chunksize=chunk_size) as reader:
+                yield from reader
+
+    def incremental_reduce(self, source, column, n_components, method="PCA", chunk_size=None, output_path=None):
+        """Reduce the dimensionality of a dataframe, or of a CSV file too large to load, a chunk of rows at a time
+        so that peak memory is bounded by the chunk size rather than the number of rows (see 
+        _incremental_reduced_chunks).
+
+        Args:
+            source (pandas dataframe or str): dataframe or path of a CSV file, whose columns other than column
+                must be numeric.
+            column (str): target column, kept as is.
+            n_components (int): number of components to keep.
+            method (str): "PCA" or "SVD".
+            chunk_size (int): rows per chunk, incremental_chunk_size when None.
+            output_path (str): CSV file the reduced rows are streamed to, None to return them.
+
+        Returns:
+            pandas dataframe or str: reduced dataframe (PC1... or SVD1..., then column), or output_path.
+        """
+        chunks = self._incremental_reduced_chunks(source, column, n_components, method, chunk_size)
+        if output_path is None:
+            return pd.concat(chunks, ignore_index=True)
+        for number, reduced_chunk in enumerate(chunks):
+            reduced_chunk.to_csv(output_path, mode="w" if number == 0 else "a", header=number == 0, index=False)
+        return output_path
+
+    def _incremental_reduced_chunks(self, source, column, n_components, method="PCA", chunk_size=None):
+        """Reduced rows of a dataframe or CSV file, chunk by chunk.
+
+        The rows are read twice. The first pass fits the model: IncrementalPCA is fitted batch by batch with
+        partial_fit for PCA; for SVD (uncentred, as TruncatedSVD) the d x d Gram matrix of the features is summed
+        over the chunks and its leading eigenvectors are the components. The second pass transforms every chunk,
+        along with the target column.
+
+        Args:
+            source (pandas dataframe or str): dataframe or path of a CSV file, whose columns other than column
+                must be numeric.
+            column (str): target column, kept as is.
+            n_components (int): number of components to keep.
+            method (str): "PCA" or "SVD".
+            chunk_size (int): rows per chunk, incremental_chunk_size when None.
+
+        Yields:
+            pandas dataframe: next chunk of reduced rows (PC1... or SVD1..., then column).
+        """
+        chunk_size = max(chunk_size or self.incremental_chunk_size, n_components)
+        features = lambda chunk: chunk.drop(columns=[column]).to_numpy(dtype=np.float64)
+
+        match method:
+            case "PCA":
+                model = IncrementalPCA(n_components=n_components)
+                pending = None
+                for chunk in self._row_chunks(source, chunk_size):
+                    X = features(chunk)
+                    # A batch needs at least n_components rows, a short last chunk joins the one before it.
+                    if pending is not None and len(X) >= n_components:
+                        model.partial_fit(pending)
+                        pending = X
+                    else:
+                        pending = X if pending is None else np.vstack([pending, X])
+                model.partial_fit(pending)
+                transform, prefix = model.transform, "PC"
+            case "SVD":
+                gram = 0
+                for chunk in self._row_chunks(source, chunk_size):
+                    X = features(chunk)
+                    gram = gram + X.T @ X
+                eigenvalues, eigenvectors = np.linalg.eigh(gram)
+                components = eigenvectors[:, np.argsort(eigenvalues)[::-1][:n_components]]
+                # Eigenvectors have no sign, make the largest loading of each component positive.
+                components *= np.sign(components[np.abs(components).argmax(axis=0), range(n_components)])
+                transform, prefix = lambda X: X @ components, "SVD"
+
+        columns = [f'{prefix}{i+1}' for i in range(n_components)]
+        for chunk in self._row_chunks(source, chunk_size):
+            reduced_chunk = pd.DataFrame(transform(features(chunk)), columns=columns)
+            reduced_chunk[column] = chunk[column].to_numpy()
+            yield reduced_chunk
+
+    def _smote_counts(self, class_counts, total_rows):
+        """Number of synthetic rows SMOTE generates for each class. Classes are first topped up towards the size of
+        the largest one (all the way when total_rows is None, as imblearn's 'auto' does); rows still wanted to
+        reach total_rows are then shared evenly between the classes.
+
+        Args:
+            class_counts (pandas series): number of rows of each class.
+            total_rows (int): number of rows wanted, None to balance the classes.
+
+        Returns:
+            pandas series: number of synthetic rows of each class.
+        """
+        deficit = class_counts.max() - class_counts
+        if total_rows is None:
+            return deficit
+        wanted = max(total_rows - class_counts.sum(), 0)
+        if wanted < deficit.sum():
+            counts = np.floor(deficit * wanted / deficit.sum()).astype(np.int64)
+        else:
+            counts = deficit + (wanted - deficit.sum()) // len(class_counts)
+        # Rows left over by the rounding go to the first classes, one each.
+        counts.iloc[:wanted - counts.sum()] += 1
+        return counts
+
+    def _smote(self, df, column, total_rows=None, k_neighbors=5, max_categories=None):
+        """SMOTE row expansion, SMOTE-NC style for non-numeric columns. Synthetic rows of a class are interpolated
+        between a random row of the class and one of its k nearest neighbours within the class; their
+        non-numeric values are the most frequent among those neighbours, and integer columns are rounded.
+        Distances are taken on the numeric columns and on the non-numeric ones one-hot encoded at the median
+        standard deviation of the numeric columns, so two rows differing in one category are as far apart as
+        SMOTE-NC makes them. The one-hot columns are kept sparse, and columns with more than max_categories
+        categories are refused as for One-hot Encoding.
+        
+        Classes are expanded one after the other, smote_chunk_size synthetic rows at a time with a parallel
+        neighbour search of that chunk only, so the temporary arrays are bounded by the chunk size.
+
+        Args:
+            df (pandas dataframe): dataframe.
+            column (str): dependent (target) column holding the classes.
+            total_rows (int): number of rows wanted, None to balance the classes.
+            k_neighbors (int): number of neighbours.
+            max_categories (int): most categories a non-numeric column may have, onehot_max_categories when None.
+
+        Returns:
+            pandas dataframe: rows of df followed by the synthetic rows, with column last.
+        """
+        rng = self.random.generator
+        X = df.drop(columns=[column])
+        y = df[column]
+        numeric = [cols for cols in X if self._is_numeric(X[cols])]
+        categorical = [cols for cols in X if cols not in numeric]
+
+        max_categories = self.onehot_max_categories if max_categories is None else max_categories
+        cardinality = X[categorical].nunique(dropna=False)
+        too_many = cardinality[cardinality > max_categories]
+        if not too_many.empty:
+            raise ValueError(f"SMOTE is limited to {max_categories} categories per non-numeric column: "
+                             + ", ".join(f"{cols} has {count}" for cols, count in too_many.items()))
+
+        # Distance space: numeric columns (missing values at the mean) and scaled one-hot categorical columns.
+        values = X[numeric].to_numpy(dtype=np.float64, na_value=np.nan)
+        space = np.nan_to_num(values - np.nanmean(values, axis=0), nan=0.0) if numeric else np.zeros((len(X), 0))
+        factorized = [pd.factorize(X[cols]) for cols in categorical]
+        if categorical:
+            scale = np.median(np.nanstd(values, axis=0)) / np.sqrt(2) if numeric else 1.0
+            onehot = OneHotEncoder(dtype=np.float64).fit_transform(np.column_stack([codes for codes, _ in factorized]))
+            # Kept sparse, the neighbours of its rows are then searched by brute force.
+            space = sparse.hstack([sparse.csr_matrix(space), onehot * scale], format="csr")
+
+        synthetic = []
+        class_counts = y.value_counts(sort=False)
+        for label, count in self._smote_counts(class_counts, total_rows).items():
+            rows = np.flatnonzero((y == label).to_numpy())
+            if count <= 0:
+                continue
+            k = min(k_neighbors, len(rows) - 1)
+            index = NearestNeighbors(n_neighbors=k + 1, n_jobs=-1).fit(space[rows]) if k > 0 else None
+
+            for start in range(0, count, self.smote_chunk_size):
+                size = min(self.smote_chunk_size, count - start)
+                base = rng.integers(len(rows), size=size)
+                if index is None:
+                    # A class of one row has no neighbour, its synthetic rows are copies of it.
+                    neighbours = np.zeros((size, 1), dtype=np.int64)
+                else:
+                    # Distances between sparse rows from sparse products, smote_working_memory at a time (sklearn's
+                    # own sparse distance reduction is over an order of magnitude slower on wide one-hot rows).
+                    with config_context(enable_cython_pairwise_dist=False, working_memory=self.smote_working_memory):
+                        neighbours = index.kneighbors(space[rows[base]], return_distance=False)[:, 1:]
+                chosen = neighbours[np.arange(size), rng.integers(neighbours.shape[1], size=size)]
+                gap = rng.random((size, 1))
+
+                chunk = {}
+                start_values, end_values = values[rows[base]], values[rows[chosen]]
+                for position, cols in enumerate(numeric):
+                    generated = start_values[:, position] + gap[:, 0] * (end_values[:, position] - 
+                                                                         start_values[:, position])
+                    if pd.api.types.is_integer_dtype(X[cols].dtype):
+                        # Through pandas, so nullable integer columns keep their dtype and missing values.
+                        generated = pd.Series(np.round(generated)).astype(X[cols].dtype).array
+                    chunk[cols] = generated
+                for cols, (codes, categories) in zip(categorical, factorized):
+                    # Most frequent category (or missing value, coded as -1) among the neighbours, the first in
+                    # sorted order on a tie: counted by comparing the k sorted codes of each row with one another.
+                    neighbour_codes = np.sort(codes[rows[neighbours]], axis=1)
+                    votes = (neighbour_codes[:, :, None] == neighbour_codes[:, None, :]).sum(axis=2)
+                    winner = neighbour_codes[np.arange(size), votes.argmax(axis=1)]
+                    generated = np.asarray(categories, dtype=object).take(np.maximum(winner, 0))
+                    generated[winner < 0] = np.nan
+                    chunk[cols] = generated
+                chunk[column] = np.repeat(label, size)
+                synthetic.append(pd.DataFrame(chunk, columns=list(X.columns) + [column]))
+
+        original = pd.concat([X, y], axis=1)
+        return pd.concat([original] + synthetic, ignore_index=True)
+
+    def _knn_impute(self, df, column, n_neighbors):
+        """K-Nearest Neighbors imputation of one column, using the other numeric columns of df as features. 
+        
+        Features are standardised (their missing values set to the mean) and indexed in a k-d tree (a ball tree
+        above knn_tree_dimensions features) of the rows where column is known. Rows where it is missing are then
+        queried knn_chunk_size at a time and filled with the mean of their neighbours, so that unlike KNNImputer no
+        distance matrix between all rows is ever built. Without any other numeric column, missing values are
+        filled with the mean as KNNImputer does.
+
+        Args:
+            df (pandas dataframe): dataframe.
+            column (str): column to impute.
+            n_neighbors (int): number of neighbours.
+
+        Returns:
+            pandas series: imputed column.
+        """
+        target = df[column].astype(np.float64)
+        missing = target.isna().to_numpy()
+        features = [cols for cols in df if cols != column and self._is_numeric(df[cols])]
+        if not missing.any() or missing.all():
+            return target
+        if not features:
+            return target.fillna(target.mean())
+
+        X = df[features].to_numpy(dtype=np.float64, na_value=np.nan)
+        with warnings.catch_warnings():
+            # Features without any value, or a single one, are left out of the distances.
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            mean, std = np.nanmean(X, axis=0), np.nanstd(X, axis=0)
+        std[~(std > 0)] = 1
+        X = np.nan_to_num((X - mean) / std, nan=0.0)
+
+        algorithm = "kd_tree" if len(features) <= self.knn_tree_dimensions else "ball_tree"
+        donors = target.to_numpy()[~missing]
+        index = NearestNeighbors(n_neighbors=min(n_neighbors, len(donors)), algorithm=algorithm).fit(X[~missing])
+
+        imputed = target.to_numpy().copy()
+        rows = np.flatnonzero(missing)
+        for start in range(0, len(rows), self.knn_chunk_size):
+            chunk = rows[start:start + self.knn_chunk_size]
+            neighbours = index.kneighbors(X[chunk], return_distance=False)
+            imputed[chunk] = donors[neighbours].mean(axis=1)
+        return pd.Series(imputed, index=df.index, name=column)
+
+    def _random_forest_impute(self, df, targets):
+        """Random Forest imputation of several columns in one pass. Every column of df is encoded once into a single
+        float32 feature matrix (categorical columns as their factorized codes, missing values as a value below any
+        other) shared by all targets. Each target is then predicted from the other columns by a forest whose trees
+        are trained in parallel, on at most rf_max_train_rows rows where the target is known, drawn at random.
+
+        Args:
+            df (pandas dataframe): dataframe.
+            targets (list): numeric columns to impute.
+
+        Returns:
+            dict: {column: imputed column} for the targets with missing values.
+        """
+        encoded = np.empty(df.shape, dtype=np.float32)
+        for position in range(df.shape[1]):
+            values = df.iloc[:, position]
+            if self._is_numeric(values):
+                values = values.to_numpy(dtype=np.float64, na_value=np.nan)
+                missing = np.isnan(values)
+                lowest = values[~missing].min() if (~missing).any() else 0
+                encoded[:, position] = np.where(missing, lowest - 1, values)
+            else:
+                encoded[:, position] = pd.factorize(values)[0]
+
+        imputed = {}
+        for target in targets:
+            position = df.columns.get_loc(target)
+            y = df[target].to_numpy(dtype=np.float64, na_value=np.nan)
+            missing = np.isnan(y)
+            if not missing.any() or missing.all():
+                continue
+
+            train = np.flatnonzero(~missing)
+            if len(train) > self.rf_max_train_rows:
+                train = np.sort(self.random.generator.choice(train, self.rf_max_train_rows, replace=False))
+            features = np.delete(np.arange(df.shape[1]), position)
+            rf_imputer = RandomForestRegressor(n_estimators=100, n_jobs=-1, random_state=self.random.random_state())
+            rf_imputer.fit(encoded[np.ix_(train, features)], y[train])
+
+            y[missing] = rf_imputer.predict(encoded[np.ix_(np.flatnonzero(missing), features)])
+            imputed[target] = pd.Series(y, index=df.index, name=target)
+        return imputed
+
+    def _is_numeric(self, column):
+        """Whether a column holds numbers outliers can be detected in i.e. any integer or float dtype, but not bool.
+
+        Args:
+            column (pandas series): column to check.
+        """
+        return pd.api.types.is_numeric_dtype(column.dtype) and not pd.api.types.is_bool_dtype(column.dtype)
+
+    def _is_categorical(self, column):
+        """Whether a column holds categories to encode i.e. object, or category as compacted string columns are.
+
+        Args:
+            column (pandas series): column to check.
+        """
+        return pd.api.types.is_object_dtype(column.dtype) or isinstance(column.dtype, pd.CategoricalDtype)
+
     def replace_null_values(self, sub_action, df, column, args):   
         a, b, c = args["a"], args["b"], args["c"]  #unpack args
 
@@ -400,7 +1379,7 @@ class ManipulationsModel():
                             # Calculate the mean of the selected column
                             mean_colum = df[column].mean()
                             # Replace missing values in the selected column with the mean
-                            df[column].fillna(mean_colum, inplace=True)
+                            df[column] = df[column].fillna(mean_colum)
                             return df
                         
                         case "Median":
@@ -409,46 +1388,33 @@ class ManipulationsModel():
                             # Calculate the medina  of the selected column
                             median_column = df[column].median()
                             # Replace missing values in 'BMI' with the median
-                            df[column].fillna(median_column, inplace=True)
+                            df[column] = df[column].fillna(median_column)
                             return df
                         
                         case "KNN":
                             # column = the selected column; b = the desired number of neighbours (int)
                             # Function to replace missing value using K-Nearest Neighbors (KNN) Imputation
-                            # Initialize the KNNImputer with the desired number of neighbors (e.g. 5)
-                            knn_imputer = KNNImputer(n_neighbors=b)
-                            # Perform KNN imputation on the column
-                            df[column] = knn_imputer.fit_transform(df[[column]])
+                            # Neighbours are found on the other numeric columns, see _knn_impute
+                            df[column] = self._knn_impute(df, column, b)
                             return df    
                         
                         case "Random Forest":
-                            # column = the selected column
+                            # column = the selected column, "" for every numeric column with missing values
                             # Function to replace missing value using Machince Learning-Based Imputation
-                            # Separate the dataset into two parts: one with missing  values and one without
-                            df_missing = df[df[column].isna()].copy()  # Make a copy to avoid SettingWithCopyWarning
-                            df_not_missing = df[~df[column].isna()]
-
-                            # Check if there are enough non-missing samples to train the model
-                            if len(df_not_missing) > 0:
-                                # Prepare the features and target for imputation
-                                X = df_not_missing.drop(columns=[column])
-                                y = df_not_missing[column]
-                                # Initialize the Random Forest Regressor
-                                rf_imputer = RandomForestRegressor(n_estimators=100, random_state=42)  
-                                # Train the model on non-missing data
-                                rf_imputer.fit(X, y)
-                                # Impute missing 'BMI' values using the trained model
-                                if len(df_missing) > 0:
-                                    imputed_bmi_values = rf_imputer.predict(df_missing.drop(columns=[column]))
-                                    df.loc[df[column].isna(), column] = imputed_bmi_values
-
+                            # Each column is predicted from the others, see _random_forest_impute
+                            if column in ("", None):
+                                targets = [cols for cols in df if self._is_numeric(df[cols]) and df[cols].isna().any()]
+                            else:
+                                targets = [column]
+                            for cols, imputed in self._random_forest_impute(df, targets).items():
+                                df[cols] = imputed
                             return df
                             
                 case "Manual Numerical":  
                     # column = the selected column; a = new value
                     # Function to replace all missing value in the selected column with fixed value
                     # Replace all missing values with a fixed value 
-                    df[column].fillna(a, inplace=True)                        
+                    df[column] = df[column].fillna(a)                        
                     return df
                 
                 case "Algorithmic Categorical":
@@ -459,7 +1425,7 @@ class ManipulationsModel():
                             # Calculate the mode of the 'Age' column
                             mode_val = df[column].mode().values[0]
                             # Perform fillna with mode
-                            df[column].fillna(mode_val, inplace=True)
+                            df[column] = df[column].fillna(mode_val)
                             return df
                         case "Back Fill":
                             df[column] = df[column].bfill()
@@ -469,14 +1435,18 @@ class ManipulationsModel():
                             return df
                         case "Random Sampling Fill":
                             non_missing_values = df[column].dropna().unique()
-                            df[column] = df[column].apply(lambda x: random.choice(non_missing_values) if pd.isna(x) else x)
+                            # Draw a value for every missing cell at once.
+                            missing = df[column].isna().to_numpy()
+                            filled = df[column].copy()
+                            filled[missing] = self.random.generator.choice(non_missing_values, missing.sum())
+                            df[column] = filled
                             return df
                                  
                 case "Manual Categorical":
                     # column = the selected column; a = new value
                     # Function to replace all missing value in the selected column with fixed value
                     # Replace all missing 'BMI' values with a fixed value of 180
-                    df[column].fillna(a, inplace=True)                        
+                    df[column] = df[column].fillna(a)                        
                     return df
                                      
         except Exception as error:
@@ -490,7 +1460,7 @@ class ManipulationsModel():
         try:
         # column = the selected column; a = value to replace; b = new value
         # Function to replace x value with new value
-            df[column].replace(a, b, inplace=True)
+            df[column] = df[column].replace(a, b)
             return df
         
         except Exception as error:
@@ -511,15 +1481,81 @@ class ManipulationsModel():
             self.error_msg = error
             return False
 
+    def _resample_blocks(self, df, rows, replace):
+        """Rows resampled from a dataframe, stream_block_size rows at a time. Without replacement, rows are drawn
+        from successive random permutations of the dataframe, so no row is drawn twice before every row has been
+        drawn once and more rows than the dataframe holds can be resampled.
+
+        Args:
+            df (pandas dataframe): dataframe to resample.
+            rows (int): number of rows to resample.
+            replace (bool): draw with replacement (bootstrap).
+
+        Yields:
+            pandas dataframe: next block of resampled rows.
+        """
+        generator = self.random.generator
+        order = np.empty(0, dtype=np.intp) # Rest of the current permutation.
+        for start in range(0, rows, self.stream_block_size):
+            size = min(self.stream_block_size, rows - start)
+            if replace:
+                yield df.take(generator.integers(len(df), size=size))
+                continue
+
+            parts = []
+            while size:
+                if not len(order):
+                    order = generator.permutation(len(df))
+                parts.append(order[:size])
+                order = order[len(parts[-1]):]
+                size -= len(parts[-1])
+            yield df.take(np.concatenate(parts))
+
+    def _stream_expansion(self, df, sub_action, rows, name):
+        """Expand a dataframe by Random Sampling or Bootstrap Resampling straight into a new databank dataset,
+        which is registered in the metadata store. Only one block of resampled rows is in memory at a time, so the
+        expanded dataset may be far larger than memory.
+
+        Args:
+            df (pandas dataframe): dataframe to expand, written first.
+            sub_action (str): "Random Sampling" or "Bootstrap Resampling".
+            rows (int): number of rows to add.
+            name (str): name of the new dataset, ending in .parquet for Parquet and CSV otherwise.
+
+        Returns:
+            str: path of the written dataset.
+        """
+        if len(df) == 0:
+            raise ValueError("An empty dataset cannot be expanded.")
+        name, extension = os.path.splitext(name)
+        file_format = "parquet" if extension.lower() == ".parquet" else "csv"
+        if not name:
+            raise ValueError("A name is required for the expanded dataset.")
+
+        def blocks():
+            yield df
+            yield from self._resample_blocks(df, int(rows), sub_action == "Bootstrap Resampling")
+
+        return DatasetModel().stream_to_databank(name=name, blocks=blocks(), file_format=file_format, 
+                                                 description=f"{sub_action} of {len(df)} rows expanded by {rows} rows.", 
+                                                 source="Synthetic Databank")
+
     def add_rows(self, sub_action, df, column, args):   
         a, b, c = args["a"], args["b"], args["c"]  #unpack args
 
         try: 
             match sub_action:
+                case "Random Sampling" | "Bootstrap Resampling" if b == "Stream":
+                    # a = number of rows to resample & expand; b = "Stream"; c = name of the dataset written to the 
+                    # databank, saved as Parquet when it ends in .parquet and as CSV otherwise
+                    # The expanded dataset is written straight to disk block by block, see _stream_expansion
+                    self._stream_expansion(df, sub_action, a, c)
+                    return df
+
                 case "Random Sampling":
                     # a = number of rows to resample & expand                
                     # Randomly select rows from the existing dataset
-                    random_rows = df.sample(n=a, replace=False)
+                    random_rows = df.sample(n=a, replace=False, random_state=self.random.generator)
                     # Append the randomly selected rows to the existing dataset
                     df = pd.concat([df, random_rows], ignore_index=True)
                     return df
@@ -527,28 +1563,18 @@ class ManipulationsModel():
                 case "Bootstrap Resampling": 
                     # a = number of rows to resample & expand                
                     # Randomly select rows from the existing dataset
-                    random_rows = df.sample(n=a, replace=True)
+                    random_rows = df.sample(n=a, replace=True, random_state=self.random.generator)
                     # Append the randomly selected rows to the existing dataset
                     df = pd.concat([df, random_rows], ignore_index=True)
                     return df
                 
                 case "SMOTE":
-                    # column = the dependent (target) column
-                    # Function to expand rows using SMOTE
-                
-                    # Split the dataset into features (X) and the target variable (y)
-                    X = df.drop(column, axis=1)  
-                    y = df[column] 
-                    # Initialize the SMOTE resampler
-                    # Initialize the SMOTE resampler
-                    smote = SMOTE(sampling_strategy='auto', random_state=42)  # You can adjust the sampling_strategy parameter if needed
-
-                    # Apply SMOTE to generate synthetic samples
-                    X_resampled, y_resampled = smote.fit_resample(X, y)
-
-                    # Create a new DataFrame with the resampled data
-                    df_resampled = pd.concat([pd.DataFrame(X_resampled), pd.DataFrame({column: y_resampled})], axis=1)
-                    return df_resampled
+                    # column = the dependent (target) column; a = total number of rows wanted, empty to balance 
+                    # the classes; b = number of neighbours, empty for 5; c = most categories of a non-numeric 
+                    # column, empty for self.onehot_max_categories
+                    # Function to expand rows using SMOTE, see _smote
+                    return self._smote(df, column, a if a not in ("", None) else None, 
+                                       b if b not in ("", None) else 5, c if c not in ("", None) else None)
             
         except Exception as error:
             self.logger.log_exception("Manipulation failed to complete. Traceback:")
@@ -612,67 +1638,74 @@ class ManipulationsModel():
                     return X_scaled_df
                 
                 case "Feature Encoding One-hot Encoding":
+                    # column = dependent (target) column; a = "Sparse" for sparse uint8 columns, otherwise dense 
+                    # uint8 columns; b = most categories a column may have, self.onehot_max_categories when empty
                     target_column = column
                 
                     # Separate the features and target variable
                     X = df.drop(columns=[target_column])
                     y = df[target_column]
-
-                    # Apply one-hot encoding with the sparse_output parameter specified
-                    onehot_encoder = OneHotEncoder(sparse_output=False)
-
-                    for cols in X:
-                        match X[cols].dtypes:
-                            case "object":
-                                X_encoded = onehot_encoder.fit_transform(X[[cols]].values.reshape(-1, 1))
-
-                                # Get the unique values in the 'Age' column to create feature names
-                                unique_values = X[cols].unique()
-                                feature_names = [f'{cols}_{value}' for value in unique_values]
-
-                                # Create a DataFrame for the one-hot encoded column
-                                encoded_column = pd.DataFrame(X_encoded, columns=feature_names)
-
-                                # Concatenate the original dataset with the encoded one and the original column
-                                X = pd.concat([X, encoded_column], axis=1)
-                                X = X.drop(cols, axis=1)
-                            case _:
-                                pass
+                    categorical = [cols for cols in X if self._is_categorical(X[cols])]
+
+                    # Refuse to encode columns which would each add more columns than the guard allows
+                    max_categories = b if isinstance(b, int) else self.onehot_max_categories
+                    cardinality = X[categorical].nunique(dropna=False)
+                    too_many = cardinality[cardinality > max_categories]
+                    if not too_many.empty:
+                        raise ValueError(f"One-hot encoding is limited to {max_categories} categories per column: "
+                                         + ", ".join(f"{cols} has {count}" for cols, count in too_many.items()))
+
+                    if categorical:
+                        # Encode every categorical column at once, named in the encoder's order of categories
+                        onehot_encoder = OneHotEncoder(sparse_output=a == "Sparse", dtype=np.uint8)
+                        X_encoded = onehot_encoder.fit_transform(X[categorical])
+                        feature_names = onehot_encoder.get_feature_names_out(categorical)
+                        if a == "Sparse":
+                            encoded_columns = pd.DataFrame.sparse.from_spmatrix(X_encoded, index=X.index, 
+                                                                                columns=feature_names)
+                        else:
+                            encoded_columns = pd.DataFrame(X_encoded, index=X.index, columns=feature_names)
+
+                        # Replace the original columns with the encoded ones
+                        X = pd.concat([X.drop(columns=categorical), encoded_columns], axis=1)
                     # Add the target column back to the encoded feature dataset
                     X[target_column] = y
 
                     return X
                 
                 case "Feature Encoding Label Encoding":
+                    # column = dependent (target) column; a = mappings to reuse {column: categories}, empty for none
+                    # Categories are numbered in sorted order. Mappings given in a keep their codes, values they do
+                    # not know are numbered after them, so codes stay the same across snapshots. Missing values
+                    # stay missing. The mappings used are recorded in the step's schedule set entry (step_record).
                     X = df.drop(columns=[column])
                     y = df[column]
 
-                    # Use LabelEncoder for categorical columns without a for loop
-                    label_encoder = LabelEncoder()
-
+                    mappings = dict(a) if isinstance(a, dict) else {}
                     for cols in X:
-                        match X[cols].dtypes:
-                            case "object":
-                                encoded_values = label_encoder.fit_transform(X[cols])
-                                X[cols] = encoded_values
-                            case _:
-                                pass
+                        if self._is_categorical(X[cols]):
+                            X[cols], mappings[cols] = self._label_encode(X[cols], mappings.get(cols, []))
                     X[column] = y
+                    self.step_record = {"mappings": {cols: mappings[cols] for cols in X if cols in mappings}}
                     return X
                 
                 case "Feature Encoding Target Encoding":
-                    # a = the selected column; column = dependent (target) column         
-                    # Encode the categorical column using target encoding
-                    # encoding_map = df.groupby(a)[column].mean()
-                    # df[a + '_encoded'] = df[a].map(lambda x: encoding_map.get(x, encoding_map.mean()))
-                    
+                    # column = dependent (target) column; a = smoothing weight of the prior, empty for none;
+                    # b = number of folds for out-of-fold encoding, empty for none
+                    # Categorical values are replaced with the mean of the dependent column over their category,
+                    # shrunk towards its global mean (the prior), categories not seen towards the prior
+                    smoothing = float(a) if a not in ("", None) else 0.0
+                    folds = int(b) if b not in ("", None) else 1
+                    if smoothing < 0 or folds < 1:
+                        raise ValueError("Smoothing must be positive and the number of folds at least 1.")
+                    y = df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+
+                    # Rows are assigned to random folds, each encoded from the statistics of the other folds
+                    fold = (self.random.generator.permutation(len(df)) % folds if folds > 1 
+                            else np.zeros(len(df), dtype=np.int64))
                     for cols in df:
-                        match df[cols].dtypes:
-                            case "object":
-                                encoding_map = df.groupby(cols)[column].mean()
-                                df[cols] = df[cols].map(lambda x: encoding_map.get(x, encoding_map.mean()))
-                            case _:
-                                pass
+                        if cols != column and self._is_categorical(df[cols]):
+                            df[cols] = self._target_encode(df[cols], y, fold, folds, smoothing)
                     return df
 
         except Exception as error:
@@ -687,26 +1720,33 @@ class ManipulationsModel():
                     # Remove duplicate rows.
                     self.remove_rows("Duplicate Rows", df, column, args)
 
-                    # Replace values lower than the 5th percentile and 95% percentile with NaN.
-                    self.replace_outliers(sub_action="", df=df, column="", args={"a": 1, "b": 99, "c":""})
-
-                    # Replace missing values with Mean or Mode values.
-                    for col in df:
-                        col_type = df[col].dtypes
-                        match col_type:
-                            case "int64" | "float64":
-                                self.replace_null_values("Algorithmic Numerical", df, col, args={"a": "Mean", "b":"", "c":""})
-                            case _:
-                                self.replace_null_values("Algorithmic Categorical", df, col, args={"a": "Mode", "b":"", "c":""})
+                    # Columns are cleaned independently of one another, so batches of them are cleaned in parallel.
+                    columns_before = df.columns
+                    batches = [list(range(start, min(start + self.auto_clean_batch_size, df.shape[1]))) 
+                               for start in range(0, df.shape[1], self.auto_clean_batch_size)]
+                    if self.auto_clean_workers > 1 and len(batches) > 1:
+                        with ThreadPoolExecutor(max_workers=self.auto_clean_workers) as executor:
+                            cleaned_batches = list(executor.map(lambda positions: self._clean_columns(df, positions), 
+                                                                batches))
+                    else:
+                        cleaned_batches = [self._clean_columns(df, positions) for positions in batches]
+
+                    # Assemble the cleaned dataframe once every batch is done.
+                    columns = {}
+                    for cleaned in cleaned_batches:
+                        columns.update(cleaned)
+                    for position in range(df.shape[1]):
+                        col = columns.get(position, df.iloc[:, position])
+                        columns[position] = col.array if isinstance(col, pd.Series) else col
+                    df = pd.DataFrame(dict(sorted(columns.items())), index=df.index)
+                    df.columns = columns_before
                 case "Dirty Dataset":
                     num_rows_add_missing = int(len(df) / 5)
-                    self.add_noise("Add Missing", df, column, args={"a": num_rows_add_missing, "b":"", "c":""})
+                    df = self.add_noise("Add Missing", df, column, args={"a": num_rows_add_missing, "b":"", "c":""})
                     num_rows_add_outliers = int(len(df) / 20)
                     for col in df:
-                        col_type = df[col].dtypes
-                        match col_type:
-                            case "int64" | "float64":
-                                self.add_noise("Add Outliers Percentile", df, col, args={"a": num_rows_add_outliers, "b":"", "c":""})
+                        if self._is_numeric(df[col]):
+                            self.add_noise("Add Outliers Percentile", df, col, args={"a": num_rows_add_outliers, "b":"", "c":""})
             return df
 
         except Exception as error:
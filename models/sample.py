@@ -3,6 +3,7 @@ import pandas as pd
 from sklearn.model_selection import StratifiedShuffleSplit
 from sklearn.utils import resample
 import numpy as np
+from utils.random_utils import RandomGenerator
 
 
 class SampleModel():
@@ -14,6 +15,7 @@ class SampleModel():
         It initialises the models to be consumed by the controllers of this applicaiton.
         """
         super().__init__()
+        self.random = RandomGenerator()
         self.sample_example_descriptions = {
             "Simple Random": 
                 "Simple Random Sampling (without replacement) \n\nInvolves randomly" +
@@ -172,7 +174,7 @@ class SampleModel():
         # iterate through unique clusters & sample with desired size
         for cluster, proportion in cluster_proportions.items(): 
             cluster_size = int(sample_size * proportion)
-            cluster_sample = df[df[cluster_col] == cluster].sample(cluster_size)
+            cluster_sample = df[df[cluster_col] == cluster].sample(cluster_size, random_state=self.random.generator)
             new_sample = pd.concat([new_sample, cluster_sample])
 
         return new_sample
@@ -0,0 +1,379 @@
+"""Benchmarks of manipulation engines against the implementations they replaced.
+
+Run from the repository root:
+
+    python -m tests.benchmarks.bench_manipulations
+"""
+import os
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from imblearn.over_sampling import SMOTENC
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.impute import KNNImputer
+from sklearn.preprocessing import OneHotEncoder, PolynomialFeatures
+from models.manipulations import ManipulationsModel
+from models.dataset import DatasetModel
+from models.catalog import CatalogModel
+
+
+def legacy_replace_outliers(df, a, b):
+    """Value by value outlier replacement which ManipulationsModel.replace_outliers used before it was vectorised
+    (entire dataset mode, RangeIndex only)."""
+    for col in df:
+        match df[col].dtypes:
+            case "int64" | "float64":
+                Q1 = df[col].quantile(a/100)
+                Q3 = df[col].quantile(b/100)
+                IQR = Q3 - Q1
+                lower_bound = Q1 - 1.5 * IQR
+                upper_bound = Q3 + 1.5 * IQR
+                index = 0
+                for data in df[col]:
+                    if float(data) < float(lower_bound):
+                        df.loc[index, col] = np.nan
+                    elif float(data) > float(upper_bound):
+                        df.loc[index, col] = np.nan
+                    index +=1
+    return df
+
+
+def legacy_clean_dataset(manipulations, df):
+    """Column by column Automatic "Clean Dataset" which ManipulationsModel.auto_mode ran before columns were
+    cleaned in batches."""
+    manipulations.remove_rows("Duplicate Rows", df, "", {"a": "", "b": "", "c": ""})
+    manipulations.replace_outliers(sub_action="", df=df, column="", args={"a": 1, "b": 99, "c": ""})
+    for col in df:
+        match df[col].dtypes:
+            case "int64" | "float64":
+                manipulations.replace_null_values("Algorithmic Numerical", df, col, args={"a": "Mean", "b": "", "c": ""})
+            case _:
+                manipulations.replace_null_values("Algorithmic Categorical", df, col, args={"a": "Mode", "b": "", "c": ""})
+    return df
+
+
+def legacy_add_missing(df, a):
+    """Dense mask "Add Missing" over the entire dataset which ManipulationsModel.add_noise used before missing
+    values were injected column by column."""
+    random_indices = np.random.default_rng().choice(df.size, min(a, df.size), replace=False)
+    mask = np.zeros(df.shape, dtype=bool)
+    mask.ravel()[random_indices] = True
+    df[mask] = np.nan
+    return df
+
+
+def legacy_one_hot_encoding(df, target_column):
+    """Column by column "Feature Encoding One-hot Encoding" which ManipulationsModel.data_transformation used before
+    every categorical column was encoded at once (RangeIndex only, columns named in unique() order)."""
+    X = df.drop(columns=[target_column])
+    y = df[target_column]
+    onehot_encoder = OneHotEncoder(sparse_output=False)
+    for cols in X:
+        match X[cols].dtypes:
+            case "object":
+                X_encoded = onehot_encoder.fit_transform(X[[cols]].values.reshape(-1, 1))
+                feature_names = [f'{cols}_{value}' for value in X[cols].unique()]
+                X = pd.concat([X, pd.DataFrame(X_encoded, columns=feature_names)], axis=1)
+                X = X.drop(cols, axis=1)
+    X[target_column] = y
+    return X
+
+
+def legacy_target_encoding(df, column):
+    """Row by row "Feature Encoding Target Encoding" which ManipulationsModel.data_transformation used before it
+    was vectorised."""
+    for cols in df:
+        match df[cols].dtypes:
+            case "object":
+                encoding_map = df.groupby(cols)[column].mean()
+                df[cols] = df[cols].map(lambda x: encoding_map.get(x, encoding_map.mean()))
+    return df
+
+
+def legacy_random_forest_imputation(df, column):
+    """Single core Random Forest imputation of one column, trained on every row, which
+    ManipulationsModel.replace_null_values used before it was made to scale (numeric dataframes only)."""
+    df_missing = df[df[column].isna()].copy()
+    df_not_missing = df[~df[column].isna()]
+    rf_imputer = RandomForestRegressor(n_estimators=100, random_state=42)
+    rf_imputer.fit(df_not_missing.drop(columns=[column]), df_not_missing[column])
+    df.loc[df[column].isna(), column] = rf_imputer.predict(df_missing.drop(columns=[column]))
+    return df
+
+
+def peak_memory(function, *args, **kwargs):
+    """Return the result of a call and the peak memory, in bytes, it allocated."""
+    tracemalloc.start()
+    result = function(*args, **kwargs)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, peak
+
+
+def timed(function, *args, **kwargs):
+    """Return the result of a call and the seconds it took."""
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def bench_replace_outliers(file_path="db/databank/diamonds.csv", a=25, b=75):
+    df = pd.read_csv(file_path)
+    args = {"a": a, "b": b, "c": ""}
+
+    vectorised, vectorised_seconds = timed(ManipulationsModel().replace_outliers, "", df.copy(), "", args)
+    legacy, legacy_seconds = timed(legacy_replace_outliers, df.copy(), a, b)
+
+    assert vectorised.equals(legacy), "vectorised and legacy results differ"
+    print(f"replace_outliers ({file_path}, {df.shape[0]} rows, entire dataset)")
+    print(f"  legacy loop:  {legacy_seconds:8.3f} s")
+    print(f"  vectorised:   {vectorised_seconds:8.3f} s ({legacy_seconds / vectorised_seconds:,.0f}x)")
+
+
+def bench_clean_dataset(file_path="db/databank/time_series_covid19_confirmed_global.csv"):
+    df = pd.read_csv(file_path)
+    manipulations = ManipulationsModel()
+    args = {"a": "", "b": "", "c": ""}
+
+    legacy, legacy_seconds = timed(legacy_clean_dataset, manipulations, df.copy())
+    print(f"auto_mode Clean Dataset ({file_path}, {df.shape[0]} rows, {df.shape[1]} columns)")
+    print(f"  legacy loop:  {legacy_seconds:8.3f} s")
+    for workers in (1, 4):
+        manipulations.auto_clean_workers = workers
+        batched, batched_seconds = timed(manipulations.auto_mode, "Clean Dataset", df.copy(), "", args)
+        pd.testing.assert_frame_equal(batched, legacy, check_exact=True)
+        print(f"  batched, {workers} worker(s): {batched_seconds:8.3f} s ({legacy_seconds / batched_seconds:,.1f}x)")
+
+
+def bench_add_missing(file_path="db/databank/time_series_covid19_confirmed_global.csv", rate=0.2):
+    df = pd.read_csv(file_path)
+    manipulations = ManipulationsModel()
+    a = round(rate * df.size)
+
+    legacy, legacy_peak = peak_memory(legacy_add_missing, df.copy(), a)
+    print(f"add_noise Add Missing ({file_path}, {df.shape[0]} rows, {df.shape[1]} columns, {a} values)")
+    print(f"  legacy mask:        peak {legacy_peak / 2 ** 20:8.1f} MiB, "
+          f"{(legacy.dtypes == 'int64').sum()} int64 columns left")
+    for sub_action, args in (("Add Missing", {"a": a, "b": "", "c": ""}),
+                             ("Add Missing Rate", {"a": rate, "b": "Exact", "c": ""})):
+        injected, peak = peak_memory(manipulations.add_noise, sub_action, df.copy(), "", args)
+        print(f"  {sub_action + ':':<19} peak {peak / 2 ** 20:8.1f} MiB, "
+              f"{(injected.dtypes == 'int64').sum()} int64 / {(injected.dtypes == 'Int64').sum()} Int64 columns left")
+
+
+def bench_one_hot_encoding():
+    # Customer Churn is stored as integer codes, its coded columns are encoded as categories.
+    churn = pd.read_csv("db/databank/Customer Churn.csv")
+    coded = ["Call  Failure", "Complains", "Subscription  Length", "Charge  Amount", "Distinct Called Numbers", 
+             "Age Group", "Tariff Plan", "Status", "Age"]
+    churn[coded] = churn[coded].astype(str)
+    deaths = pd.read_csv("db/databank/Accidental_Drug_Related_Deaths_2012-2022.csv", low_memory=False)
+    manipulations = ManipulationsModel()
+
+    for name, df, target_column in (("Customer Churn", churn, "Churn"), ("drug deaths", deaths, "Age")):
+        print(f"data_transformation One-hot Encoding ({name}, {df.shape[0]} rows, {df.shape[1]} columns)")
+        # The drug deaths dataset has free text columns (dates, causes of death) with thousands of categories.
+        encoded = manipulations.data_transformation("Feature Encoding One-hot Encoding", df, target_column, 
+                                                    {"a": "", "b": "", "c": ""})
+        if encoded is False:
+            print(f"  guard:        {manipulations.error_msg}")
+            df = df[[col for col in df if col == target_column or df[col].nunique(dropna=False) <= 100]]
+            print(f"  kept the {df.shape[1]} columns with at most 100 categories")
+        legacy, legacy_seconds = timed(legacy_one_hot_encoding, df, target_column)
+        print(f"  legacy loop:  {legacy_seconds:8.3f} s, {legacy.memory_usage().sum() / 2 ** 20:8.1f} MiB")
+        for a in ("Dense", "Sparse"):
+            args = {"a": a, "b": "", "c": ""}
+            encoded, seconds = timed(manipulations.data_transformation, "Feature Encoding One-hot Encoding", df, 
+                                     target_column, args)
+            assert encoded.shape == legacy.shape and encoded.sum().sum() == legacy.sum().sum()
+            print(f"  {a.lower() + ':':<13} {seconds:8.3f} s, {encoded.memory_usage().sum() / 2 ** 20:8.1f} MiB "
+                  f"({legacy_seconds / seconds:,.1f}x)")
+
+
+def bench_target_encoding(rows=(200_000, 5_000_000), categories=1000):
+    manipulations = ManipulationsModel()
+    rng = np.random.default_rng(0)
+    for n in rows:
+        df = pd.DataFrame({"category": rng.integers(0, categories, n).astype(str), "other": rng.choice(["a", "b"], n), 
+                           "target": rng.random(n)})
+        print(f"data_transformation Target Encoding ({n} rows, 2 columns of up to {categories} categories)")
+        if n <= rows[0]:
+            legacy, legacy_seconds = timed(legacy_target_encoding, df.copy(), "target")
+            print(f"  legacy loop:             {legacy_seconds:8.3f} s")
+        for a, b in (("", ""), (10, ""), (10, 5)):
+            encoded, seconds = timed(manipulations.data_transformation, "Feature Encoding Target Encoding", 
+                                     df.copy(), "target", {"a": a, "b": b, "c": ""})
+            if n <= rows[0] and a == "":
+                pd.testing.assert_frame_equal(encoded, legacy)
+            print(f"  smoothing {a or 0:>2}, {b or 1} fold(s): {seconds:8.3f} s")
+
+
+def bench_knn_imputation(rows=(20_000, 300_000), features=6, missing=0.2):
+    manipulations = ManipulationsModel()
+    rng = np.random.default_rng(0)
+    args = {"a": "KNN", "b": 5, "c": ""}
+    for n in rows:
+        X = rng.normal(size=(n, features))
+        df = pd.DataFrame(X, columns=[f"x{i}" for i in range(features)])
+        df["y"] = X.sum(axis=1) + rng.normal(scale=0.1, size=n)
+        truth = df["y"].copy()
+        rows_missing = rng.random(n) < missing
+        df.loc[rows_missing, "y"] = np.nan
+        error = lambda imputed: np.abs(imputed[rows_missing] - truth[rows_missing]).mean()
+
+        print(f"replace_null_values KNN ({n} rows, {features} feature columns, {missing:.0%} missing)")
+        if n <= rows[0]:
+            # KNNImputer's distances between every pair of rows rule it out on the larger frame.
+            single, single_seconds = timed(lambda: KNNImputer(n_neighbors=5).fit_transform(df[["y"]])[:, 0])
+            print(f"  single column KNNImputer:     {single_seconds:8.3f} s, mean absolute error {error(single):.3f}")
+            full, full_seconds = timed(lambda: KNNImputer(n_neighbors=5).fit_transform(df)[:, -1])
+            print(f"  KNNImputer on every column:   {full_seconds:8.3f} s, mean absolute error {error(full):.3f}")
+        chunked, seconds = timed(manipulations.replace_null_values, "Algorithmic Numerical", df.copy(), "y", args)
+        print(f"  chunked tree queries:         {seconds:8.3f} s, mean absolute error {error(chunked['y']):.3f}")
+
+
+def bench_random_forest_imputation(file_path="db/databank/diamonds.csv", targets=("carat", "price"), missing=0.1, 
+                                   max_train_rows=20_000):
+    df = pd.read_csv(file_path)
+    rng = np.random.default_rng(0)
+    truth = df[list(targets)].copy()
+    for target in targets:
+        df.loc[rng.random(len(df)) < missing, target] = np.nan
+    error = lambda imputed, target: np.abs(imputed[target] - truth[target])[df[target].isna()].mean()
+    manipulations = ManipulationsModel()
+    manipulations.rf_max_train_rows = max_train_rows
+
+    print(f"replace_null_values Random Forest ({file_path}, {df.shape[0]} rows, {missing:.0%} missing in "
+          f"{', '.join(targets)})")
+    # The legacy imputation fails on non-numeric columns, it only sees the numeric ones.
+    legacy_seconds = 0
+    legacy = df.select_dtypes("number").copy()
+    for target in targets:
+        # The other targets still have missing values, which the legacy forest cannot train on.
+        features = legacy.drop(columns=[t for t in targets if t != target])
+        imputed, seconds = timed(legacy_random_forest_imputation, features.copy(), target)
+        legacy[target], legacy_seconds = imputed[target], legacy_seconds + seconds
+    print(f"  legacy, one column at a time:  {legacy_seconds:8.3f} s, mean absolute error "
+          + ", ".join(f"{target} {error(legacy, target):.3f}" for target in targets))
+    imputed, seconds = timed(manipulations.replace_null_values, "Algorithmic Numerical", df.copy(), "", 
+                             {"a": "Random Forest", "b": "", "c": ""})
+    print(f"  parallel, capped, one pass:    {seconds:8.3f} s, mean absolute error "
+          + ", ".join(f"{target} {error(imputed, target):.3f}" for target in targets))
+
+
+def bench_incremental_reduce(rows=200_000, features=40, n_components=5, chunk_size=20_000, 
+                             file_path="db/temp/bench_incremental_reduce.csv"):
+    rng = np.random.default_rng(0)
+    latent = rng.normal(size=(rows, n_components))
+    df = pd.DataFrame(latent @ rng.normal(size=(n_components, features)) + rng.normal(scale=0.1, size=(rows, features)), 
+                      columns=[f"x{i}" for i in range(features)])
+    df["target"] = rng.integers(0, 2, rows)
+    df.to_csv(file_path, index=False)
+    del df, latent
+    manipulations = ManipulationsModel()
+    args = {"a": n_components, "b": "", "c": ""}
+
+    print(f"reduce_columns from a CSV file ({rows} rows, {features} columns, {n_components} components)")
+    for sub_action in ("Algorithmic PCA", "Algorithmic SVD"):
+        load_and_reduce = lambda: manipulations.reduce_columns(sub_action, pd.read_csv(file_path), "target", args)
+        (_, peak), seconds = timed(peak_memory, load_and_reduce)
+        print(f"  {sub_action[12:] + ', loaded in memory:':<40} {seconds:8.3f} s, peak {peak / 2 ** 20:8.1f} MiB")
+        (_, peak), seconds = timed(peak_memory, manipulations.incremental_reduce, file_path, "target", n_components, 
+                                   method=sub_action[12:], chunk_size=chunk_size, 
+                                   output_path=file_path.replace(".csv", "_reduced.csv"))
+        label = f"Incremental {sub_action[12:]}, {chunk_size} row chunks:"
+        print(f"  {label:<40} {seconds:8.3f} s, peak {peak / 2 ** 20:8.1f} MiB")
+    os.remove(file_path)
+    os.remove(file_path.replace(".csv", "_reduced.csv"))
+
+
+def bench_smote(file_path="db/databank/BankChurners.csv", column="Attrition_Flag", factor=10):
+    df = pd.read_csv(file_path)
+    manipulations = ManipulationsModel()
+    total_rows = len(df) * factor
+    counts = manipulations._smote_counts(df[column].value_counts(sort=False), total_rows)
+    X, y = df.drop(columns=[column]), df[column]
+    categorical = [cols for cols in X if X[cols].dtypes == "object"]
+
+    print(f"add_rows SMOTE ({file_path}, {df.shape[0]} rows expanded to {total_rows})")
+    # The legacy SMOTE fails on the non-numeric columns, imblearn's SMOTENC is the reference.
+    smotenc = SMOTENC(categorical_features=categorical, random_state=42,
+                      sampling_strategy=(df[column].value_counts() + counts).to_dict())
+    (_, peak), seconds = timed(peak_memory, smotenc.fit_resample, X, y)
+    print(f"  imblearn SMOTENC:             {seconds:8.3f} s, peak {peak / 2 ** 20:8.1f} MiB")
+    for chunk_size in (10_000, 1_000):
+        manipulations.smote_chunk_size = chunk_size
+        (expanded, peak), seconds = timed(peak_memory, manipulations.add_rows, "SMOTE", df, column, 
+                                          {"a": total_rows, "b": "", "c": ""})
+        assert len(expanded) == total_rows
+        print(f"  {chunk_size:>6} row chunks by class:   {seconds:8.3f} s, peak {peak / 2 ** 20:8.1f} MiB")
+
+
+def bench_smote_high_cardinality(file_path="db/databank/Accidental_Drug_Related_Deaths_2012-2022.csv", column="Sex", 
+                                 factor=2, max_categories=10_000):
+    df = pd.read_csv(file_path)
+    manipulations = ManipulationsModel()
+    categories = df.drop(columns=[column]).select_dtypes("object").nunique(dropna=False).sum()
+
+    print(f"add_rows SMOTE ({file_path}, {df.shape[0]} rows expanded to {len(df) * factor}, {categories} categories)")
+    (expanded, peak), seconds = timed(peak_memory, manipulations.add_rows, "SMOTE", df, column, 
+                                      {"a": len(df) * factor, "b": "", "c": max_categories})
+    assert expanded[column].notna().sum() == len(df) * factor # Rows without a class are kept as they are.
+    print(f"  sparse one-hot distances:     {seconds:8.3f} s, peak {peak / 2 ** 20:8.1f} MiB")
+
+
+def bench_stream_expansion(file_path="db/databank/diabetes.csv", rows=1_000_000, databank_dir="db/temp/"):
+    df = pd.read_csv(file_path)
+    manipulations = ManipulationsModel()
+    dataset = DatasetModel()
+    # The streamed datasets and their metadata go to a scratch databank.
+    dataset.databank_dir, catalog = databank_dir, dataset.catalog
+    dataset.catalog = CatalogModel(db_path=os.path.join(databank_dir, "bench_stream_expansion.db"))
+
+    print(f"add_rows Random Sampling ({file_path}, {df.shape[0]} rows expanded by {rows})")
+    # The legacy expansion cannot draw more rows than the dataset holds without replacement, bootstrap instead.
+    legacy = lambda: pd.concat([df, df.sample(n=rows, replace=True)], ignore_index=True).to_csv(
+        os.path.join(databank_dir, "bench_legacy.csv"), index=False)
+    (_, peak), seconds = timed(peak_memory, legacy)
+    print(f"  in memory, then saved as CSV:  {seconds:8.3f} s, peak {peak / 2 ** 20:8.1f} MiB")
+    for name in ("bench_streamed.csv", "bench_streamed.parquet"):
+        (_, peak), seconds = timed(peak_memory, manipulations.add_rows, "Random Sampling", df, "", 
+                                   {"a": rows, "b": "Stream", "c": name})
+        print(f"  {'streamed to ' + os.path.splitext(name)[1][1:] + ':':<30} {seconds:8.3f} s, peak {peak / 2 ** 20:8.1f} MiB")
+        os.remove(os.path.join(databank_dir, name))
+    os.remove(os.path.join(databank_dir, "bench_legacy.csv"))
+    os.remove(os.path.join(databank_dir, "bench_stream_expansion.db"))
+    dataset.databank_dir, dataset.catalog = DatasetModel.databank_dir, catalog
+
+
+def bench_feature_products(file_path="db/databank/wdbc.csv", degree=3):
+    df = pd.read_csv(file_path)
+    manipulations = ManipulationsModel()
+    features = df.select_dtypes("number")
+
+    print(f"add_column Polynominal Features ({file_path}, {features.shape[1]} numerical columns, degree {degree})")
+    # There was no implementation before, scikit-learn's PolynomialFeatures is the reference.
+    polynomial = PolynomialFeatures(degree, include_bias=False)
+    (_, peak), seconds = timed(peak_memory, polynomial.fit_transform, features)
+    print(f"  scikit-learn PolynomialFeatures: {seconds:8.3f} s, peak {peak / 2 ** 20:8.1f} MiB")
+    for output in ("Dense", "Float32", "Sparse"):
+        (added, peak), seconds = timed(peak_memory, manipulations.add_column, "Feature Engineering Polynominal Features", 
+                                       df, "", {"a": degree, "b": output, "c": ""})
+        assert added is not False
+        print(f"  {output + ' output:':<32} {seconds:8.3f} s, peak {peak / 2 ** 20:8.1f} MiB")
+
+
+if __name__ == "__main__":
+    bench_replace_outliers()
+    bench_clean_dataset()
+    bench_add_missing()
+    bench_one_hot_encoding()
+    bench_target_encoding()
+    bench_knn_imputation()
+    bench_random_forest_imputation()
+    bench_incremental_reduce()
+    bench_smote()
+    bench_smote_high_cardinality()
+    bench_stream_expansion()
+    bench_feature_products()
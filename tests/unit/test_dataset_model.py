@@ -1,6 +1,11 @@
+import os
+import glob
+import threading
 import pytest
 import pandas as pd
+import numpy as np
 from models.dataset import DatasetModel
+from models.catalog import CatalogModel
 
 @pytest.fixture
 def empty_dataframe_model():
@@ -123,5 +128,234 @@ def test_clear_all_snapshots(empty_dataframe_model):
     
     assert len(empty_dataframe_model._SNAPSHOTS) == 0
 
+# Test snapshots share unchanged column buffers and only account for the columns a step changed.
+def test_snapshot_store_shares_unchanged_columns(empty_dataframe_model):
+    file_path = 'db/databank/diamonds.csv'
+    empty_dataframe_model.load_dataset(file_path, "diamonds")
+    original = empty_dataframe_model.get_reference_to_current_snapshot()
+
+    # Deep copy (as Generate does) then rename one column and change another.
+    generated = original.copy()
+    generated.rename(columns={"carat": "weight"}, inplace=True)
+    generated["price"] = generated["price"] * 2
+    empty_dataframe_model.add_generated_dataset_to_snapshot([], "Generated Dataset", generated)
+
+    current = empty_dataframe_model.get_reference_to_current_snapshot()
+    assert list(current.columns) == list(generated.columns)
+    assert current.equals(generated)
+    assert np.shares_memory(current["weight"].to_numpy(), original["carat"].to_numpy())
+    assert not np.shares_memory(current["price"].to_numpy(), original["price"].to_numpy())
+
+    first, second = empty_dataframe_model.get_snapshot_memory_usage()
+    assert second == original["price"].memory_usage(index=False)
+    assert first > 10 * second
+
+# Test snapshots beyond the memory budget are spilled to disk and restored lazily on rollback.
+def test_snapshot_history_spills_to_disk(empty_dataframe_model):
+    file_path = 'db/databank/breast-cancer.csv'
+    empty_dataframe_model.load_dataset(file_path, "breast-cancer")
+    original = empty_dataframe_model.get_reference_to_current_snapshot()
+    sample = original.sample(n=50, random_state=42) # Non-default index must survive the round trip.
+    empty_dataframe_model.add_generated_dataset_to_snapshot([], "Sampled Dataset", sample)
+
+    try:
+        empty_dataframe_model.set_snapshot_memory_budget(budget=1)
+        for _ in range(12): # More than the previous hard limit of 10 snapshots.
+            empty_dataframe_model.add_generated_dataset_to_snapshot([], "Generated Dataset", original.copy())
+        snapshots = empty_dataframe_model.get_reference_to_all_snapshots()
+
+        assert len(snapshots) == 14
+        assert not snapshots[1].resident and os.path.exists(snapshots[1].spill_path)
+        assert snapshots[-1].resident
+
+        restored = empty_dataframe_model.get_specific_snapshot(1)["Dataframe"]
+        assert restored.equals(sample) and restored.index.equals(sample.index)
+
+        empty_dataframe_model.rollback(0)
+        assert empty_dataframe_model.get_reference_to_current_snapshot().equals(original)
+        # Spill files of discarded snapshots are removed; the retained snapshot keeps its file for re-spilling.
+        assert glob.glob("db/temp/snapshot_*") == [snapshots[0].spill_path]
+    finally:
+        empty_dataframe_model.set_snapshot_memory_budget(budget=1024 ** 3)
+        empty_dataframe_model.clear_all_snapshots()
+
+# Test databank CSVs are served from a sidecar cache which is rebuilt when the CSV changes.
+def test_read_databank_csv_cache(empty_dataframe_model, tmp_path):
+    file_path = str(tmp_path / "cached.csv")
+    pd.DataFrame({"a": [1, 2, 3], "b": ["x", None, "z"]}).to_csv(file_path, index=False)
+
+    first = empty_dataframe_model.read_databank_csv(file_path)
+    cached = empty_dataframe_model.read_databank_csv(file_path)
+    assert cached.equals(first)
+    assert cached["b"].isna().sum() == 1
+    assert len(glob.glob(str(tmp_path / ".cache" / "cached.*.feather"))) == 1
+
+    # Rewrite the file with a different size; the stale cache must not be served.
+    pd.DataFrame({"a": [4, 5, 6, 7], "b": ["w", "x", "y", "z"]}).to_csv(file_path, index=False)
+    refreshed = empty_dataframe_model.read_databank_csv(file_path)
+    assert refreshed["a"].tolist() == [4, 5, 6, 7]
+    assert len(glob.glob(str(tmp_path / ".cache" / "cached.*.feather"))) == 1
+
+# Test compaction on load downcasts columns losslessly and reports the memory saved per column.
+def test_load_dataset_compact(empty_dataframe_model):
+    file_path = 'db/databank/diamonds.csv'
+    original = empty_dataframe_model.read_databank_csv(file_path)
+    empty_dataframe_model.load_dataset(file_path, "diamonds", compact=True)
+    compacted = empty_dataframe_model.get_reference_to_current_snapshot()
+
+    for column in ("cut", "color", "clarity"):
+        assert compacted[column].dtype == "category"
+    assert compacted["price"].dtype == "int16"
+    assert compacted["carat"].dtype == "float32"
+    assert compacted.astype(str).equals(original.astype(str))
+
+    report = empty_dataframe_model.get_all_column_datatypes(memory=True)
+    assert report["cut"]["before"] == "object" and report["cut"]["after"] == "category"
+    assert report["cut"]["after_bytes"] < report["cut"]["before_bytes"]
+
+    canonical = empty_dataframe_model.get_all_column_datatypes(canonical=True)
+    assert canonical["cut"] == "object" and canonical["price"] == "int64" and canonical["carat"] == "float64"
+    empty_dataframe_model.clear_all_snapshots()
+
+# Test whole-number floats holding missing values become nullable integers.
+def test_compact_dtypes_nullable(empty_dataframe_model):
+    df = pd.DataFrame({"a": [1.0, np.nan, 3.0], "b": [0.1, 0.2, np.nan], "c": [0.1, 1 / 3, 0.5]})
+    compacted, report = empty_dataframe_model.compact_dtypes(df)
+    assert str(compacted["a"].dtype) == "Int8" and compacted["a"].isna().sum() == 1
+    assert compacted["b"].dtype == "float32"
+    assert compacted["c"].dtype == "float64" # 1 / 3 has more digits than float32 holds.
+    assert report["a"] == {"before": "float64", "after": "Int8", "before_bytes": 24, "after_bytes": 6}
+
+# Test chunked reads match a single read, report progress and leave the loaded dataset alone until swapped in.
+def test_read_dataset_chunked(empty_dataframe_model, tmp_path):
+    file_path = str(tmp_path / "chunked.csv")
+    # Numbers in the first chunks and text in the last, which a per-chunk parse alone would get wrong.
+    pd.DataFrame({"a": [str(i) for i in range(250)] + ["x"], "b": np.arange(251) / 4}).to_csv(file_path, index=False)
+    empty_dataframe_model.load_dataset('db/databank/breast-cancer.csv', "breast-cancer")
+    empty_dataframe_model.load_chunk_size = 100
+
+    try:
+        progress = []
+        df, report = empty_dataframe_model.read_dataset(file_path, progress=lambda *args: progress.append(args))
+        assert df.equals(pd.read_csv(file_path)) and report == {}
+        assert [rows for rows, _, _ in progress] == [100, 200, 251, 251]
+        assert progress[-1][1] == progress[-1][2] == os.path.getsize(file_path)
+        assert empty_dataframe_model.get_dataset_name() == "breast-cancer"
+
+        os.remove(glob.glob(str(tmp_path / ".cache" / "*.feather"))[0])
+        cancel = threading.Event()
+        cancel.set()
+        assert empty_dataframe_model.read_dataset(file_path, cancel=cancel) is None
+
+        empty_dataframe_model.swap_in_dataset("chunked", df)
+        assert len(empty_dataframe_model.get_reference_to_all_snapshots()) == 1
+        assert empty_dataframe_model.get_dataset_name() == "chunked"
+    finally:
+        empty_dataframe_model.load_chunk_size = 50000
+        empty_dataframe_model.clear_all_snapshots()
+
+# Test Parquet datasets (streamed by "Expand (add rows)") are read row group by row group and removed with the rest.
+def test_read_and_remove_parquet_dataset(empty_dataframe_model, tmp_path, monkeypatch):
+    df = pd.DataFrame({"a": np.arange(250), "b": ["x", None] * 125})
+    monkeypatch.setattr(empty_dataframe_model, "databank_dir", str(tmp_path) + "/")
+    monkeypatch.setattr(empty_dataframe_model, "catalog", CatalogModel(db_path=str(tmp_path / "data.db")))
+    file_path = empty_dataframe_model.stream_to_databank("streamed", [df.iloc[:100], df.iloc[100:]], "Description", 
+                                                         "Source", file_format="parquet")
+
+    progress = []
+    read, report = empty_dataframe_model.read_dataset(file_path, progress=lambda *args: progress.append(args))
+    assert read.equals(df) and report == {}
+    assert [rows for rows, _, _ in progress] == [100, 250, 250]
+    assert "RangeIndex: 250 entries, 0 to 249" in empty_dataframe_model.get_dataset_info(file_path)
+
+    empty_dataframe_model.remove_dataset("streamed")
+    assert not os.path.exists(file_path)
+    assert empty_dataframe_model.get_metadata(name="streamed") is None
+
+# Test the profile of a dataset streamed to CSV holds the types its columns parse back as.
+def test_stream_to_databank_csv_profile(empty_dataframe_model, tmp_path, monkeypatch):
+    df = pd.DataFrame({"i": pd.array([1, None, 3, 4], dtype="Int64"), "j": pd.array([1, 2, 3, 4], dtype="Int8"),
+                       "c": pd.Categorical(["x", "y", "x", None]), "b": [True, False, True, True],
+                       "s": pd.arrays.SparseArray([0.0, 1.0, 0.0, 0.0])})
+    monkeypatch.setattr(empty_dataframe_model, "databank_dir", str(tmp_path) + "/")
+    monkeypatch.setattr(empty_dataframe_model, "catalog", CatalogModel(db_path=str(tmp_path / "data.db")))
+
+    file_path = empty_dataframe_model.stream_to_databank("streamed", [df.iloc[:2], df.iloc[2:]], "Description", 
+                                                         "Source")
+
+    profile = empty_dataframe_model.get_metadata(name="streamed")["Profile"]
+    expected = empty_dataframe_model.profile_dataset(pd.read_csv(file_path), file_path)
+    assert profile["Rows"] == expected["Rows"] and profile["Columns"] == expected["Columns"]
+
+# Test dataset info is served from the stored profile and only re-profiled when the file's contents change.
+def test_get_dataset_info_from_profile(empty_dataframe_model, tmp_path, monkeypatch):
+    file_path = str(tmp_path / "profiled.csv")
+    df = pd.DataFrame({"a": [1, 2, None], "b": ["x", "y", "z"]})
+    df.to_csv(file_path, index=False)
+    monkeypatch.setattr(empty_dataframe_model, "catalog", CatalogModel(db_path=str(tmp_path / "data.db")))
+
+    profile = empty_dataframe_model.profile_dataset(df, file_path)
+    assert profile["Rows"] == 3 and profile["Columns"]["a"] == {"Dtype": "float64", "Nulls": 1}
+    empty_dataframe_model.add_metadata("profiled", "Description", "Source", profile=profile)
+
+    # Touching the file without changing it must not require parsing it.
+    os.utime(file_path, ns=(0, 0))
+    with monkeypatch.context() as patch:
+        patch.setattr(DatasetModel, "read_databank_csv", lambda *args, **kwargs: pytest.fail("CSV was parsed"))
+        info = empty_dataframe_model.get_dataset_info(file_path)
+    assert "RangeIndex: 3 entries, 0 to 2" in info and " 0   a       2 non-null      float64" in info
+
+    pd.DataFrame({"a": [1, 2, 3, 4]}).to_csv(file_path, index=False)
+    assert "RangeIndex: 4 entries, 0 to 3" in empty_dataframe_model.get_dataset_info(file_path)
+    assert empty_dataframe_model.load_all_metadata()["profiled"]["Profile"]["Rows"] == 4
+
+# Test exports are written in chunks in every format and compression, round tripping the dataframe.
+@pytest.mark.parametrize("file_format, compression, extension", [
+    ("csv", None, ".csv"), ("csv", "gzip", ".csv.gz"), ("parquet", "zstd", ".parquet"), ("feather", "zstd", ".feather")
+])
+def test_save_export_dataset_formats(empty_dataframe_model, tmp_path, file_format, compression, extension):
+    df = pd.DataFrame({"a": np.arange(250), "b": [None] * 200 + ["x"] * 50}) # First chunks hold no strings.
+    empty_dataframe_model.export_chunk_size = 100
+
+    try:
+        progress = []
+        written = empty_dataframe_model.save_export_dataset(
+            str(tmp_path / "export"), file_format=file_format, compression=compression, 
+            progress=lambda *args: progress.append(args), df=df
+            )
+    finally:
+        empty_dataframe_model.export_chunk_size = 100000
+
+    assert written == str(tmp_path / ("export" + extension))
+    assert progress == [(100, 250), (200, 250), (250, 250)]
+    assert os.listdir(tmp_path) == ["export" + extension]
+    match file_format:
+        case "csv":
+            assert pd.read_csv(written).equals(df)
+        case "parquet":
+            assert pd.read_parquet(written).equals(df)
+        case "feather":
+            assert pd.read_feather(written).equals(df)
+
+# Test row windows are assembled from cached, pre-stringified pages which are dropped when the dataset changes.
+def test_get_row_window(empty_dataframe_model):
+    df = pd.DataFrame({"a": np.arange(250), "b": ["x", None] * 125})
+    empty_dataframe_model.clear_all_snapshots()
+    empty_dataframe_model.append_new_snapshot({"Name": "paged", "Description": "", "Schedule Set": {}, "Dataframe": df})
+
+    rows = empty_dataframe_model.get_row_window(start_row=99, end_row=400) # End beyond the last row is limited.
+    assert len(rows) == 152
+    assert rows[0] == ("98", "x") and rows[1] == ("99", "None") and rows[-1] == ("249", "None")
+    assert empty_dataframe_model.get_page(1) is empty_dataframe_model.get_page(1) # Served from the cache.
+
+    for start_row, end_row in [(0, 10), (20, 10), (251, 260)]:
+        with pytest.raises(ValueError):
+            empty_dataframe_model.get_row_window(start_row=start_row, end_row=end_row)
+
+    generated = df.assign(a=df["a"] * 2)
+    empty_dataframe_model.add_generated_dataset_to_snapshot([], "Generated Dataset", generated)
+    assert empty_dataframe_model.get_row_window(start_row=2, end_row=2) == [("2", "None")]
+    empty_dataframe_model.clear_all_snapshots()
+
 if __name__ == '__main__':
     pytest.main()
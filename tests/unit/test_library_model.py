@@ -3,11 +3,15 @@ import os
 import pytest
 from models.library import LibraryModel
 from models.dataset import DatasetModel
+from models.catalog import CatalogModel
 
 class TestLibraryModel:
     @pytest.fixture
-    def library_model(self):
-        return LibraryModel()
+    def library_model(self, tmp_path):
+        library_model = LibraryModel()
+        # Work on a copy of the catalog, seeded from the metadata store.
+        library_model.catalog = CatalogModel(db_path=str(tmp_path / "data.db"))
+        return library_model
 
     def test_convert_to_megabytes(self, library_model):
         assert library_model.convert_to_megabytes(0) == "0 bytes"
@@ -37,8 +41,10 @@ class TestLibraryModel:
             "heart-disease": {"Source": "Source3", "Description": "Heart Disease dataset"}
         }
         
-        # Assign the mock metadata dataset to the model's _metadata attribute
-        library_model._metadata = mock_metadata
+        # Replace the catalog's contents with the mock metadata dataset
+        for name in library_model.catalog.get_names():
+            library_model.catalog.remove(name)
+        library_model.add_metadata(mock_metadata)
         
         # Define search keywords
         keywords = "breast cancer"
@@ -80,6 +86,16 @@ class TestLibraryModel:
         for dataset_name in specific_datasets:
             assert (dataset_name, mock_datasets[dataset_name]) in datasets
 
+    def test_get_datasets_parquet(self, library_model, tmp_path):
+        # Datasets streamed by "Expand (add rows)" may be Parquet files.
+        library_model.databank_dir = str(tmp_path) + "/"
+        (tmp_path / "streamed.parquet").write_bytes(b"0" * 2048)
+        library_model.add_metadata({"streamed": {"Source": "Source", "Description": "Description"}})
+
+        assert library_model.dataset_path("streamed") == os.path.join(str(tmp_path), "streamed.parquet")
+        assert library_model.dataset_path("missing") == os.path.join(str(tmp_path), "missing.csv")
+        assert library_model.get_datasets("specific", ["streamed"]) == [("streamed", "2.00 KB")]
+
     def test_get_file_metadata(self, library_model):
         # Mock metadata for datasets
         mock_metadata = {
@@ -91,8 +107,8 @@ class TestLibraryModel:
             }
         }
 
-        # Assign the mock metadata to the model's _metadata attribute
-        library_model._metadata = mock_metadata
+        # Add the mock metadata to the catalog
+        library_model.add_metadata(mock_metadata)
 
         # Define the dataset name for which you want to get metadata
         dataset_name = "bcdata"
@@ -115,3 +131,17 @@ class TestLibraryModel:
         loaded_metadata = library_model.load_all_metadata()
         # Assuming you added the test metadata, you can assert the result based on your test data
         assert "test_dataset" in loaded_metadata
+
+    def test_search_metadata_catalog(self, library_model):
+        library_model.add_metadata({"test_dataset": {"Source": "Test Source", "Description": "Quarterly revenue"}})
+
+        # Prefix of a description word, part of the name, and all keywords required.
+        assert library_model.search_metadata("quarter") == ["test_dataset"]
+        assert library_model.search_metadata("est_dat") == ["test_dataset"]
+        assert library_model.search_metadata("quarter missing") == []
+
+        # Updates and removals are reflected in the full-text index.
+        library_model.add_metadata({"test_dataset": {"Source": "Test Source", "Description": "Annual revenue"}})
+        assert library_model.search_metadata("quarter") == []
+        library_model.catalog.remove("test_dataset")
+        assert library_model.search_metadata("annual") == []
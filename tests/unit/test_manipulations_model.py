@@ -1,6 +1,12 @@
 import pytest
+import threading
+import numpy as np
 import pandas as pd
+from sklearn.decomposition import PCA, TruncatedSVD
+from sklearn.preprocessing import PolynomialFeatures
 from models.manipulations import ManipulationsModel as manip
+from models.dataset import DatasetModel
+from models.catalog import CatalogModel
 
 class TestManipulations:
     @pytest.fixture
@@ -27,6 +33,35 @@ class TestManipulations:
 
         assert reduced_df.shape[1] == expected_columns
 
+    @pytest.mark.parametrize("sub_action, degree, output", [
+        ("Feature Engineering Polynominal Features", 2, "Dense"),
+        ("Feature Engineering Polynominal Features", 3, "Float32"),
+        ("Feature Engineering Interaction Features", 3, "Sparse"),
+    ])
+    def test_add_feature_products(self, diabetes_dataset, manip_obj, sub_action, degree, output):
+        df, _ = diabetes_dataset
+        column = "Outcome"
+        features = df.drop(columns=[column])
+        polynomial = PolynomialFeatures(degree, include_bias=False, 
+                                        interaction_only=sub_action.endswith("Interaction Features")).fit(features)
+        expected = polynomial.transform(features)[:, features.shape[1]:]
+        args = {"a": degree, "b": output, "c": ""}
+
+        result_df = manip_obj.add_column(sub_action, df.copy(), column, args)
+
+        added = result_df.iloc[:, df.shape[1]:]
+        assert list(added.columns) == list(polynomial.get_feature_names_out())[features.shape[1]:]
+        if output == "Sparse":
+            assert all(isinstance(dtype, pd.SparseDtype) for dtype in added.dtypes)
+            added = added.sparse.to_dense()
+        assert (added.dtypes == (np.float32 if output == "Float32" else np.float64)).all()
+        np.testing.assert_allclose(added.to_numpy(), expected, rtol=1e-5 if output == "Float32" else 1e-12)
+        pd.testing.assert_frame_equal(result_df.iloc[:, :df.shape[1]], df)
+
+        # The column limit is checked before the features are built.
+        assert manip_obj.add_column(sub_action, df.copy(), column, {**args, "c": expected.shape[1] - 1}) is False
+        assert "more than the limit" in str(manip_obj.error_msg)
+
     def test_add_new_column(self, diabetes_dataset, manip_obj):
         df, column = diabetes_dataset
         args = {"a": "New Column", "b": "", "c": ""}
@@ -70,6 +105,29 @@ class TestManipulations:
         assert isinstance(result, pd.DataFrame)
         assert result.isna().sum().sum() == 33
 
+    @pytest.mark.parametrize("column, b, expected_missing", [
+        ("", "Exact", lambda df: round(0.1 * df.size)),
+        ("", "Per Column", lambda df: round(0.1 * len(df)) * df.shape[1]),
+        ("Pregnancies", "Exact", lambda df: round(0.1 * len(df))),
+    ])
+    def test_add_missing_rate(self, diabetes_dataset, manip_obj, column, b, expected_missing):
+        df, _ = diabetes_dataset
+        source = df.copy()
+
+        result = manip_obj.add_noise("Add Missing Rate", df, column, {"a": 0.1, "b": b, "c": ""})
+
+        assert result.isna().sum().sum() == expected_missing(df)
+        if b == "Per Column":
+            assert (result.isna().sum() == round(0.1 * len(df))).all()
+        # Integer columns receiving missing values become nullable integers, the others keep their dtype.
+        for col in df:
+            if result[col].isna().any() and df[col].dtype == "int64":
+                assert result[col].dtype == "Int64"
+            else:
+                assert result[col].dtype == df[col].dtype
+        pd.testing.assert_frame_equal(df, source) # The input is left alone.
+        assert manip_obj.add_noise("Add Missing Rate", df, column, {"a": 1.5, "b": b, "c": ""}) is False
+
     def test_add_noise_outliers_z_score(self, diabetes_dataset, manip_obj):
         df, column = diabetes_dataset
         args = {"a": 2, "b": "", "c": ""}
@@ -145,6 +203,80 @@ class TestManipulations:
         df_result = manip_obj.replace_null_values(sub_action, df, column, args=args)
         assert df_result[column].isna().sum() == 0
 
+    @pytest.mark.parametrize("a, expected_counts", [
+        ("", {"Existing Customer": 850, "Attrited Customer": 850}), # Balanced, as imblearn's 'auto'.
+        (3000, {"Existing Customer": 1500, "Attrited Customer": 1500}),
+        (1200, {"Existing Customer": 850, "Attrited Customer": 350}),
+    ])
+    def test_add_rows_smote_mixed_columns(self, manip_obj, a, expected_counts):
+        df = pd.read_csv("db/databank/BankChurners.csv").groupby("Attrition_Flag").head(850).head(1000)
+        manip_obj.smote_chunk_size = 64
+
+        manip_obj.random.reseed(5)
+        result = manip_obj.add_rows("SMOTE", df, "Attrition_Flag", {"a": a, "b": "", "c": ""})
+
+        assert result["Attrition_Flag"].value_counts().to_dict() == expected_counts
+        assert result.columns[-1] == "Attrition_Flag"
+        assert (result.dtypes == df.dtypes[result.columns]).all() # Integer columns stay integers.
+        synthetic = result.iloc[len(df):]
+        for cols in ["Gender", "Education_Level", "Card_Category"]: # Categories come from the original rows.
+            assert set(synthetic[cols].dropna()) <= set(df[cols])
+        assert synthetic["Customer_Age"].between(df["Customer_Age"].min(), df["Customer_Age"].max()).all()
+        manip_obj.random.reseed(5)
+        assert manip_obj.add_rows("SMOTE", df, "Attrition_Flag", {"a": a, "b": "", "c": ""}).equals(result)
+
+    def test_add_rows_smote_nullable_integers_and_category_limit(self, manip_obj):
+        df = pd.read_csv("db/databank/BankChurners.csv").groupby("Attrition_Flag").head(300)
+        # As left by "Add Missing Rate", which converts columns to nullable dtypes.
+        df["Customer_Age"] = df["Customer_Age"].astype("Int64")
+        df.loc[df.index[::10], "Customer_Age"] = pd.NA
+
+        result = manip_obj.add_rows("SMOTE", df, "Attrition_Flag", {"a": 1000, "b": "", "c": ""})
+
+        assert len(result) == 1000
+        assert result["Customer_Age"].dtype == "Int64"
+        synthetic = result["Customer_Age"].iloc[len(df):].dropna()
+        assert synthetic.between(df["Customer_Age"].min(), df["Customer_Age"].max()).all()
+
+        # Non-numeric columns with more categories than allowed are refused, and named.
+        assert manip_obj.add_rows("SMOTE", df, "Attrition_Flag", {"a": 1000, "b": "", "c": 4}) is False
+        assert "Education_Level has 7" in str(manip_obj.error_msg)
+
+    def test_replace_null_values_random_forest_every_column(self, manip_obj):
+        df = pd.read_csv("db/databank/titanic.csv") # Non-numeric columns are encoded as features.
+        manip_obj.rf_max_train_rows = 200
+        args = {"a": "Random Forest", "b": "", "c": ""}
+
+        manip_obj.random.reseed(3)
+        result = manip_obj.replace_null_values("Algorithmic Numerical", df.copy(), "", args)
+
+        numeric = ["pclass", "survived", "age", "sibsp", "parch", "fare", "body"]
+        assert result[numeric].isna().sum().sum() == 0
+        assert result["cabin"].isna().sum() == df["cabin"].isna().sum()
+        known = df["age"].notna()
+        assert result.loc[known, "age"].equals(df.loc[known, "age"])
+        # The trees and the rows they are trained on are drawn from the seeded generator.
+        manip_obj.random.reseed(3)
+        assert manip_obj.replace_null_values("Algorithmic Numerical", df.copy(), "", args).equals(result)
+
+    def test_replace_null_values_knn_uses_other_columns(self, diabetes_dataset, manip_obj):
+        df, _ = diabetes_dataset
+        truth = df["Glucose"].copy()
+        rows = np.random.default_rng(0).choice(len(df), 100, replace=False)
+        df.loc[rows, "Glucose"] = np.nan
+        args = {"a": "KNN", "b": 5, "c": ""}
+
+        result = manip_obj.replace_null_values("Algorithmic Numerical", df.copy(), "Glucose", args)
+        manip_obj.knn_chunk_size = 7
+        chunked = manip_obj.replace_null_values("Algorithmic Numerical", df.copy(), "Glucose", args)
+
+        assert result["Glucose"].isna().sum() == 0
+        assert chunked.equals(result)
+        # The neighbours come from the other columns, so the imputed values beat the mean.
+        knn_error = (result["Glucose"][rows] - truth[rows]).abs().mean()
+        mean_error = (df["Glucose"].mean() - truth[rows]).abs().mean()
+        assert knn_error < mean_error
+
     def test_replace_null_values_algorithmic_numerical_random_forest(self, diabetes_dataset, manip_obj):
         df, column = diabetes_dataset
         sub_action = "Algorithmic Numerical"
@@ -209,3 +341,315 @@ class TestManipulations:
         args = {"a": num_rows, "b": 0, "c": 0}
         result_df = manip_obj.add_rows(sub_action, df.copy(), column, args)
         assert len(result_df) == len(df) + num_rows
+
+    @pytest.mark.parametrize("sub_action, name", [("Random Sampling", "streamed.parquet"), 
+                                                  ("Bootstrap Resampling", "streamed")])
+    def test_add_rows_stream(self, diabetes_dataset, manip_obj, sub_action, name, tmp_path, monkeypatch):
+        df, column = diabetes_dataset
+        dataset = DatasetModel()
+        monkeypatch.setattr(dataset, "databank_dir", str(tmp_path) + "/")
+        monkeypatch.setattr(dataset, "catalog", CatalogModel(db_path=str(tmp_path / "data.db")))
+        monkeypatch.setattr(manip, "stream_block_size", 1000)
+        args = {"a": 2500, "b": "Stream", "c": name}
+
+        result_df = manip_obj.add_rows(sub_action, df, column, args)
+
+        assert result_df is df
+        written = list(tmp_path.glob("streamed.*"))
+        assert [file.name for file in written] == ["streamed.parquet" if name.endswith(".parquet") else "streamed.csv"]
+        streamed = pd.read_parquet(written[0]) if name.endswith(".parquet") else pd.read_csv(written[0])
+        assert len(streamed) == len(df) + 2500
+        pd.testing.assert_frame_equal(streamed.iloc[:len(df)], df)
+        if sub_action == "Random Sampling":
+            # Every row is drawn once before any row is drawn again.
+            counts = streamed.iloc[len(df):].value_counts()
+            assert counts.max() - counts.min() <= 1
+        assert dataset.catalog.get("streamed")["Profile"]["Rows"] == len(df) + 2500
+        # An existing dataset is never overwritten, whatever its format.
+        args["c"] = "streamed.csv" if name.endswith(".parquet") else "streamed.parquet"
+        assert manip_obj.add_rows(sub_action, df, column, args) is False
+
+    @pytest.mark.parametrize("column", ["", "Insulin"])
+    def test_replace_outliers(self, diabetes_dataset, manip_obj, column):
+        df, _ = diabetes_dataset
+        df = df.set_index(df.index * 3) # Must not rely on a RangeIndex.
+        args = {"a": 25, "b": 75, "c": ""}
+
+        # Reference result, column by column.
+        expected = df.copy()
+        for col in ([column] if column else expected.columns):
+            Q1, Q3 = expected[col].quantile(0.25), expected[col].quantile(0.75)
+            lower_bound, upper_bound = Q1 - 1.5 * (Q3 - Q1), Q3 + 1.5 * (Q3 - Q1)
+            expected[col] = expected[col].mask((expected[col] < lower_bound) | (expected[col] > upper_bound))
+
+        result_df = manip_obj.replace_outliers("", df, column, args)
+        assert result_df is df # Replaced in place.
+        assert result_df.equals(expected)
+        assert result_df["Insulin"].isna().sum() > 0
+
+    def test_generate_churner_plan(self, diabetes_dataset, manip_obj):
+        df, column = diabetes_dataset
+        source = df.copy()
+        steps = [
+            ("Add Noise", "Add Random Custom Value", "Insulin", {"a": -1, "b": 50, "c": ""}),
+            ("Add Column", "Duplicate", column, {"a": "Duplicate", "b": "", "c": ""}),
+            ("Change Column Name", "", "Age", {"a": "Years", "b": "", "c": ""}),
+            ("Replace Missing Values", "Manual Numerical", "Insulin", {"a": 0, "b": "", "c": ""}),
+            ("Reduce Remove Rows", "Duplicate Rows", "", {"a": "", "b": "", "c": ""}),
+        ]
+        schedule_set = [{"step": step, "action": action, "sub_action": sub_action, "column": col, "args": args,
+                         "outcome": "Pending", "df": df} for step, (action, sub_action, col, args) in
+                        enumerate(steps, start=1)]
+
+        plan = manip_obj.compile_plan(schedule_set)
+        assert [len(stage["steps"]) for stage in plan["stages"]] == [3, 1, 1] # Steps 1-3 touch disjoint columns.
+        assert plan["stages"][0]["copies"] == ["Insulin"] # Only the column written in place is copied.
+        assert "steps 1, 2, 3 fused" in manip_obj.explain_plan(plan)
+
+        result_df = manip_obj.generate_churner(schedule_set)
+        assert df.equals(source) # The source snapshot is left alone.
+        assert [item["outcome"] for item in schedule_set] == ["Success"] * 5
+        assert (result_df["Insulin"] == -1).sum() == 50
+        assert result_df["Duplicate"].equals(result_df[column])
+        assert "Years" in result_df.columns
+
+    def test_generate_churner_prefix_cache(self, diabetes_dataset, manip_obj):
+        df, column = diabetes_dataset
+        steps = [
+            ("Replace Missing Values", "Algorithmic Numerical", "Insulin", {"a": "Random Forest", "b": "", "c": ""}),
+            ("Add Column", "Duplicate", column, {"a": "Duplicate", "b": "", "c": ""}),
+            ("Add Noise", "Add Missing", "Duplicate", {"a": 10, "b": "", "c": ""}),
+        ]
+        # Random Forest imputation is only cached with a seed.
+        schedule_set = lambda last: [{"step": step, "action": action, "sub_action": sub_action, "column": col,
+                                      "args": args, "outcome": "Pending", "df": df, "seed": 7 if step == 1 else None} 
+                                     for step, (action, sub_action, col, args) in enumerate(steps[:2] + [last], start=1)]
+
+        first_df = manip_obj.generate_churner(schedule_set(steps[2]))
+        assert len(manip_obj.result_cache) == 2 # The random last step is not cached without a seed.
+
+        # Changing the last step resumes from the cached result of the first two.
+        manip_obj.manip_collection["Replace Missing Values"] = lambda *args: pytest.fail("step 1 ran again")
+        second_df = manip_obj.generate_churner(schedule_set(("Change Column Name", "", "Age",
+                                                             {"a": "Years", "b": "", "c": ""})))
+        assert second_df["Insulin"].equals(first_df["Insulin"])
+        assert second_df["Duplicate"].isna().sum() == 0 # The cached result was not modified by the first run.
+        assert "Years" in second_df.columns
+
+    def test_generate_churner_progress_and_cancel(self, diabetes_dataset, manip_obj):
+        df, column = diabetes_dataset
+        cancel = threading.Event()
+        schedule_set = [{"step": step, "action": "Add Column", "sub_action": "New", "column": column,
+                         "args": {"a": f"New {step}", "b": "", "c": ""}, "outcome": "Pending", "df": df}
+                        for step in range(1, 4)]
+
+        # Cancel once step 2 has finished, step 3 must not run.
+        messages = []
+        def progress(step, status, elapsed):
+            messages.append((step, status))
+            if (step, status) == (2, "Success"):
+                cancel.set()
+
+        assert manip_obj.generate_churner(schedule_set, progress=progress, cancel=cancel) is None
+        assert messages == [(1, "Running"), (1, "Success"), (2, "Running"), (2, "Success")]
+        assert [item["outcome"] for item in schedule_set] == ["Success", "Success", "Pending"]
+        assert list(df.columns) == list(pd.read_csv("db/databank/diabetes.csv", nrows=0).columns)
+
+    def test_auto_mode_clean_dataset_batches(self, manip_obj):
+        df = pd.read_csv("db/databank/titanic.csv")
+        df["fare32"] = df["fare"].astype("float32") # Filled with its mean, as float64 columns are, and kept float32.
+        args = {"a": "", "b": "", "c": ""}
+
+        # Reference result, column by column.
+        expected = manip_obj.replace_outliers("", df.copy(), "", {"a": 1, "b": 99, "c": ""})
+        for col in expected:
+            if manip_obj._is_numeric(expected[col]):
+                manip_obj.replace_null_values("Algorithmic Numerical", expected, col, {"a": "Mean", "b": "", "c": ""})
+            else:
+                manip_obj.replace_null_values("Algorithmic Categorical", expected, col, {"a": "Mode", "b": "", "c": ""})
+
+        manip_obj.auto_clean_batch_size, manip_obj.auto_clean_workers = 3, 3
+        result_df = manip_obj.auto_mode("Clean Dataset", df.copy(), "", args)
+        pd.testing.assert_frame_equal(result_df, expected, check_exact=True)
+        assert result_df.isna().sum().sum() == 0
+
+    def test_auto_mode_compacted_dataset(self, manip_obj):
+        df = pd.read_csv("db/databank/titanic.csv")
+        compacted, _ = DatasetModel().compact_dtypes(df)
+        assert compacted["fare"].dtype == "float32" and str(compacted["body"].dtype) == "Int16"
+        args = {"a": "", "b": "", "c": ""}
+
+        # Compacted columns are cleaned as their uncompacted dtypes are: numeric ones filled with their mean.
+        cleaned = manip_obj.auto_mode("Clean Dataset", compacted.copy(), "", args)
+        pd.testing.assert_frame_equal(cleaned, manip_obj.auto_mode("Clean Dataset", df.copy(), "", args), 
+                                      check_dtype=False, check_categorical=False)
+        assert cleaned["fare"].dtype == "float32" and cleaned.isna().sum().sum() == 0
+
+        # and receive the same outliers.
+        manip_obj.random.reseed(1)
+        dirty = manip_obj.auto_mode("Dirty Dataset", compacted.copy(), "", args)
+        manip_obj.random.reseed(1)
+        pd.testing.assert_frame_equal(dirty, manip_obj.auto_mode("Dirty Dataset", df.copy(), "", args), 
+                                      check_dtype=False, check_categorical=False)
+
+    @pytest.mark.parametrize("sub_action, reference", [
+        ("Algorithmic Incremental PCA", PCA(n_components=3)),
+        ("Algorithmic Incremental SVD", TruncatedSVD(n_components=3, algorithm="arpack")),
+    ])
+    def test_reduce_columns_incremental(self, diabetes_dataset, manip_obj, sub_action, reference, tmp_path):
+        df, _ = diabetes_dataset
+        X = df.drop(columns=["Outcome"])
+
+        reduced = manip_obj.reduce_columns(sub_action, df, "Outcome", {"a": 3, "b": 100, "c": ""})
+        from_csv = manip_obj.reduce_columns(sub_action, df.head(0), "Outcome", {"a": 3, "b": 100, 
+                                                                                "c": {"source": "diabetes", "name": ""}})
+
+        assert list(reduced.columns[-1:]) == ["Outcome"] and reduced.shape == (len(df), 4)
+        assert reduced["Outcome"].equals(df["Outcome"])
+        pd.testing.assert_frame_equal(from_csv, reduced)
+        # Components match the in-memory fit up to their sign (and, for batched PCA, approximately).
+        expected = np.abs(reference.fit_transform(X))
+        assert np.allclose(np.abs(reduced.iloc[:, 0].to_numpy()), expected[:, 0], rtol=0.01, atol=0.01)
+        if sub_action.endswith("SVD"):
+            assert np.allclose(np.abs(reduced.iloc[:, :3].to_numpy()), expected)
+
+        output_path = manip_obj.incremental_reduce(df, "Outcome", 3, method=sub_action.split()[-1], chunk_size=100,
+                                                   output_path=tmp_path / "reduced.csv")
+        pd.testing.assert_frame_equal(pd.read_csv(output_path), reduced)
+
+    def test_reduce_columns_incremental_streamed(self, diabetes_dataset, manip_obj, tmp_path, monkeypatch):
+        df, _ = diabetes_dataset
+        dataset = DatasetModel()
+        monkeypatch.setattr(dataset, "databank_dir", str(tmp_path) + "/")
+        monkeypatch.setattr(dataset, "catalog", CatalogModel(db_path=str(tmp_path / "data.db")))
+        df.to_csv(tmp_path / "source.csv", index=False)
+        reduced = manip_obj.reduce_columns("Algorithmic Incremental PCA", df, "Outcome", {"a": 3, "b": 100, "c": ""})
+        row = {"action": "Reduce Columns (Dimensionality)", "sub_action": "Algorithmic Incremental PCA", 
+               "args": {"a": 3, "b": 100, "c": {"source": "source", "name": "reduced"}}}
+
+        # The databank source is read, and the reduced rows streamed to a new databank dataset, chunk by chunk.
+        result_df = manip_obj.reduce_columns(row["sub_action"], df.head(0), "Outcome", row["args"])
+
+        assert result_df.equals(df.head(0))
+        pd.testing.assert_frame_equal(pd.read_csv(tmp_path / "reduced.csv"), reduced)
+        assert dataset.catalog.get("reduced")["Profile"]["Rows"] == len(df)
+        assert not manip_obj._is_reproducible(row) # Never skipped by the prefix cache.
+        row["args"]["c"] = {"source": "missing", "name": ""}
+        assert manip_obj.reduce_columns(row["sub_action"], df, "Outcome", row["args"]) is False
+
+    @pytest.mark.parametrize("a", ["Dense", "Sparse"])
+    def test_one_hot_encoding(self, manip_obj, a):
+        df = pd.read_csv("db/databank/titanic.csv")[["sex", "age", "embarked", "survived"]]
+
+        result = manip_obj.data_transformation("Feature Encoding One-hot Encoding", df, "survived", 
+                                               {"a": a, "b": "", "c": ""})
+
+        assert list(result.columns) == ["age", "sex_female", "sex_male", "sex_nan", "embarked_C", "embarked_Q", 
+                                        "embarked_S", "embarked_nan", "survived"]
+        assert (result["sex_female"] == (df["sex"] == "female")).all() # Labels follow the encoder's categories.
+        assert result.filter(like="embarked_").sum(axis=1).eq(1).all()
+        assert result["sex_male"].dtype == ("Sparse[uint8, 0]" if a == "Sparse" else "uint8")
+
+    def test_one_hot_encoding_cardinality_guard(self, manip_obj):
+        df = pd.read_csv("db/databank/titanic.csv")
+
+        assert manip_obj.data_transformation("Feature Encoding One-hot Encoding", df, "survived", 
+                                             {"a": "", "b": 10, "c": ""}) is False
+        assert "name has 1308" in str(manip_obj.error_msg)
+
+    @pytest.mark.parametrize("sub_action, encoded", [
+        ("Feature Encoding One-hot Encoding", ["sex_female", "sex_male", "sex_nan", "embarked_C", "embarked_Q", 
+                                              "embarked_S", "embarked_nan"]),
+        ("Feature Encoding Label Encoding", ["sex", "embarked"]),
+        ("Feature Encoding Target Encoding", ["sex", "embarked"]),
+    ])
+    def test_feature_encoding_compacted_categories(self, manip_obj, sub_action, encoded):
+        df = pd.read_csv("db/databank/titanic.csv")[["sex", "age", "embarked", "survived"]]
+        compacted, _ = DatasetModel().compact_dtypes(df)
+        assert isinstance(compacted["sex"].dtype, pd.CategoricalDtype)
+        args = {"a": "", "b": "", "c": ""}
+
+        # Category columns are encoded, as the object columns they were compacted from are.
+        expected = manip_obj.data_transformation(sub_action, df.copy(), "survived", args)
+        result = manip_obj.data_transformation(sub_action, compacted.copy(), "survived", args)
+
+        assert list(result.columns) == list(expected.columns)
+        pd.testing.assert_frame_equal(result[encoded], expected[encoded], check_dtype=False)
+
+    def test_label_encoding_reuses_mappings(self, manip_obj):
+        df = pd.DataFrame({"colour": ["red", "blue", None, "green", "blue"], "target": [1, 0, 1, 0, 1]})
+        schedule_set = lambda df, a: [{"step": 1, "action": "Data Transformation", 
+                                       "sub_action": "Feature Encoding Label Encoding", "column": "target", 
+                                       "args": {"a": a, "b": "", "c": ""}, "outcome": "Pending", "df": df}]
+
+        sample_set = schedule_set(df.iloc[[0, 1]], "")
+        sample = manip_obj.generate_churner(sample_set)
+        mappings = sample_set[0]["mappings"] # Recorded in the schedule set of the snapshot.
+        assert mappings == {"colour": ["blue", "red"]}
+        assert sample["colour"].tolist() == [1, 0]
+
+        # Encoding the full dataset with the sample's mappings keeps its codes, new values are numbered after them.
+        full_set = schedule_set(df, mappings)
+        full = manip_obj.generate_churner(full_set)
+        assert full["colour"].tolist()[:2] == [1, 0]
+        assert full_set[0]["mappings"] == {"colour": ["blue", "red", "green"]}
+        assert np.isnan(full["colour"][2])
+
+        assert manip_obj.decode_labels(full, full_set[0]["mappings"]).equals(df)
+
+        # Served from the cache, the step still records its mappings.
+        again = schedule_set(df, mappings)
+        manip_obj.generate_churner(again)
+        assert again[0]["mappings"] == full_set[0]["mappings"]
+
+    def test_target_encoding(self, manip_obj):
+        df = pd.DataFrame({"colour": ["red", "red", "blue", "blue", "blue", None], "size": [1, 2, 3, 4, 5, 6], 
+                           "target": [1.0, 0.0, 1.0, 1.0, 1.0, 0.0]})
+        prior = df["target"].mean()
+
+        plain = manip_obj.data_transformation("Feature Encoding Target Encoding", df.copy(), "target", 
+                                              {"a": "", "b": "", "c": ""})
+        smoothed = manip_obj.data_transformation("Feature Encoding Target Encoding", df.copy(), "target", 
+                                                 {"a": 2, "b": "", "c": ""})
+
+        assert plain["colour"].tolist() == pytest.approx([0.5, 0.5, 1.0, 1.0, 1.0, prior])
+        assert smoothed["colour"][0] == pytest.approx((1.0 + 2 * prior) / (2 + 2))
+        assert plain["size"].equals(df["size"])
+
+    def test_target_encoding_out_of_fold(self, manip_obj):
+        df = pd.read_csv("db/databank/titanic.csv")[["sex", "embarked", "survived"]].dropna()
+        manip_obj.random.reseed(0)
+
+        encoded = manip_obj.data_transformation("Feature Encoding Target Encoding", df.copy(), "survived", 
+                                                {"a": "", "b": 5, "c": ""})
+
+        # Rows are encoded without their own target: a category's encodings differ between folds, and differ from
+        # the in-sample mean of the category.
+        in_sample = df.groupby("sex")["survived"].transform("mean")
+        assert encoded["sex"].nunique() == 2 * 5
+        assert not np.allclose(encoded["sex"], in_sample)
+        assert np.allclose(encoded["sex"], in_sample, atol=0.05)
+
+    @pytest.mark.parametrize("action, sub_action, column, args", [
+        ("Add Noise", "Add Missing", "", {"a": 50, "b": "", "c": ""}),
+        ("Add Noise", "Add Random Custom Value", "Insulin", {"a": -1, "b": 20, "c": ""}),
+        ("Expand (add rows)", "Bootstrap Resampling", "", {"a": 30, "b": "", "c": ""}),
+    ])
+    def test_generate_churner_seed(self, diabetes_dataset, action, sub_action, column, args):
+        df, _ = diabetes_dataset
+        schedule_set = lambda seed: [{"step": 1, "action": action, "sub_action": sub_action, "column": column,
+                                      "args": args, "outcome": "Pending", "df": df, "seed": seed}]
+
+        first_df = manip().generate_churner(schedule_set(7))
+        assert manip().generate_churner(schedule_set(7)).equals(first_df) # Same seed, same result.
+        assert not manip().generate_churner(schedule_set(8)).equals(first_df)
+
+    def test_replace_null_values_random_sampling_fill(self, manip_obj):
+        df = pd.DataFrame({"Colour": ["Red", None, "Blue", None, None, "Red"]})
+        args = {"a": "Random Sampling Fill", "b": "", "c": ""}
+
+        result_df = manip_obj.replace_null_values("Algorithmic Categorical", df, "Colour", args)
+
+        assert result_df["Colour"].isna().sum() == 0
+        assert set(result_df["Colour"]) == {"Red", "Blue"}
+        assert result_df["Colour"].dtype == object
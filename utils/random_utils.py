@@ -0,0 +1,30 @@
+import numpy as np
+
+class RandomGenerator:
+    """Random number utility. Every random draw of the manipulations and sampling models comes from the single
+    numpy Generator held here, so a run can be reproduced by seeding it.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(RandomGenerator, cls).__new__(cls)
+            cls._instance.reseed()
+        return cls._instance
+
+    def reseed(self, seed=None, *stream):
+        """Start a new stream of random numbers.
+
+        Args:
+            seed (int, optional): seed of the stream, None to seed from fresh entropy.
+            stream (int): further integers keeping streams of the same seed apart e.g. the step number of a
+                scheduled manipulation, so that two steps with the same seed do not draw the same numbers.
+        """
+        self.seed = seed
+        self.generator = np.random.default_rng(None if seed is None else [seed, *stream])
+
+    def random_state(self):
+        """Integer seed drawn from the generator, for libraries which do not accept a numpy Generator
+        (e.g. scikit-learn's random_state).
+        """
+        return int(self.generator.integers(2 ** 32 - 1))
@@ -413,7 +413,9 @@ class AnalyseView(BaseView):
         Args:
             container_frame (CTkFrame): Frame that will hold this widget
             column_headers (list): List of strings which contain column headers
-            rows (pandas DataFrame): Specific row range.
+            rows (list): Specific row range, one tuple of strings per row. More can be added with
+                append_raw_table_rows; the container frame receives a <<RawTableEnd>> event when the table is
+                scrolled near its last row.
         """
         self.clear_child_widgets(mode="frame", widget=container_frame) # Refresh
         col_width = self._calculate_table_width(number_of_columns=len(column_headers))
@@ -431,12 +433,35 @@ class AnalyseView(BaseView):
             container_frame, orientation="vertical", height=59, fg_color="gray14", command=self.raw_table.yview
             )
         self.raw_table_y_scroll.pack(side="right", fill="y")
-        self.raw_table.configure(yscrollcommand=self.raw_table_y_scroll.set)
+        self.raw_table.configure(
+            yscrollcommand=lambda first, last: self._raw_table_scrolled(container_frame, first, last)
+            )
         self.raw_table.pack(side="top", fill="both", expand=True)
 
         # Populate table with rows
-        for index, row in rows.iterrows():
-            self.raw_table.insert('', 'end', values=row.tolist())
+        self.append_raw_table_rows(rows=rows)
+
+    def append_raw_table_rows(self, rows): 
+        """Add rows to the end of the tabulate table.
+
+        Args:
+            rows (list): One tuple of strings per row.
+        """
+        for row in rows:
+            self.raw_table.insert('', 'end', values=row)
+
+    def _raw_table_scrolled(self, container_frame, first, last): 
+        """Update the tabulate table's scrollbar and signal when the end of the table comes into view, so more
+        rows can be fetched.
+
+        Args:
+            container_frame (CTkFrame): Frame holding the table.
+            first (str): Fraction of the table above the visible rows.
+            last (str): Fraction of the table up to the last visible row.
+        """
+        self.raw_table_y_scroll.set(first, last)
+        if float(last) >= 0.9:
+            container_frame.event_generate("<<RawTableEnd>>", when="tail")
 
     def _change_table_heading(self, table, target_header, new_header): 
         """Change heading of table (specifically used for pivot feature. 
@@ -1,5 +1,5 @@
 from tkinter import ttk
-from customtkinter import CTkFrame, CTkFont, CTkLabel, CTkEntry, CTkButton, CENTER, CTkScrollbar, CTkTextbox, CTkScrollableFrame
+from customtkinter import CTkFrame, CTkFont, CTkLabel, CTkEntry, CTkButton, CENTER, CTkScrollbar, CTkTextbox, CTkScrollableFrame, CTkCheckBox
 from .base import BaseView
 
 class LibraryView(BaseView):
@@ -34,6 +34,9 @@ class LibraryView(BaseView):
         self.search_input = self._create_entry(row_1, "left")
         self.import_button = self._create_button(row_1, "Import", "left")
         self.new_button = self._create_button(row_1, "New", "left")
+        # Downcast columns to the smallest types holding their values when a dataset is loaded.
+        self.compact_checkbox = CTkCheckBox(row_1, text="Compact Types On Load")
+        self.compact_checkbox.pack(side="left", padx=5)
 
         tree_frame = self._create_frame(parent_frame=row_2)
         action_frame = self._create_frame(parent_frame=row_2)
@@ -42,6 +45,8 @@ class LibraryView(BaseView):
         self.tree_view = self._create_treeview(tree_frame)                                  
         self.dataset_delete_btn = self._create_button(action_frame, text="Remove", border_spacing=5, height=10, pady=(0, 10))
         self.dataset_delete_btn.lower()
+        self.load_cancel_btn = self._create_button(action_frame, text="Cancel Load", border_spacing=5, height=10)
+        self.load_cancel_btn.lower()
         
         # Render metadata on row 3.
         self.dataset_meta = self._create_label(self.row_3, "", height=170)
@@ -134,6 +134,20 @@ class ManipulateView(BaseView):
             )
         self.generate_button.pack(side="right", padx=(8, 8), pady=(8,8))
 
+        # Seed entry, optional seed of the random numbers drawn by the scheduled manipulations.
+        self.seed_entry = CTkEntry(self.generate_frame, placeholder_text="Seed (optional)", width=120)
+        self.seed_entry.pack(side="right", padx=(8, 0), pady=(8,8))
+
+        # Cancel generate button, only packed while a generate is running.
+        self.generate_cancel_button = CTkButton(
+            self.generate_frame,
+            text="Cancel",
+            corner_radius=5,
+            border_spacing=5,
+            anchor="center",
+            state="normal"
+            )
+
         # Scrollable frame for generate warning
         self.generate_warning_scroll_frame = CTkScrollableFrame(self.generate_frame, fg_color="gray20", orientation="horizontal", height=25)
         self.generate_warning_scroll_frame.pack(fill="both")
@@ -210,11 +224,12 @@ class ManipulateView(BaseView):
             case "Noise":
                 self.variables["action"] = f"Add {choice}"
                 self.pos_2_menu = self._drop_down_menu_template("Select Technique", ["Add Random Custom Value", 
-                                                                "Add Missing", "Add Outliers"], 
+                                                                "Add Missing", "Add Missing Rate", "Add Outliers"], 
                                                                 self._sub_action_callback, 2)
             case "Column":
                 self.variables["action"] = f"Add {choice}"
-                self.pos_2_menu = self._drop_down_menu_template("Select Technique", ["Duplicate", "New"], 
+                self.pos_2_menu = self._drop_down_menu_template("Select Technique", 
+                                                                ["Duplicate", "New", "Feature Engineering"], 
                                                                 self._sub_action_callback, 2)
             case "Columns (Dimensionality)":
                 self.variables["action"] = f"Reduce {choice}"
@@ -257,6 +272,10 @@ class ManipulateView(BaseView):
             case "Add Missing":
                 self.pos_3_menu = self._drop_down_menu_template("Select Target", ["Single Column", "Entire Dataset"], 
                                                                 self._single_or_entire_callback, 3) 
+            case "Add Missing Rate":
+                self.pos_3_menu = self._drop_down_menu_template("Select Target", 
+                                                                ["Single Column", "Entire Dataset", "Each Column"], 
+                                                                self._single_or_entire_callback, 3) 
             case "Add Outliers":
                 self.pos_2_menu = self._drop_down_menu_template("Select Technique", 
                                                                 ["Z-score", "Percentile", "Min/Max"], 
@@ -267,6 +286,10 @@ class ManipulateView(BaseView):
                 self.pos_4_entry_box = self._user_entry_box_template(4, 0, self._entry_box_standard_arg_a_callback,
                                                                     "Enter column name", 200)
                 self.entry_description.configure(text="Enter column name")
+            case "Feature Engineering":
+                self.pos_3_menu = self._drop_down_menu_template("Select Technique", 
+                                                                ["Polynominal Features", "Interaction Features"], 
+                                                                self._sub_action_2_callback, 3)
             case "Missing Values" | "Duplicate Rows":
                 self.schedule_button.configure(state="normal")
             case "New":
@@ -275,7 +298,7 @@ class ManipulateView(BaseView):
                 self.entry_description.configure(text="Enter column name")
             case "Algorithmic":
                 self.pos_2_menu = self._drop_down_menu_template("Select Technique", 
-                ["PCA", "LDA", "SVD", "Sklearn"], self._sub_action_2_callback, 3) 
+                ["PCA", "LDA", "SVD", "Incremental PCA", "Incremental SVD", "Sklearn"], self._sub_action_2_callback, 3) 
 
             case "Manual":
                 self.pos_3_menu = self._drop_down_menu_template("Select Column", self.column_headers, 
@@ -289,11 +312,14 @@ class ManipulateView(BaseView):
             case "Random Sampling" | "Bootstrap Resampling":
                 self.pos_3_entry_box = self._user_entry_box_template(3, 0, self._entry_box_int_arg_a_callback, 
                                                                     "1. Enter an integer", 150)
+                self.pos_4_menu = self._drop_down_menu_template("Select Output", 
+                                                ["Add to Dataset", "Stream to Databank"], 
+                                                self._expand_output_callback, 4)
                 self.entry_description.configure(text="1. Enter number of rows to generate")     
             case "SMOTE":
                 self.pos_3_menu = self._drop_down_menu_template("Select Dependant Variable", 
                                                 self.column_headers, 
-                                                self._set_column_var, 3)
+                                                self._smote_column_callback, 3)
 
     def _sub_action_2_callback(self,choice):
         self.variables["sub_action"] = f"{self.variables['sub_action']} {choice}"
@@ -304,7 +330,7 @@ class ManipulateView(BaseView):
                 self.pos_4_menu = self._drop_down_menu_template("Select Column",
                                                                 self.column_headers, 
                                                                 self._outliers_column_callback, 4)
-            case "PCA" | "LDA" | "SVD" | "Sklearn":
+            case "PCA" | "LDA" | "SVD" | "Incremental PCA" | "Incremental SVD" | "Sklearn":
                 self.pos_4_menu = self._drop_down_menu_template("Select Dependent Column", self.column_headers, 
                                                                 self._dimension_reduction_column_select_callack ,4)
             case "One-hot Encoding" | "Label Encoding":
@@ -312,6 +338,11 @@ class ManipulateView(BaseView):
                 self.pos_4_menu = self._drop_down_menu_template("Select Dependant Column", 
                                                                 self.column_headers, 
                                                                 self._provide_categorical_cols , 4)
+            case "Polynominal Features" | "Interaction Features":
+                self.pos_3_menu.configure(state="disabled")
+                self.pos_4_menu = self._drop_down_menu_template("Select Dependant Column", 
+                                                                ["None"] + list(self.column_headers), 
+                                                                self._feature_engineering_column_callback, 4)
             case "Target Encoding":
                 self.pos_3_menu.configure(state="disabled")
                 self.pos_4_menu = self._drop_down_menu_template("Select Dependant Column", 
@@ -340,20 +371,34 @@ class ManipulateView(BaseView):
             case "Single Column":
                 self.pos_4_menu = self._drop_down_menu_template("Select Column", self.column_headers, 
                                                                 self._add_missing_single_col_callback, 4)
-            case "Entire Dataset":
+            case "Entire Dataset" | "Each Column":
                 self.variables["column"] = ""
-                self.pos_5_entry_box = self._user_entry_box_template(4, 0, self._entry_box_int_arg_a_callback,
-                                                                    "Enter an integer", 150)
-                self.entry_description.configure(text="Enter number of values less than total rows")
+                self.variables["args"]["b"] = "Per Column" if choice == "Each Column" else "Exact"
+                self._add_missing_amount_entry_box(4)
 
     def _add_missing_single_col_callback(self, choice):
         #keep
         self._refresh_menu_widgets(5)
         self.variables["column"] = choice
+        self.variables["args"]["b"] = "Exact"
+
+        self._add_missing_amount_entry_box(5)
 
-        self.pos_5_entry_box = self._user_entry_box_template(5, 0, self._entry_box_int_arg_a_callback,
-                                                            "Enter an integer", 150)
-        self.entry_description.configure(text="Enter number of values less than total rows")
+    def _add_missing_amount_entry_box(self, col_pos):
+        """Entry box for the amount of missing values to add: a number of values for "Add Missing", a fraction
+        of the values for "Add Missing Rate".
+
+        Args:
+            col_pos (int): Column position to place on grid.
+        """
+        if self.variables["sub_action"] == "Add Missing Rate":
+            self.pos_5_entry_box = self._user_entry_box_template(col_pos, 0, self._entry_box_float_arg_a_callback,
+                                                                "Enter a float", 150)
+            self.entry_description.configure(text="Enter fraction of values to set missing, between 0 and 1")
+        else:
+            self.pos_5_entry_box = self._user_entry_box_template(col_pos, 0, self._entry_box_int_arg_a_callback,
+                                                                "Enter an integer", 150)
+            self.entry_description.configure(text="Enter number of values less than total rows")
 
     def _add_random_custom_value_callback(self, choice):
         #keep
@@ -426,9 +471,42 @@ class ManipulateView(BaseView):
                 self.pos_5_entry_box = self._user_entry_box_template(4, 1, self._entry_box_int_arg_a_callback,
                                                                     "Enter an integer", 150)
                 self.entry_description.configure(text="Number of columns to retain")
+                if "Incremental" in self.variables["sub_action"]:
+                    self.pos_6_entry_box = self._user_entry_box_template(4, 2, 
+                                                                        self._entry_box_optional_int_arg_b_callback,
+                                                                        "2. Rows per chunk (optional)", 200)
+                    self.variables["args"]["c"] = {"source": "", "name": ""}
+                    self.pos_7_entry_box = self._user_entry_box_template(4, 3, self._incremental_source_callback,
+                                                                        "3. Source dataset (optional)", 200)
+                    self.pos_8_entry_box = self._user_entry_box_template(4, 4, self._incremental_name_callback,
+                                                                        "4. New dataset (optional)", 200)
+                    self.entry_description.configure(text="1. Number of columns to retain | "
+                                                          "2. Rows read at a time | "
+                                                          "3. Databank CSV read instead of the current dataset | "
+                                                          "4. Databank dataset the result is written to")
             case False:
                 self.entry_description.configure(text="All dataset features except the dependant column must be numerical.")
 
+    def _incremental_source_callback(self, choice):
+        """Incremental PCA / SVD source entry box callback function. Sets the databank dataset read instead of the
+        current dataset (arg c "source"), empty for the current dataset.
+
+            Args:
+                choice (str): User selection via dropdown menu or entry box.
+        """
+        self.variables["args"]["c"] = {**self.variables["args"]["c"], "source": choice}
+        return True
+
+    def _incremental_name_callback(self, choice):
+        """Incremental PCA / SVD output entry box callback function. Sets the name of the new databank dataset the
+        result is written to (arg c "name"), empty to replace the current dataset.
+
+            Args:
+                choice (str): User selection via dropdown menu or entry box.
+        """
+        self.variables["args"]["c"] = {**self.variables["args"]["c"], "name": choice}
+        return True
+
     def _replace_outliers_callback(self, choice):
         #keep
         self._refresh_menu_widgets(3)
@@ -563,15 +641,35 @@ class ManipulateView(BaseView):
         self._refresh_menu_widgets(5)
 
         match choice:
-            case "Mean" | "Median" | "Mode" | "Random Forest" | "Back Fill" | "Forward Fill" | "Random Sampling Fill":
+            case "Mean" | "Median" | "Mode" | "Back Fill" | "Forward Fill" | "Random Sampling Fill":
+                self.pos_4_menu.configure(state='disabled')
+                self.schedule_button.configure(state="normal")
+            case "Random Forest":
                 self.pos_4_menu.configure(state='disabled')
                 self.schedule_button.configure(state="normal")
+                self.pos_5_menu = self._drop_down_menu_template("Select Target", 
+                                                                ["Selected Column", "Every Numeric Column"], 
+                                                                self._random_forest_target_callback, 5)
             case "KNN":
                 self.pos_4_entry_box = self._user_entry_box_template(4, 1, self._entry_box_int_arg_b_callback,
                                                                     "1. Enter an integer",150)
                 self.entry_description.configure(text="1. Enter desired number of neighbours")
                 self.pos_4_menu.configure(state='disabled')
 
+    def _random_forest_target_callback(self, choice):
+        """Random Forest imputation target callback function. Imputes the selected column, or every numeric column
+        with missing values in a single pass.
+
+            Args:
+                choice (str): User selection via dropdown menu or entry box.
+        """
+        match choice:
+            case "Selected Column":
+                self.variables["column"] = self.pos_2_menu.get()
+            case "Every Numeric Column":
+                self.variables["column"] = ""
+                self.entry_description.configure(text="Every numeric column is predicted from all other columns")
+
     def _feature_scaling_callback(self, choice):
         #keep
         """Feature scaling callback function. New menu/entry box appears on user selection.
@@ -642,6 +740,7 @@ class ManipulateView(BaseView):
                 choice (str): User selection via dropdown menu or entry box.
         """
         self.variables['column'] = choice
+        self._refresh_menu_widgets(5)
         match self.column_dtypes[choice]:
             case "int64" | "float64":
                 self.temp_col_dtypes = self.column_dtypes.copy()
@@ -658,6 +757,14 @@ class ManipulateView(BaseView):
                     self.pos_3_menu.configure(state="disabled")
                 else:
                     self.schedule_button.configure(state='normal')
+                    self.pos_5_entry_box = self._user_entry_box_template(5, 0, 
+                                                                        self._entry_box_optional_float_arg_a_callback,
+                                                                        "1. Smoothing (optional)", 150)
+                    self.pos_6_entry_box = self._user_entry_box_template(5, 1, 
+                                                                        self._entry_box_optional_int_arg_b_callback,
+                                                                        "2. Folds (optional)", 150)
+                    self.entry_description.configure(text="1. Weight of the dependant column's mean | "
+                                                          "2. Number of folds to encode each row without its own target")
             case _:
                 self.entry_description.configure(text="The dependant column must be numerical")
                 self.pos_4_menu.configure(state="disabled")
@@ -671,6 +778,7 @@ class ManipulateView(BaseView):
                 choice (str): User selection via dropdown menu or entry box.
         """
         self.variables['column'] = choice
+        self._refresh_menu_widgets(5)
         
         self.temp_col_dtypes = self.column_dtypes.copy()
         self.temp_col_dtypes.pop(choice)
@@ -686,6 +794,42 @@ class ManipulateView(BaseView):
             self.pos_4_menu.configure(state="disabled")
         else:
             self.schedule_button.configure(state='normal')
+            if self.variables["sub_action"] == "Feature Encoding One-hot Encoding":
+                self.pos_5_menu = self._drop_down_menu_template("Select Output", ["Dense", "Sparse"], 
+                                                                self._onehot_output_callback, 5)
+                self.pos_6_entry_box = self._user_entry_box_template(5, 1, self._entry_box_optional_int_arg_b_callback,
+                                                                    "1. Max categories (optional)", 180)
+                self.entry_description.configure(text="1. Most categories a column may have, blank for the default "
+                                                      "limit")
+
+    def _feature_engineering_column_callback(self, choice):
+        """Polynominal / Interaction Features dependant column callback function. Sets column variable as user 
+        choice, left out of the products ("None" leaves out no column), the degree, column limit and output can 
+        then be chosen.
+
+            Args:
+                choice (str): User selection via dropdown menu or entry box.
+        """
+        self._refresh_menu_widgets(5)
+        self._set_column_var("" if choice == "None" else choice)
+        self.pos_5_entry_box = self._user_entry_box_template(5, 0, self._entry_box_optional_int_arg_a_callback,
+                                                            "1. Degree (optional)", 150)
+        self.pos_6_entry_box = self._user_entry_box_template(5, 1, self._entry_box_optional_int_arg_c_callback,
+                                                            "2. Max columns (optional)", 150)
+        self.pos_6_menu = self._drop_down_menu_template("Select Output", ["Dense", "Float32", "Sparse"], 
+                                                        self._arg_b_callback, 6)
+        self.entry_description.configure(text="1. Highest degree of the products, blank for 2 | "
+                                              "2. Most columns to add, blank for the default limit")
+
+    def _onehot_output_callback(self, choice):
+        """One-hot encoding output callback function. Sets arg a as user choice: dense or sparse encoded columns.
+
+            Args:
+                choice (str): User selection via dropdown menu or entry box.
+        """
+        self.variables["args"]["a"] = choice
+        self.entry_description.configure(text=f"Categorical columns are replaced with {choice.lower()} uint8 columns | "
+                                              "1. Most categories a column may have, blank for the default limit")
 
     def _entry_box_standard_arg_a_callback(self, choice):
         """Entry box for strings callback function. Sets arg a as user choice.
@@ -716,6 +860,16 @@ class ManipulateView(BaseView):
         elif len(choice) == 0:
             return True
     
+    def _entry_box_standard_arg_c_callback(self, choice):
+        """Entry box for strings callback function. Sets arg c as user choice.
+
+            Args:
+                choice (str): User selection via dropdown menu or entry box.
+        """
+        self.variables["args"]["c"] = choice
+        self.schedule_button.configure(state="normal" if choice else "disabled")
+        return True
+
     def _entry_box_float_arg_a_callback(self, choice):
         """Entry box for float callback function. Sets arg a as user choice.
 
@@ -742,6 +896,58 @@ class ManipulateView(BaseView):
             self.schedule_button.configure(state="disabled")
         return True
         
+    def _entry_box_optional_float_arg_a_callback(self, choice):
+        """Entry box for an optional float callback function. Sets arg a as user choice, empty when left blank.
+
+            Args:
+                choice (str): User selection via dropdown menu or entry box.
+        """
+        try:
+            self.variables["args"]["a"] = float(choice) if choice else ""
+            self.schedule_button.configure(state="normal")
+        except ValueError:
+            self.schedule_button.configure(state="disabled")
+        return True
+
+    def _entry_box_optional_int_arg_a_callback(self, choice):
+        """Entry box for an optional integer callback function. Sets arg a as user choice, empty when left blank.
+
+            Args:
+                choice (str): User selection via dropdown menu or entry box.
+        """
+        try:
+            self.variables["args"]["a"] = int(choice) if choice else ""
+            self.schedule_button.configure(state="normal")
+        except ValueError:
+            self.schedule_button.configure(state="disabled")
+        return True
+
+    def _entry_box_optional_int_arg_b_callback(self, choice):
+        """Entry box for an optional integer callback function. Sets arg b as user choice, empty when left blank.
+
+            Args:
+                choice (str): User selection via dropdown menu or entry box.
+        """
+        try:
+            self.variables["args"]["b"] = int(choice) if choice else ""
+            self.schedule_button.configure(state="normal")
+        except ValueError:
+            self.schedule_button.configure(state="disabled")
+        return True
+
+    def _entry_box_optional_int_arg_c_callback(self, choice):
+        """Entry box for an optional integer callback function. Sets arg c as user choice, empty when left blank.
+
+            Args:
+                choice (str): User selection via dropdown menu or entry box.
+        """
+        try:
+            self.variables["args"]["c"] = int(choice) if choice else ""
+            self.schedule_button.configure(state="normal")
+        except ValueError:
+            self.schedule_button.configure(state="disabled")
+        return True
+
     def _entry_box_int_arg_a_callback(self, choice):
         """Entry box for integers callback function. Sets arg a as user choice.
 
@@ -839,6 +1045,45 @@ class ManipulateView(BaseView):
         self.widget_list.append({"col_pos": col_pos, "widget": drop_down_menu})
         return drop_down_menu
        
+    def _expand_output_callback(self, choice):
+        """Row expansion output callback function. Either adds the rows to the dataset, or streams the expanded 
+        dataset straight to a new databank dataset (arg b = "Stream") whose name can then be entered.
+
+            Args:
+                choice (str): User selection via dropdown menu or entry box.
+        """
+        self._refresh_menu_widgets(5)
+        match choice:
+            case "Stream to Databank":
+                self.variables["args"]["b"] = "Stream"
+                self.schedule_button.configure(state="disabled")
+                self.pos_5_entry_box = self._user_entry_box_template(5, 0, self._entry_box_standard_arg_c_callback,
+                                                                    "2. Dataset name", 180)
+                self.entry_description.configure(text="1. Enter number of rows to generate | 2. Name of the new "
+                                                      "dataset, ending in .parquet to save it as Parquet")
+            case _:
+                self.variables["args"]["b"] = ""
+                self.variables["args"]["c"] = ""
+                if isinstance(self.variables["args"]["a"], int):
+                    self.schedule_button.configure(state="normal")
+                self.entry_description.configure(text="1. Enter number of rows to generate")
+
+    def _smote_column_callback(self, choice):
+        """SMOTE dependant column callback function. Sets column variable as user choice, the total number of rows
+        wanted can then be entered.
+
+            Args:
+                choice (str): User selection via dropdown menu or entry box.
+        """
+        self._refresh_menu_widgets(4)
+        self._set_column_var(choice)
+        self.pos_4_entry_box = self._user_entry_box_template(4, 0, self._entry_box_optional_int_arg_a_callback,
+                                                            "1. Total rows (optional)", 180)
+        self.pos_5_entry_box = self._user_entry_box_template(4, 1, self._entry_box_optional_int_arg_c_callback,
+                                                            "2. Max categories (optional)", 180)
+        self.entry_description.configure(text="1. Total number of rows after expansion, blank to balance the classes | "
+                                              "2. Most categories of a non-numeric column, blank for the default limit")
+
     def _set_column_var(self, choice):
         """Column variable callback function. Sets column variable as user choice.
 
@@ -848,6 +1093,14 @@ class ManipulateView(BaseView):
         self.variables["column"] = choice
         self.schedule_button.configure(state="normal")
 
+    def _arg_b_callback(self, choice):
+        """Arg b callback function. Sets "arg b" variable as user choice.
+
+            Args:
+                choice (str): User selection via dropdown menu or entry box.
+        """
+        self.variables["args"]["b"] = choice
+
     def _arg_a_callback(self, choice):
         """Arg a callback function. Sets "arg a" variable as user choice.
 
@@ -940,7 +1193,8 @@ class ManipulateView(BaseView):
         schedule_set = self.snapshots[int(choice)]["Schedule Set"]
         manips = "\n"
         for action in schedule_set:
-            new_line = f'{action["step"]}. {action["action"]} | {action["sub_action"]} | {action["column"]}\n' 
+            seed = f' | seed {action["seed"]}' if action.get("seed") is not None else ""
+            new_line = f'{action["step"]}. {action["action"]} | {action["sub_action"]} | {action["column"]}{seed}\n' 
             manips = manips + new_line
         self.current_dataset_label.configure(text=f"Selected Dataset: {snapshot_name} | Rows: {rows} | Columns: {columns}\n"
                                                         f"Manipulations:{manips}")
@@ -1026,6 +1280,44 @@ class ManipulateView(BaseView):
                 # Reset action menu
                 self.action_selection_menu.set("Select Action")
 
+    def show_generate_running(self, running:bool):
+        """Shows the cancel button and stops new manipulations being scheduled or generated while a generate is
+        running, and reverses it once the generate ends.
+
+        Args:
+            running (bool): whether a generate is running.
+        """
+        if running:
+            self.generate_button.configure(state="disabled")
+            self.schedule_button.configure(state="disabled")
+            self.action_selection_menu.configure(state="disabled")
+            self.generate_cancel_button.pack(side="right", padx=(8, 0), pady=(8,8),
+                                             before=self.generate_warning_scroll_frame)
+        else:
+            self.action_selection_menu.configure(state="normal")
+            self.generate_cancel_button.pack_forget()
+
+    def set_scheduler_outcome(self, step:int, status:str, elapsed=None):
+        """Updates the outcome label of a scheduled manipulation.
+
+        Args:
+            step (int): step number of the scheduled manipulation.
+            status (str): "Pending", "Running", "Success" or "Failed".
+            elapsed (float, optional): seconds the step took, None if the result was taken from the cache.
+        """
+        colors = {"Pending": "yellow", "Running": "orange", "Success": "green", "Failed": "red"}
+        text = status
+        if status in ("Success", "Failed"):
+            text = f"{status} ({elapsed:.1f}s)" if elapsed is not None else f"{status} (cached)"
+        self.scheduler_items[step-1]["outcome"].configure(text=text, text_color=colors[status])
+
+    def get_seed(self):
+        """Getter method for manipulations controller to obtain the seed entered by the user.
+        Returns:
+            str: entered seed, "" if none.
+        """
+        return self.seed_entry.get().strip()
+
     def get_rollback_index(self):
         """Getter method for manipulations controller to obtian rollback index of selected snapshot.
         Returns:
@@ -191,7 +191,8 @@ class SampleView(BaseView):
             self._pandas_datatype_groups = {
             "numeric": (
                 "int64", "int32", "int16", "int8", "float64", "float32", "complex", "UInt8", "UInt16",
-                "UInt32", "UInt64", "int64Dtype", "float64Dtype"
+                "UInt32", "UInt64", "int64Dtype", "float64Dtype", "Int8", "Int16", "Int32", "Int64", "uint8",
+                "uint16", "uint32", "uint64", "Float32", "Float64"
                 ), 
             "categorical": (
                 "category", "object", "string", "StringDtype"
@@ -320,12 +321,13 @@ class SampleView(BaseView):
                 case "numeric": # to be catered for "date_time"
                     try: 
                         if criteria_dtype in [
-                            "int64", "int32", "int16", "int8", "UInt8", "UInt16", "UInt32", "UInt64", "int64Dtype"
+                            "int64", "int32", "int16", "int8", "UInt8", "UInt16", "UInt32", "UInt64", "int64Dtype",
+                            "Int8", "Int16", "Int32", "Int64", "uint8", "uint16", "uint32", "uint64"
                             ]:
                             assert condition.isdigit(), "condition is not an integer value."
                             return int(condition)
                         elif criteria_dtype in [
-                            "float64", "float32", "complex", "float64Dtype"
+                            "float64", "float32", "complex", "float64Dtype", "Float32", "Float64"
                             ]: 
                             assert condition.isdigit(), "condition is not a float value."
                             return float(condition)
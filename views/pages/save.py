@@ -1,4 +1,4 @@
-from customtkinter import CTkFrame, CTkTabview, CTkLabel, CTkTextbox, CTkEntry, CTkButton, CTkCheckBox, END, filedialog
+from customtkinter import CTkFrame, CTkTabview, CTkLabel, CTkTextbox, CTkEntry, CTkButton, CTkCheckBox, CTkOptionMenu, END, filedialog
 from .base import BaseView
 
 class SaveView(BaseView):
@@ -72,6 +72,18 @@ class SaveView(BaseView):
             self.export_metadata_frame, text="Export Metadata In Addition To Dataset", font=("Arial", 16)
             )
         self.export_metadata_checkbox.pack(pady=20)
+        # Export format label: (file format, compression, file dialogue filter)
+        self.export_formats = {
+            "CSV": ("csv", None, ("CSV Files", "*.csv")), 
+            "CSV (gzip)": ("csv", "gzip", ("Compressed CSV Files", "*.csv.gz")), 
+            "CSV (zstd)": ("csv", "zstd", ("Compressed CSV Files", "*.csv.zst")), 
+            "Parquet": ("parquet", None, ("Parquet Files", "*.parquet")), 
+            "Feather": ("feather", "zstd", ("Feather Files", "*.feather"))
+        }
+        self.export_format_menu = CTkOptionMenu(
+            self.export_metadata_frame, values=list(self.export_formats), font=("Arial", 16), width=300
+            )
+        self.export_format_menu.pack()
         self.export_desc_frame = CTkFrame(self.export_frame, fg_color="transparent")
         self.export_desc_label = CTkLabel(self.export_desc_frame, text="Description:", font=("Arial", 18))
         self.export_desc_label.pack(side="top", anchor="w")
@@ -101,10 +113,19 @@ class SaveView(BaseView):
         new_file = filedialog.asksaveasfilename(
             confirmoverwrite=True, 
             initialfile=file_name, 
-            filetypes=[("CSV Files", "*.csv")]
+            filetypes=[self.export_formats[self.export_format_menu.get()][2]]
         )
         return new_file
 
+    def get_export_format(self): 
+        """Return the file format and compression selected in the export format menu.
+
+        Returns:
+            tuple: file format ("csv", "parquet" or "feather") and compression (None, "gzip" or "zstd").
+        """
+        file_format, compression, _ = self.export_formats[self.export_format_menu.get()]
+        return file_format, compression
+
     def get_export_metadata_checkbox_state(self): 
         """_summary_
         """
@@ -205,6 +226,14 @@ class SaveView(BaseView):
         # Schedule a function to destroy the label after 3000 milliseconds (3 seconds)
         self.save_button_frame.after(3000, message.destroy)
 
+    def display_export_progress(self, msg): 
+        """Show (or clear, with an empty msg) the progress of a running export on the export button.
+
+        Args:
+            msg (str): progress message.
+        """
+        self.export_button.configure(text=msg or "Export", state="disabled" if msg else "normal")
+
     def display_export_success(self, msg):
         message = CTkLabel(self.export_button_frame, text=msg, height=40)
         # Place the label in the center of the save_button_frame